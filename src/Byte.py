@@ -16,8 +16,10 @@ class Byte(Numeric):
     '''
     One byte = 8 bits.
     '''
+    __slots__ = ()  # no per-instance __dict__, all state lives in Numeric's slots
     SIZE_IN_BIT = Numeric.BYTE_SIZE_IN_BIT
     SIZE_IN_BYTE = 1
+    MASK = 2 ** SIZE_IN_BIT - 1   # all bits set
 
     @typecheck
     def __init__(
@@ -30,3 +32,6 @@ class Byte(Numeric):
         @return (Byte): an instance of Byte class.
         '''
         self.__init_self__(Byte, value)
+
+# all 256 Bytes are shared through Byte.interned()
+Byte.enable_pool()
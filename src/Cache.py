@@ -0,0 +1,192 @@
+'''
+Cache model of MMIX memory hierarchy.
+'''
+import random
+from Memory import Memory
+from Octa import Octa
+from Utilities import guarantee
+from typecheck import *
+
+def _is_power_of_two(x):
+    '''
+    Whether x is a positive power of two int.
+    '''
+    return isinstance(x, int) and x > 0 and x & (x - 1) == 0
+
+class Cache:
+    '''
+    One level of a set-associative, write-back and write-allocate cache. It only models which lines are present, to
+    count hits, misses and writebacks; the data itself always stays in Memory.
+
+    Each set is a list of the line numbers it holds, in the order the replacement policy evicts them: the first one is
+    the least recently used for LRU, or the oldest for FIFO. Random replacement evicts any of them.
+    '''
+    LRU = 'LRU'
+    FIFO = 'FIFO'
+    RANDOM = 'random'
+    POLICIES = (LRU, FIFO, RANDOM)
+
+    @typecheck
+    def __init__(
+            self,
+            name: str,
+            size: _is_power_of_two,
+            associativity: _is_power_of_two,
+            line_size: _is_power_of_two,
+            policy: one_of(POLICIES)=LRU,
+            next_level: optional(lambda x: isinstance(x, Cache))=None,
+            seed: optional(int)=None
+        ) -> nothing:
+        '''
+        Create an empty cache.
+
+        @name (str): name of this cache in statistics, e.g. 'L1D';
+        @size (int): capacity in bytes;
+        @associativity (int): number of lines in each set;
+        @line_size (int): size of one line in bytes;
+        @policy (str): replacement policy, one of Cache.POLICIES;
+        @next_level (Cache): cache that misses and writebacks go to, None for memory;
+        @seed (int): seed of random replacement, for repeatable runs.
+        '''
+        guarantee(
+            size >= associativity * line_size,
+            "Cache {0} of {1} bytes cannot hold {2} ways of {3} bytes!".format(name, size, associativity, line_size)
+            )
+        self.name = name
+        self.size = size
+        self.associativity = associativity
+        self.line_size = line_size
+        self.line_shift = line_size.bit_length() - 1    # address >> line_shift is the line number
+        self.set_mask = size // (associativity * line_size) - 1  # line & set_mask is the set index
+        self.policy = policy
+        self.next_level = next_level
+        self.random = random.Random(seed)
+        self.reset()
+
+    @typecheck
+    def reset(self) -> nothing:
+        '''
+        Empty the cache and clear its counters.
+
+        @return (None)
+        '''
+        self.sets = [list() for i in range(self.set_mask + 1)]
+        self.dirty = set()  # line numbers of lines that are written but not written back
+        self.hits = 0
+        self.misses = 0
+        self.writebacks = 0
+
+    def access(self, address, size, is_write):
+        '''
+        Account one access of size bytes at address (int), which may span several lines.
+
+        @address (int): address of the first byte;
+        @size (int): number of bytes;
+        @is_write (bool): whether the access is a write.
+
+        @return (None)
+        '''
+        line = address >> self.line_shift
+        last = ((address + size - 1) & Octa.MASK) >> self.line_shift
+        while True:
+            self.__access_line__(line, is_write)
+            if line == last:
+                return
+            line = (line + 1) & (Octa.MASK >> self.line_shift)
+
+    def __access_line__(self, line, is_write):
+        '''
+        Account one access to the line numbered line (int).
+        '''
+        ways = self.sets[line & self.set_mask]
+        if line in ways:
+            self.hits += 1
+            if self.policy == Cache.LRU and ways[-1] != line:
+                ways.remove(line)
+                ways.append(line)
+        else:
+            self.misses += 1
+            if len(ways) == self.associativity:
+                victim = ways.pop(self.random.randrange(len(ways)) if self.policy == Cache.RANDOM else 0)
+                if victim in self.dirty:
+                    self.dirty.remove(victim)
+                    self.writebacks += 1
+                    if self.next_level is not None:
+                        self.next_level.access(victim << self.line_shift, self.line_size, True)
+            if self.next_level is not None:
+                self.next_level.access(line << self.line_shift, self.line_size, False)
+            ways.append(line)
+        if is_write:
+            self.dirty.add(line)
+
+    @typecheck
+    def statistics(self) -> dict_of(str, int):
+        '''
+        Counters of this cache.
+
+        @return (dict): 'hits', 'misses' and 'writebacks' -> count.
+        '''
+        return {'hits': self.hits, 'misses': self.misses, 'writebacks': self.writebacks}
+
+class CachedMemory:
+    '''
+    Memory seen through an instruction cache and a data cache. Instruction fetches and data accesses are accounted in
+    the caches, then carried out by memory. Everything else, e.g. loading programs or dumps, goes to memory directly.
+
+    A machine without caches talks to Memory itself, so the model costs nothing unless it's enabled.
+    '''
+    @typecheck
+    def __init__(self, memory: Memory, icache: Cache, dcache: Cache) -> nothing:
+        '''
+        @memory (Memory): memory behind the caches;
+        @icache (Cache): first level cache of instructions;
+        @dcache (Cache): first level cache of data.
+        '''
+        self.memory = memory
+        self.icache = icache
+        self.dcache = dcache
+
+    def __getattr__(self, name):
+        return getattr(self.memory, name)
+
+    def fetch_uint(self, address, size):
+        '''
+        Fetch an instruction through the instruction cache, see Memory.fetch_uint.
+        '''
+        self.icache.access(address, size, False)
+        return self.memory.read_uint(address, size)
+
+    def read_uint(self, address, size):
+        '''
+        Load through the data cache, see Memory.read_uint.
+        '''
+        self.dcache.access(address, size, False)
+        return self.memory.read_uint(address, size)
+
+    def read_int(self, address, size):
+        '''
+        Load through the data cache, see Memory.read_int.
+        '''
+        self.dcache.access(address, size, False)
+        return self.memory.read_int(address, size)
+
+    def write_uint(self, address, size, value):
+        '''
+        Store through the data cache, see Memory.write_uint.
+        '''
+        self.dcache.access(address, size, True)
+        self.memory.write_uint(address, size, value)
+
+    @typecheck
+    def statistics(self) -> dict_of(str, dict):
+        '''
+        Counters of every level of caches.
+
+        @return (dict): cache name -> dict of counters (see Cache.statistics).
+        '''
+        result = dict()
+        for cache in (self.icache, self.dcache):
+            while cache is not None:
+                result[cache.name] = cache.statistics()
+                cache = cache.next_level
+        return result
@@ -0,0 +1,87 @@
+'''
+Cache of predecoded MMIX instructions.
+'''
+from Memory import Memory
+from Octa import Octa
+from Tetra import Tetra
+from typecheck import *
+
+class DecodeCache:
+    '''
+    Instructions of a Memory decoded once, keyed by address: each entry is the tuple (handler, X, Y, Z), the handler
+    from the dispatch table of the OP code and the operands as ints, ready to be called.
+
+    Entries are grouped by page of memory. Every page holding an entry is watched (see Memory.watch_page), and the first
+    write to it drops all entries of the page, so code that is changed, by a store or by loading another program, is
+    decoded again. SYNCID drops the entries of a range of addresses explicitly (see invalidate).
+    '''
+    @typecheck
+    def __init__(self, memory: Memory, table: list) -> nothing:
+        '''
+        @memory (Memory): memory instructions are fetched from;
+        @table (list): the 256 instruction handlers, indexed by OP code.
+        '''
+        self.memory = memory
+        self.table = table
+        self.entries = dict()   # address (uint) -> (handler, X, Y, Z)
+        self.pages = dict()     # page number (uint) -> list of addresses of entries in that page
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0  # number of pages whose entries were dropped
+        memory.write_watchers.append(self.invalidate_page)
+
+    def detach(self):
+        '''
+        Stop watching writes to memory, when this cache isn't used anymore.
+        '''
+        self.memory.write_watchers.remove(self.invalidate_page)
+
+    def decode(self, address):
+        '''
+        Fetch and decode the instruction at address (int), which has no entry yet, and add its entry.
+
+        @return (tuple): the entry (handler, X, Y, Z).
+        '''
+        self.misses += 1
+        instruction = self.memory.fetch_uint(address, Tetra.SIZE_IN_BYTE)
+        entry = self.entries[address] = (
+            self.table[instruction >> 24], (instruction >> 16) & 0xff, (instruction >> 8) & 0xff, instruction & 0xff
+            )
+        page_number = address >> self.memory.page_shift
+        addresses = self.pages.get(page_number)
+        if addresses is None:
+            addresses = self.pages[page_number] = list()
+            self.memory.watch_page(page_number)
+        addresses.append(address)
+        return entry
+
+    def invalidate_page(self, page_number):
+        '''
+        Drop the entries of the page numbered page_number (int).
+        '''
+        addresses = self.pages.pop(page_number, None)
+        if addresses is not None:
+            self.invalidations += 1
+            for address in addresses:
+                del self.entries[address]
+
+    def invalidate(self, address, length):
+        '''
+        Drop the entries of every page overlapping length (int) bytes from address (int), as SYNCID does.
+        '''
+        last = ((address + length - 1) & Octa.MASK) >> self.memory.page_shift
+        page_number = address >> self.memory.page_shift
+        while True:
+            self.invalidate_page(page_number)
+            if page_number == last:
+                return
+            page_number = (page_number + 1) & (Octa.MASK >> self.memory.page_shift)
+
+    @typecheck
+    def statistics(self) -> dict_of(str, int):
+        '''
+        Counters of this cache.
+
+        @return (dict): 'hits', 'misses' and 'invalidations' -> count.
+        '''
+        return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations}
@@ -0,0 +1,386 @@
+'''
+Instruction handlers of MMIX, built into the dispatch table of a machine (see build_dispatch_table).
+'''
+import functools
+import SpecialRegisters
+from Byte import Byte
+from Wyde import Wyde
+from Tetra import Tetra
+from Octa import Octa
+from VirtualMemory import VirtualMemory
+from Utilities import guarantee
+
+_MASK = Octa.MASK
+_BYTE_LSB = 0x0101010101010101 # lowest bit of every byte in an octa
+_SIGN = 1 << 63                 # sign bit of an octa
+
+def _signed(value):
+    '''
+    Signed value of an unsigned octa value (int).
+    '''
+    return value - ((value & _SIGN) << 1)
+
+# conditions of branches, CS and ZS on an unsigned octa, in the order of their OP codes
+_CONDITIONS = (
+    lambda x: x >= _SIGN,               # N
+    lambda x: x == 0,                   # Z
+    lambda x: 0 < x < _SIGN,            # P
+    lambda x: x & 1,                    # OD
+    lambda x: x < _SIGN,                # NN
+    lambda x: x != 0,                   # NZ
+    lambda x: x == 0 or x >= _SIGN,     # NP
+    lambda x: not x & 1,                # EV
+    )
+
+def _boolean_matrix_multiply(y, z, is_xor):
+    '''
+    Boolean 8x8 matrix multiplication used by MOR and MXOR. Byte i (counted from LSB) of the result combines, by or or
+    by xor, those bytes k of y whose bit k is set in byte i of z.
+
+    All eight bytes of z are handled at once for each byte of y: the bits k of z are spread to whole byte masks, and
+    byte k of y is replicated into every byte.
+
+    @y (int): unsigned octa $Y;
+    @z (int): unsigned octa $Z or Z;
+    @is_xor (bool): combine by xor (MXOR) instead of or (MOR).
+
+    @return (int): unsigned octa result.
+    '''
+    result = 0
+    k = 0
+    while y:
+        byte = y & 0xff
+        if byte:
+            selected = (((z >> k) & _BYTE_LSB) * 0xff) & (byte * _BYTE_LSB)
+            if is_xor:
+                result ^= selected
+            else:
+                result |= selected
+        y >>= 8
+        k += 1
+    return result
+
+def _sideways_add(value):
+    '''
+    Count the bits set in an unsigned octa, by adding up bit counts of 2, 4 and 8 bits wide fields in parallel.
+
+    @value (int): unsigned octa.
+
+    @return (int): number of bits set.
+    '''
+    value = value - ((value >> 1) & 0x5555555555555555)
+    value = (value & 0x3333333333333333) + ((value >> 2) & 0x3333333333333333)
+    value = (value + (value >> 4)) & 0x0f0f0f0f0f0f0f0f
+    return ((value * _BYTE_LSB) & _MASK) >> 56
+
+def _saturating_difference(y, z, lane_bits):
+    '''
+    Subtract z from y independently in every lane of lane_bits, with results below zero replaced by zero, as BDIF,
+    WDIF, TDIF and ODIF do. All lanes are handled at once: the subtraction is done with the top bit of every lane
+    forced, so no borrow can cross a lane, then the lanes that really borrowed are masked off.
+
+    @y (int): unsigned octa $Y;
+    @z (int): unsigned octa $Z or Z;
+    @lane_bits (int): one of 8, 16, 32, 64.
+
+    @return (int): unsigned octa result.
+    '''
+    lane_mask = (1 << lane_bits) - 1
+    high = (_MASK // lane_mask) << (lane_bits - 1)  # top bit of every lane
+    difference = ((y | high) - (z & ~high)) ^ ((y ^ ~z) & high)
+    borrow = ((~y & z) | (~(y ^ z) & difference)) & high
+    return difference & ~((borrow >> (lane_bits - 1)) * lane_mask) & _MASK
+
+# mnemonics of all 256 OP codes; an immediate form is named after its register form, with an 'I' appended
+OPCODE_NAMES = tuple('''
+    TRAP FCMP FUN FEQL FADD FIX FSUB FIXU FLOT FLOTI FLOTU FLOTUI SFLOT SFLOTI SFLOTU SFLOTUI
+    FMUL FCMPE FUNE FEQLE FDIV FSQRT FREM FINT MUL MULI MULU MULUI DIV DIVI DIVU DIVUI
+    ADD ADDI ADDU ADDUI SUB SUBI SUBU SUBUI 2ADDU 2ADDUI 4ADDU 4ADDUI 8ADDU 8ADDUI 16ADDU 16ADDUI
+    CMP CMPI CMPU CMPUI NEG NEGI NEGU NEGUI SL SLI SLU SLUI SR SRI SRU SRUI
+    BN BNB BZ BZB BP BPB BOD BODB BNN BNNB BNZ BNZB BNP BNPB BEV BEVB
+    PBN PBNB PBZ PBZB PBP PBPB PBOD PBODB PBNN PBNNB PBNZ PBNZB PBNP PBNPB PBEV PBEVB
+    CSN CSNI CSZ CSZI CSP CSPI CSOD CSODI CSNN CSNNI CSNZ CSNZI CSNP CSNPI CSEV CSEVI
+    ZSN ZSNI ZSZ ZSZI ZSP ZSPI ZSOD ZSODI ZSNN ZSNNI ZSNZ ZSNZI ZSNP ZSNPI ZSEV ZSEVI
+    LDB LDBI LDBU LDBUI LDW LDWI LDWU LDWUI LDT LDTI LDTU LDTUI LDO LDOI LDOU LDOUI
+    LDSF LDSFI LDHT LDHTI CSWAP CSWAPI LDUNC LDUNCI LDVTS LDVTSI PRELD PRELDI PREGO PREGOI GO GOI
+    STB STBI STBU STBUI STW STWI STWU STWUI STT STTI STTU STTUI STO STOI STOU STOUI
+    STSF STSFI STHT STHTI STCO STCOI STUNC STUNCI SYNCD SYNCDI PREST PRESTI SYNCID SYNCIDI PUSHGO PUSHGOI
+    OR ORI ORN ORNI NOR NORI XOR XORI AND ANDI ANDN ANDNI NAND NANDI NXOR NXORI
+    BDIF BDIFI WDIF WDIFI TDIF TDIFI ODIF ODIFI MUX MUXI SADD SADDI MOR MORI MXOR MXORI
+    SETH SETMH SETML SETL INCH INCMH INCML INCL ORH ORMH ORML ORL ANDNH ANDNMH ANDNML ANDNL
+    JMP JMPB PUSHJ PUSHJB GETA GETAB PUT PUTI POP RESUME SAVE UNSAVE SYNC SWYM GET TRIP
+    '''.split())
+OPCODES = {name: opcode for opcode, name in enumerate(OPCODE_NAMES)}   # mnemonic -> OP code
+
+def build_dispatch_table(machine):
+    '''
+    Build the table of instruction handlers of machine indexed by OP code, as used by MMIX.step and MMIX.run. Every
+    handler takes X, Y and Z as unsigned ints, and sees @ already advanced to the next instruction. The register and
+    the immediate form of an instruction are two handlers made here from one body, so the form is told by the OP code
+    alone. The OP codes machine can't execute run machine.__unimplemented__.
+
+    The handlers work on the register files of machine as they are when the table is built.
+
+    @machine (MMIX): machine to execute the instructions on.
+
+    @return (list): 256 handlers.
+    '''
+    table = [functools.partial(machine.__unimplemented__, opcode) for opcode in range(len(OPCODE_NAMES))]
+    for add_handlers in (_arithmetic, _bitwise, _wyde_immediates, _conditionals, _memory_accesses, _control):
+        add_handlers(machine, table)
+    return table
+
+def _operation(table, opcode, registers, function):
+    '''
+    Set the handlers of $X = function($Y, $Z) at opcode, and of $X = function($Y, Z) at opcode + 1.
+    '''
+    def register_form(X, Y, Z):
+        registers[X] = function(registers[Y], registers[Z])
+    def immediate_form(X, Y, Z):
+        registers[X] = function(registers[Y], Z)
+    table[opcode], table[opcode + 1] = register_form, immediate_form
+
+def _memory_access(table, opcode, registers, access):
+    '''
+    Set the handlers of access(X, address) of the address $Y + $Z at opcode, and of $Y + Z at opcode + 1.
+    '''
+    def register_form(X, Y, Z):
+        access(X, (registers[Y] + registers[Z]) & _MASK)
+    def immediate_form(X, Y, Z):
+        access(X, (registers[Y] + Z) & _MASK)
+    table[opcode], table[opcode + 1] = register_form, immediate_form
+
+def _arithmetic(machine, table):
+    '''
+    Set the handlers of multiplication, division, addition, subtraction, comparison, negation and shifts.
+    '''
+    gpr = machine.general_purpose_registers.values
+    spr = machine.special_purpose_registers.values
+    rA, rD, rH, rR = SpecialRegisters.RA, SpecialRegisters.RD, SpecialRegisters.RH, SpecialRegisters.RR
+    overflow, divide_check = machine.INTEGER_OVERFLOW, machine.INTEGER_DIVIDE_CHECK
+
+    def checked(value):
+        '''value modulo 2^64, with an integer overflow event if it doesn't fit in a signed octa'''
+        if not -_SIGN <= value < _SIGN:
+            spr[rA] |= overflow
+        return value & _MASK
+    def multiply_unsigned(y, z):
+        product = y * z
+        spr[rH] = product >> Octa.SIZE_IN_BIT
+        return product & _MASK
+    def divide(y, z):
+        y, z = _signed(y), _signed(z)
+        if z == 0:
+            spr[rA] |= divide_check
+            quotient, remainder = 0, y
+        else:
+            quotient, remainder = divmod(y, z)
+        spr[rR] = remainder & _MASK
+        return checked(quotient)
+    def divide_unsigned(y, z):
+        dividend = spr[rD]
+        if dividend >= z:
+            quotient, remainder = dividend, y
+        else:
+            quotient, remainder = divmod((dividend << Octa.SIZE_IN_BIT) | y, z)
+        spr[rR] = remainder
+        return quotient
+    def shift_left(y, z):
+        if z >= Octa.SIZE_IN_BIT:
+            if y:
+                spr[rA] |= overflow
+            return 0
+        result = (y << z) & _MASK
+        if _signed(result) >> z != _signed(y):
+            spr[rA] |= overflow
+        return result
+    _operation(table, 0x18, gpr, lambda y, z: checked(_signed(y) * _signed(z)))
+    _operation(table, 0x1a, gpr, multiply_unsigned)
+    _operation(table, 0x1c, gpr, divide)
+    _operation(table, 0x1e, gpr, divide_unsigned)
+    _operation(table, 0x20, gpr, lambda y, z: checked(_signed(y) + _signed(z)))
+    _operation(table, 0x22, gpr, lambda y, z: (y + z) & _MASK)
+    _operation(table, 0x24, gpr, lambda y, z: checked(_signed(y) - _signed(z)))
+    _operation(table, 0x26, gpr, lambda y, z: (y - z) & _MASK)
+    for opcode, scale in ((0x28, 2), (0x2a, 4), (0x2c, 8), (0x2e, 16)):
+        _operation(table, opcode, gpr, lambda y, z, scale=scale: (y * scale + z) & _MASK)
+    _operation(table, 0x30, gpr, lambda y, z: ((_signed(y) > _signed(z)) - (_signed(y) < _signed(z))) & _MASK)
+    _operation(table, 0x32, gpr, lambda y, z: ((y > z) - (y < z)) & _MASK)
+    _operation(table, 0x38, gpr, shift_left)
+    _operation(table, 0x3a, gpr, lambda y, z: (y << z) & _MASK if z < Octa.SIZE_IN_BIT else 0)
+    _operation(table, 0x3c, gpr, lambda y, z: (_signed(y) >> min(z, Octa.SIZE_IN_BIT - 1)) & _MASK)
+    _operation(table, 0x3e, gpr, lambda y, z: y >> z)
+
+    # NEG and NEGU take Y as an unsigned immediate
+    def negate(X, Y, Z):
+        gpr[X] = checked(Y - _signed(gpr[Z]))
+    def negate_immediate(X, Y, Z):
+        gpr[X] = (Y - Z) & _MASK
+    def negate_unsigned(X, Y, Z):
+        gpr[X] = (Y - gpr[Z]) & _MASK
+    table[0x34:0x38] = negate, negate_immediate, negate_unsigned, negate_immediate
+
+def _bitwise(machine, table):
+    '''
+    Set the handlers of bitwise and bytewise operations.
+    '''
+    gpr = machine.general_purpose_registers.values
+    spr = machine.special_purpose_registers.values
+    rM = SpecialRegisters.RM
+    _operation(table, 0xc0, gpr, lambda y, z: y | z)
+    _operation(table, 0xc2, gpr, lambda y, z: (y | ~z) & _MASK)
+    _operation(table, 0xc4, gpr, lambda y, z: ~(y | z) & _MASK)
+    _operation(table, 0xc6, gpr, lambda y, z: y ^ z)
+    _operation(table, 0xc8, gpr, lambda y, z: y & z)
+    _operation(table, 0xca, gpr, lambda y, z: y & ~z)
+    _operation(table, 0xcc, gpr, lambda y, z: ~(y & z) & _MASK)
+    _operation(table, 0xce, gpr, lambda y, z: ~(y ^ z) & _MASK)
+    for opcode, data_type in ((0xd0, Byte), (0xd2, Wyde), (0xd4, Tetra), (0xd6, Octa)):
+        _operation(table, opcode, gpr, lambda y, z, bits=data_type.SIZE_IN_BIT: _saturating_difference(y, z, bits))
+    _operation(table, 0xd8, gpr, lambda y, z: (y & spr[rM]) | (z & ~spr[rM]))
+    _operation(table, 0xda, gpr, lambda y, z: _sideways_add(y & ~z))
+    _operation(table, 0xdc, gpr, lambda y, z: _boolean_matrix_multiply(y, z, is_xor=False))
+    _operation(table, 0xde, gpr, lambda y, z: _boolean_matrix_multiply(y, z, is_xor=True))
+
+def _wyde_immediates(machine, table):
+    '''
+    Set the handlers of SETx, INCx, ORx and ANDNx, with YZ shifted to the high, medium high, medium low or low wyde.
+    '''
+    gpr = machine.general_purpose_registers.values
+    for opcode, shift in ((0, 48), (1, 32), (2, 16), (3, 0)):
+        def set_wyde(X, Y, Z, shift=shift):
+            gpr[X] = ((Y << 8) | Z) << shift
+        def increase_wyde(X, Y, Z, shift=shift):
+            gpr[X] = (gpr[X] + (((Y << 8) | Z) << shift)) & _MASK
+        def or_wyde(X, Y, Z, shift=shift):
+            gpr[X] |= ((Y << 8) | Z) << shift
+        def andn_wyde(X, Y, Z, shift=shift):
+            gpr[X] &= ~(((Y << 8) | Z) << shift)
+        table[0xe0 | opcode], table[0xe4 | opcode] = set_wyde, increase_wyde
+        table[0xe8 | opcode], table[0xec | opcode] = or_wyde, andn_wyde
+
+def _conditionals(machine, table):
+    '''
+    Set the handlers of branches, probable branches, conditional sets and zero or sets.
+    '''
+    gpr = machine.general_purpose_registers.values
+    for opcode, condition in enumerate(_CONDITIONS):
+        def branch(X, Y, Z, condition=condition):
+            if condition(gpr[X]):
+                machine.pc = (machine.pc + (((Y << 8) | Z) << 2) - Tetra.SIZE_IN_BYTE) & _MASK
+        def branch_backward(X, Y, Z, condition=condition):
+            if condition(gpr[X]):
+                machine.pc = (machine.pc + ((((Y << 8) | Z) - 0x10000) << 2) - Tetra.SIZE_IN_BYTE) & _MASK
+        def conditional_set(X, Y, Z, condition=condition):
+            if condition(gpr[Y]):
+                gpr[X] = gpr[Z]
+        def conditional_set_immediate(X, Y, Z, condition=condition):
+            if condition(gpr[Y]):
+                gpr[X] = Z
+        def zero_or_set(X, Y, Z, condition=condition):
+            gpr[X] = gpr[Z] if condition(gpr[Y]) else 0
+        def zero_or_set_immediate(X, Y, Z, condition=condition):
+            gpr[X] = Z if condition(gpr[Y]) else 0
+        # probable branches behave the same, as there's no pipeline to predict for
+        table[0x40 | opcode << 1], table[0x41 | opcode << 1] = branch, branch_backward
+        table[0x50 | opcode << 1], table[0x51 | opcode << 1] = branch, branch_backward
+        table[0x60 | opcode << 1], table[0x61 | opcode << 1] = conditional_set, conditional_set_immediate
+        table[0x70 | opcode << 1], table[0x71 | opcode << 1] = zero_or_set, zero_or_set_immediate
+
+def _memory_accesses(machine, table):
+    '''
+    Set the handlers of loads and stores of M_size[A], where A is rounded down to a multiple of size, and of the other
+    instructions addressing memory.
+    '''
+    gpr = machine.general_purpose_registers.values
+    spr = machine.special_purpose_registers.values
+    rA, overflow = SpecialRegisters.RA, machine.INTEGER_OVERFLOW
+    for opcode, size in ((0x80, 1), (0x84, 2), (0x88, 4), (0x8c, 8)):
+        def load(X, address, size=size):
+            gpr[X] = machine.memory.read_int(address & -size, size) & _MASK
+        def load_unsigned(X, address, size=size):
+            gpr[X] = machine.memory.read_uint(address & -size, size)
+        def store(X, address, size=size):
+            value = gpr[X]
+            if not -(1 << (8 * size - 1)) <= _signed(value) < 1 << (8 * size - 1):
+                spr[rA] |= overflow
+            machine.memory.write_uint(address & -size, size, value)
+        def store_unsigned(X, address, size=size):
+            machine.memory.write_uint(address & -size, size, gpr[X])
+        _memory_access(table, opcode, gpr, load)
+        _memory_access(table, opcode + 2, gpr, load_unsigned)
+        _memory_access(table, opcode + 0x20, gpr, store)
+        _memory_access(table, opcode + 0x22, gpr, store_unsigned)
+    # LDUNC and STUNC are LDOU and STOU, there's no cache to bypass
+    table[0x96:0x98] = table[0x8e:0x90]
+    table[0xb6:0xb8] = table[0xae:0xb0]
+
+    def load_high_tetra(X, address):
+        gpr[X] = machine.memory.read_uint(address & -4, 4) << 32
+    def store_high_tetra(X, address):
+        machine.memory.write_uint(address & -4, 4, gpr[X] >> 32)
+    def store_constant(X, address):
+        machine.memory.write_uint(address & -8, 8, X)
+    def go(X, address):
+        gpr[X] = machine.pc
+        machine.pc = address & -4
+    def synchronize_instructions(X, address):
+        # the code of the X + 1 bytes from address is fetched again
+        for cache in (machine.decode_cache, machine.translator):
+            if cache is not None:
+                cache.invalidate(address, X + 1)
+    _memory_access(table, 0x92, gpr, load_high_tetra)
+    _memory_access(table, 0x9e, gpr, go)
+    _memory_access(table, 0xb2, gpr, store_high_tetra)
+    _memory_access(table, 0xb4, gpr, store_constant)
+    _memory_access(table, 0xbc, gpr, synchronize_instructions)
+
+def _control(machine, table):
+    '''
+    Set the handlers of TRAP, jumps, GETA, PUT, GET, SYNC and of the instructions with nothing to do.
+    '''
+    gpr = machine.general_purpose_registers.values
+    spr = machine.special_purpose_registers.values
+
+    def trap(X, Y, Z):
+        if X == 0 and Y == 0:   # TRAP 0,Halt,0
+            machine.halted = True
+        else:
+            guarantee(False, "TRAP {0},{1},{2} at {3:#x} is not implemented!".format(
+                X, Y, Z, (machine.pc - Tetra.SIZE_IN_BYTE) & _MASK
+                ))
+    def jump(X, Y, Z):
+        machine.pc = (machine.pc + (((X << 16) | (Y << 8) | Z) << 2) - Tetra.SIZE_IN_BYTE) & _MASK
+    def jump_backward(X, Y, Z):
+        machine.pc = (machine.pc + ((((X << 16) | (Y << 8) | Z) - 0x1000000) << 2) - Tetra.SIZE_IN_BYTE) & _MASK
+    def get_address(X, Y, Z):
+        gpr[X] = (machine.pc + (((Y << 8) | Z) << 2) - Tetra.SIZE_IN_BYTE) & _MASK
+    def get_address_backward(X, Y, Z):
+        gpr[X] = (machine.pc + ((((Y << 8) | Z) - 0x10000) << 2) - Tetra.SIZE_IN_BYTE) & _MASK
+    def check_special_register(index):
+        guarantee(index < len(spr), "Special register {0} at {1:#x} doesn't exist!".format(
+            index, (machine.pc - Tetra.SIZE_IN_BYTE) & _MASK
+            ))
+    def put(X, Y, Z):   # pylint: disable=W0613
+        check_special_register(X)
+        spr[X] = gpr[Z]
+    def put_immediate(X, Y, Z):     # pylint: disable=W0613
+        check_special_register(X)
+        spr[X] = Z
+    def get(X, Y, Z):   # pylint: disable=W0613
+        check_special_register(Z)
+        gpr[X] = spr[Z]
+    def synchronize(X, Y, Z):
+        # XYZ = 6 clears the virtual translation caches, other kinds of synchronization have nothing to wait for
+        if (X << 16) | (Y << 8) | Z == 6 and isinstance(machine.memory, VirtualMemory):
+            machine.memory.flush()
+    def nothing_to_do(X, Y, Z):     # pylint: disable=W0613
+        pass
+    table[0x00] = trap
+    table[0xf0], table[0xf1] = jump, jump_backward
+    table[0xf4], table[0xf5] = get_address, get_address_backward
+    table[0xf6], table[0xf7] = put, put_immediate
+    table[0xfc], table[0xfd], table[0xfe] = synchronize, nothing_to_do, get
+    # the hints PRELD, PREGO, SYNCD and PREST have nothing to prefetch or write back
+    for opcode in (0x9a, 0x9c, 0xb8, 0xba):
+        table[opcode] = table[opcode + 1] = nothing_to_do
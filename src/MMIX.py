@@ -1,13 +1,23 @@
 ﻿'''
 MMIX computer simulator.
 '''
-from Register import Register
+from Register import Register, RegisterFile
+import SpecialRegisters
+from SpecialRegisters import SpecialRegisterFile
 from Memory import Memory
+from MmoLoader import MmoLoader
+from Cache import Cache, CachedMemory
+from VirtualMemory import VirtualMemory
+from DecodeCache import DecodeCache
+from Translator import Translator
+from Instructions import OPCODE_NAMES, OPCODES, build_dispatch_table
 from Byte import Byte
 from Wyde import Wyde
 from Tetra import Tetra
 from Octa import Octa
+from Utilities import guarantee
 from typecheck import *
+import copy
 
 class Instruction:
     '''
@@ -32,23 +42,36 @@ class MMIX:
     REGISTER_BIT_WIDTH = 64
     NUM_OF_GENERAL_PURPOSE_REGISTER = 256
     NUM_OF_SPECIAL_PURPOSE_REGISTER = 32
-    def __init__(self):
+    # event bits of the arithmetic status register rA
+    INTEGER_DIVIDE_CHECK = 0x80 # D
+    INTEGER_OVERFLOW = 0x40     # V
+    # ways to execute instructions, see run
+    INTERPRETER = 'interpreter'
+    PREDECODE = 'predecode'
+    TRANSLATE = 'translate'
+    ENGINES = (INTERPRETER, PREDECODE, TRANSLATE)
+    @typecheck
+    def __init__(self, engine: one_of(ENGINES)=PREDECODE) -> nothing:
+        '''
+        @engine (str): how instructions are executed, one of MMIX.ENGINES (see run).
+        '''
         # add registers
-        self.general_purpose_registers = list()
-        for i in range(MMIX.NUM_OF_GENERAL_PURPOSE_REGISTER):
-            self.general_purpose_registers.append(Register())
-        self.special_purpose_registers = list()
-        for i in range(MMIX.NUM_OF_SPECIAL_PURPOSE_REGISTER):
-            self.special_purpose_registers.append(Register())
-        self.special_purpose_register_names = (
-            'rB', 'rD', 'rE', 'rH', 'rJ', 'rM', 'rR', 'rBB', 'rC', 'rN', 'rO', 'rS', 'rI', 'rT',
-            'rTT', 'rK', 'rQ', 'rU', 'rV', 'rG', 'rL', 'rA', 'rF', 'rP', 'rW', 'rX', 'rY', 'rZ',
-            'rWW', 'rXX', 'rYY', 'rZZ'
-            )
+        self.general_purpose_registers = RegisterFile(MMIX.NUM_OF_GENERAL_PURPOSE_REGISTER)
+        self.special_purpose_registers = SpecialRegisterFile()
+        self.sr = self.special_purpose_registers    # e.g. self.sr.rA, see SpecialRegisterFile
+        self.special_purpose_register_names = SpecialRegisters.NAMES
 
         # add memory
         self.memory = Memory()
 
+        # program counter @, and whether a TRAP has halted the machine
+        self.pc = 0
+        self.halted = False
+        self.engine = engine
+        self.dispatch_table = self.__build_dispatch_table__()
+        self.decode_cache = None
+        self.translator = None
+
     @typecheck
     def __read_instruction__(self, address: Octa) -> Tetra:
         '''
@@ -58,32 +81,263 @@ class MMIX:
 
         @return (Tetra): an four-byte instruction
         '''
-        return self.memory.read(address, Tetra)
+        return Tetra._from_uint(self.memory.fetch_uint(address.uint, Tetra.SIZE_IN_BYTE))  # pylint: disable=W0212
 
-    @typecheck
-    def __get_special_register_index_by_name__(self, special_purpose_register_name: str) -> int:
+    def __get_special_register_index_by_name__(self, special_purpose_register_name):
         '''
         Get index of special purpose register by its name.
 
-        @address (str): name of a special purpose register, e.g. 'rA'
+        @special_purpose_register_name (str): name of a special purpose register, e.g. 'rA'
 
         @return (int): index into self.special_purpose_registers
         '''
-        for i in range(len(self.special_purpose_register_names)):
-            if special_purpose_register_name == self.special_purpose_register_names[i]:
-                return i
-        raise Exception("Special purpose register: %s is not defined." % special_purpose_register_name)
+        index = SpecialRegisters.INDEX.get(special_purpose_register_name)
+        guarantee(index is not None, "Special purpose register: %s is not defined." % special_purpose_register_name)
+        return index
+
+    @typecheck
+    def load_object_file(self, file: lambda x: isinstance(x, str) or hasattr(x, 'read')) -> MmoLoader:
+        '''
+        Load a program from an MMIX object file (.mmo) into memory, and set rG and the global registers $G through $255
+        as given by its postamble.
+
+        @file (str or file object): path of the .mmo file, or a file object opened in binary mode.
+
+        @return (MmoLoader): the loader, which keeps file names and line numbers of the program.
+        '''
+        loader = MmoLoader(self.__backing_memory__())
+        loader.load(file)
+        self.sr.rG = loader.G
+        for register_index, value in enumerate(loader.global_registers, loader.G):
+            self.general_purpose_registers[register_index].set_value(value)
+        self.pc = self.general_purpose_registers[255].uint
+        return loader
+
+    def __backing_memory__(self):
+        '''
+        The Memory under the caches and the virtual translation, if any.
+        '''
+        memory = self.memory
+        while not isinstance(memory, Memory):
+            memory = memory.memory
+        return memory
+
+    @typecheck
+    def enable_caches(self, icache: Cache, dcache: Cache) -> CachedMemory:
+        '''
+        Put an instruction cache and a data cache between this machine and its memory. They may share a second level
+        cache as their next_level. Caches are physical: with virtual translation, they're put under it.
+
+        @icache (Cache): first level cache of instructions;
+        @dcache (Cache): first level cache of data.
+
+        @return (CachedMemory): the cached memory, which gives the statistics.
+        '''
+        cached_memory = CachedMemory(self.__backing_memory__(), icache, dcache)
+        if isinstance(self.memory, VirtualMemory):
+            self.memory.memory = cached_memory
+        else:
+            self.memory = cached_memory
+        return cached_memory
+
+    @typecheck
+    def disable_caches(self) -> nothing:
+        '''
+        Remove the caches, if any, so that this machine talks to its memory directly again.
+
+        @return (None)
+        '''
+        if isinstance(self.memory, VirtualMemory):
+            self.memory.memory = self.__backing_memory__()
+        else:
+            self.memory = self.__backing_memory__()
+
+    @typecheck
+    def enable_virtual_translation(self, tlb_size: lambda x: isinstance(x, int) and x > 0=64) -> VirtualMemory:
+        '''
+        Translate the addresses of instruction fetches, loads and stores as set up by rV, see VirtualMemory.
+
+        @tlb_size=64 (int): number of translations held by the instruction TLB, and by the data TLB.
+
+        @return (VirtualMemory): the memory as seen by this machine from now on, which gives the TLB statistics.
+        '''
+        self.disable_virtual_translation()
+        self.memory = VirtualMemory(
+            self.memory, self.special_purpose_registers[SpecialRegisters.RV], tlb_size
+            )
+        return self.memory
+
+    @typecheck
+    def disable_virtual_translation(self) -> nothing:
+        '''
+        Stop translating addresses, if it's done, so that virtual addresses are physical again.
+
+        @return (None)
+        '''
+        if isinstance(self.memory, VirtualMemory):
+            self.memory = self.memory.memory
+
+    @typecheck
+    def fork(self) -> lambda x: isinstance(x, MMIX):
+        '''
+        Create a copy of this machine that runs independently. Registers are copied, memory is forked, so its pages are
+        shared until written (see Memory.fork). Caches and virtual translation stay enabled: the caches are copied, and
+        addresses are translated as set up by the rV of the new machine, with empty TLBs.
+
+        @return (MMIX): the new machine.
+        '''
+        other = copy.copy(self)
+        other.general_purpose_registers = self.general_purpose_registers.copy()
+        other.special_purpose_registers = other.sr = self.special_purpose_registers.copy()
+        other.memory = self.__backing_memory__().fork()
+        cached_memory = self.memory.memory if isinstance(self.memory, VirtualMemory) else self.memory
+        if isinstance(cached_memory, CachedMemory):
+            # copied together, so that a second level shared by both caches stays shared
+            other.enable_caches(*copy.deepcopy((cached_memory.icache, cached_memory.dcache)))
+        if isinstance(self.memory, VirtualMemory):
+            other.enable_virtual_translation(self.memory.itlb.size)
+        other.dispatch_table = other.__build_dispatch_table__()
+        other.decode_cache = None
+        other.translator = None
+        return other
+
+    def __decode_cache__(self):
+        '''
+        The DecodeCache of self.memory, created when first needed, if instructions are predecoded. Instructions are
+        fetched one by one while caches or virtual translation are enabled, so that they're accounted and translated.
+
+        @return (DecodeCache): None if instructions aren't predecoded.
+        '''
+        if self.engine == MMIX.INTERPRETER or not isinstance(self.memory, Memory):
+            return None
+        if self.decode_cache is None or self.decode_cache.memory is not self.memory:
+            if self.decode_cache is not None:
+                self.decode_cache.detach()
+            self.decode_cache = DecodeCache(self.memory, self.dispatch_table)
+        return self.decode_cache
+
+    def __translator__(self):
+        '''
+        The Translator of self.memory, created when first needed, if blocks are translated. Like the decode cache, it's
+        not used while caches or virtual translation are enabled.
+
+        @return (Translator): None if blocks aren't translated.
+        '''
+        if self.engine != MMIX.TRANSLATE or not isinstance(self.memory, Memory):
+            return None
+        if self.translator is None or self.translator.memory is not self.memory:
+            if self.translator is not None:
+                self.translator.detach()
+            self.translator = Translator(self.memory, self)
+        return self.translator
+
+    @typecheck
+    def step(self) -> nothing:
+        '''
+        Execute one instruction: fetch the tetra at @, or take it from the decode cache, advance @ to the next
+        instruction, and dispatch on the OP code with X, Y and Z as ints.
+
+        @return (None)
+        '''
+        pc = self.pc
+        cache = self.__decode_cache__()
+        if cache is None:
+            instruction = self.memory.fetch_uint(pc, Tetra.SIZE_IN_BYTE)
+            handler = self.dispatch_table[instruction >> 24]
+            X, Y, Z = (instruction >> 16) & 0xff, (instruction >> 8) & 0xff, instruction & 0xff
+        else:
+            entry = cache.entries.get(pc)
+            if entry is None:
+                entry = cache.decode(pc)
+            else:
+                cache.hits += 1
+            handler, X, Y, Z = entry
+        self.pc = (pc + Tetra.SIZE_IN_BYTE) & Octa.MASK
+        handler(X, Y, Z)
+
+    @typecheck
+    def run(self, max_instructions: optional(lambda x: isinstance(x, int) and x >= 0)=None) -> int:
+        '''
+        Execute instructions from @ until the machine halts (TRAP 0,Halt,0), or max_instructions are executed.
+        The interpreter engine fetches and decodes every instruction it executes, the predecode engine decodes each
+        one once into the decode cache (see DecodeCache). The translate engine runs basic blocks translated into Python
+        functions (see Translator), and steps through the instructions no block can hold, or when fewer instructions
+        than a whole block are left to execute.
+
+        @max_instructions (int): limit of instructions to execute, None for no limit.
+
+        @return (int): number of instructions executed.
+        '''
+        translator = self.__translator__()
+        if translator is not None:
+            return self.__run_translated__(translator, max_instructions)
+        table = self.dispatch_table
+        count = 0
+        cache = self.__decode_cache__()
+        if cache is None:
+            while not self.halted and count != max_instructions:
+                pc = self.pc
+                instruction = self.memory.fetch_uint(pc, 4)
+                self.pc = (pc + 4) & Octa.MASK
+                table[instruction >> 24]((instruction >> 16) & 0xff, (instruction >> 8) & 0xff, instruction & 0xff)
+                count += 1
+            return count
+        entries = cache.entries
+        decode = cache.decode
+        misses = cache.misses
+        try:
+            while not self.halted and count != max_instructions:
+                pc = self.pc
+                entry = entries.get(pc)
+                if entry is None:
+                    entry = decode(pc)
+                handler, X, Y, Z = entry
+                self.pc = (pc + 4) & Octa.MASK
+                handler(X, Y, Z)
+                count += 1
+        finally:
+            # every instruction fetched but not decoded is a hit
+            cache.hits += count - (cache.misses - misses)
+        return count
+
+    def __run_translated__(self, translator, max_instructions):
+        '''
+        Run blocks of translator, see run.
+        '''
+        blocks = translator.blocks
+        registers = self.general_purpose_registers.values
+        count = 0
+        while not self.halted and count != max_instructions:
+            entry = blocks.get(self.pc)
+            if entry is None:
+                entry = translator.translate(self.pc)
+            else:
+                translator.hits += 1
+            block, length = entry
+            if block is None or (max_instructions is not None and count + length > max_instructions):
+                self.step()
+                count += 1
+            else:
+                count += block(self, registers)
+        return count
 
     @typecheck
-    def __print_memory__(self, unit: one_of((Byte, Wyde, Tetra, Octa))=Byte) -> str:
+    def __print_memory__(
+            self,
+            unit: one_of((Byte, Wyde, Tetra, Octa))=Byte,
+            start: lambda x: isinstance(x, int) and 0 <= x <= Memory.ADDRESS_SPACE_SIZE=0,
+            end: lambda x: isinstance(x, int) and 0 <= x <= Memory.ADDRESS_SPACE_SIZE=Memory.ADDRESS_SPACE_SIZE
+        ) -> str:
         '''
         Print current memory to a string. Can be used for debugging purpose.
 
-        @unit=Byte (class): which class to use as printing granuity.
+        @unit=Byte (class): which class to use as printing granuity;
+        @start=0 (int): first address to print;
+        @end=2^64 (int): address after the last to print.
 
         @return (str): a string representation of current memory.
         '''
-        return self.memory.to_str(unit)
+        return ''.join(self.memory.dump(unit, start, end))
 
     @typecheck
     def __print_general_purpose_registers__(self) -> str:
@@ -109,6 +363,17 @@ class MMIX:
             result += "%s:\t0x"%self.special_purpose_register_names[register_index] + self.special_purpose_registers[register_index].hex + "\n"
         return result
 
+    # Instructions by name, taking the operands X, Y and Z as Bytes, for debugging and tests. Each one runs the handler
+    # of its OP code from the dispatch table (see Instructions), so it does exactly what step and run do: an immediate Z
+    # is unsigned, and memory addresses are rounded down to a multiple of the size accessed.
+
+    def __execute__(self, name, X, Y, Z, is_direct=False):
+        '''
+        Execute the instruction name (str), a mnemonic of Instructions.OPCODE_NAMES, with the operands X, Y and Z
+        (Byte). An 'I' is appended to name for the immediate form if is_direct (bool).
+        '''
+        self.dispatch_table[OPCODES[name + ('I' if is_direct else '')]](X.uint, Y.uint, Z.uint)
+
     @typecheck
     def __LDB_direct__(self, X: Byte, Y: Byte, Z: Byte) -> nothing:
         '''
@@ -275,23 +540,14 @@ class MMIX:
 
         @X (Byte): Index to general_purpose_registers;
         @Y (Byte): Index to general_purpose_registers;
-        @Z (Byte): Index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
         @data_type (class): data type to load, must be one of Byte, Wyde, Tetra, or Octa;
         @is_signed (bool): whether to use signed value or not;
         @is_direct (bool): whether Z is an direct operator or not.
 
         @return (None)
         '''
-        if is_direct:
-            memory_addr = Octa(self.general_purpose_registers[Y.uint].uint+Z.int)
-        else:
-            memory_addr = Octa(self.general_purpose_registers[Y.uint].uint + self.general_purpose_registers[Z.uint].int)
-        if is_signed:
-            tmp = self.memory.read(memory_addr, data_type).int
-            self.general_purpose_registers[X.uint].set_value(tmp)
-        else:
-            tmp = self.memory.read(memory_addr, data_type).uint
-            self.general_purpose_registers[X.uint].set_value(tmp)
+        self.__execute__('LD' + data_type.__name__[0] + ('' if is_signed else 'U'), X, Y, Z, is_direct)
 
     @typecheck
     def __LDO_direct__(self, X: Byte, Y: Byte, Z: Byte) -> nothing:
@@ -355,17 +611,12 @@ class MMIX:
 
         @X (Byte): Index to general_purpose_registers;
         @Y (Byte): Index to general_purpose_registers;
-        @Z (Byte): A direct operator or an index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
         @is_direct (bool): whether Z is an direct operator or not.
 
         @return (None)
         '''
-        if is_direct:
-            memory_addr = Octa(self.general_purpose_registers[Y.uint].uint+Z.int)
-        else:
-            memory_addr = Octa(self.general_purpose_registers[Y.uint].uint+self.general_purpose_registers[Z.uint].int)
-        tmp = self.memory.read(memory_addr, Tetra).uint
-        self.general_purpose_registers[X.uint].set_value(tmp<<(Octa.SIZE_IN_BIT - Tetra.SIZE_IN_BIT))
+        self.__execute__('LDHT', X, Y, Z, is_direct)
 
     @typecheck
     def __LDA__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
@@ -377,47 +628,223 @@ class MMIX:
 
         @X (Byte): Index to general_purpose_registers;
         @Y (Byte): Index to general_purpose_registers;
-        @Z (Byte): A direct operator or an index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
         @is_direct (bool): whether Z is an direct operator or not.
 
         @return (None)
         '''
-        if is_direct:
-            memory_addr = Octa(self.general_purpose_registers[Y.uint].uint+Z.int)
-        else:
-            memory_addr = Octa(self.general_purpose_registers[Y.uint].uint+self.general_purpose_registers[Z.uint].int)
-        self.general_purpose_registers[X.uint].set_value(memory_addr.uint)
+        self.__execute__('ADDU', X, Y, Z, is_direct)
 
     @typecheck
     def __STx__(self, X: Byte, Y: Byte, Z: Byte, data_type: one_of((Byte, Wyde, Tetra, Octa)), is_signed: bool, is_direct: bool) -> nothing:
         '''
-        Store registers into memory. How big chunk of data is loaded is based on data_type. Whether Z is a direct operator or an indirect
-        operator depends on is_direct.
-        register X is stored to M[$Y + $Z] or M[$Y + Z] using given data_type.
+        Store registers into memory. How big chunk of data is stored is based on data_type. Whether Z is a direct
+        operator or an indirect operator depends on is_direct.
+        The lowest bytes of register X are stored to M[$Y + $Z] or M[$Y + Z] using given data_type. A signed store
+        raises an integer overflow exception if $X doesn't fit in data_type as a signed number.
 
         @X (Byte): Index to general_purpose_registers, which to be stored;
         @Y (Byte): Index to general_purpose_registers;
-        @Z (Byte): Index to general_purpose_registers;
-        @data_type (class): data type to load, must be one of Byte, Wyde, Tetra, or Octa;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
+        @data_type (class): data type to store, must be one of Byte, Wyde, Tetra, or Octa;
         @is_signed (bool): whether to use signed value or not;
         @is_direct (bool): whether Z is an direct operator or not.
 
         @return (None)
         '''
-        if is_direct:
-            memory_addr = Octa(self.general_purpose_registers[Y.uint].uint + Z.int)
-        else:
-            memory_addr = Octa(self.general_purpose_registers[Y.uint].uint + self.general_purpose_registers[Z.uint].int)
-        if is_signed:
-            # TODO: overflow check needs to be added.
-            tmp = self.general_purpose_registers[X.uint].uint & 0xFF
-            self.memory.set(memory_addr, Byte(tmp))
-        else:
-            tmp = self.general_purpose_registers[X.uint].uint & 0xFF
-            self.memory.set(memory_addr, Byte(tmp))
+        self.__execute__('ST' + data_type.__name__[0] + ('' if is_signed else 'U'), X, Y, Z, is_direct)
 
     @typecheck
     def __STB__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
         '''
         '''
         self.__STx__(X, Y, Z, Byte, True, is_direct)
+
+    @typecheck
+    def __MUL__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Multiply.
+        The signed product $Y * $Z or $Y * Z is placed into register X. An integer overflow exception (event bit V of
+        rA) occurs if the product doesn't fit in 64 bits; $X gets the product modulo 2^64 anyway.
+
+        @X (Byte): Index to general_purpose_registers;
+        @Y (Byte): Index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
+        @is_direct (bool): whether Z is an direct operator or not.
+
+        @return (None)
+        '''
+        self.__execute__('MUL', X, Y, Z, is_direct)
+
+    @typecheck
+    def __MULU__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Multiply unsigned.
+        The lower 64 bits of the unsigned 128-bit product $Y * $Z or $Y * Z are placed into register X, and the upper
+        64 bits are placed into the special himult register rH.
+
+        @X (Byte): Index to general_purpose_registers;
+        @Y (Byte): Index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
+        @is_direct (bool): whether Z is an direct operator or not.
+
+        @return (None)
+        '''
+        self.__execute__('MULU', X, Y, Z, is_direct)
+
+    @typecheck
+    def __DIV__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Divide.
+        The signed quotient of $Y / $Z or $Y / Z is placed into register X, rounded towards negative infinity, and the
+        remainder is placed into the special remainder register rR. If the divisor is zero, $X is set to zero, rR to
+        $Y, and an integer divide check exception (event bit D of rA) occurs. If -2^63 is divided by -1, an integer
+        overflow exception (event bit V of rA) occurs, $X is set to -2^63 and rR to zero.
+
+        @X (Byte): Index to general_purpose_registers;
+        @Y (Byte): Index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
+        @is_direct (bool): whether Z is an direct operator or not.
+
+        @return (None)
+        '''
+        self.__execute__('DIV', X, Y, Z, is_direct)
+
+    @typecheck
+    def __DIVU__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Divide unsigned.
+        The unsigned 128-bit number obtained by prefixing the special dividend register rD to $Y is divided by the
+        unsigned number $Z or Z. The quotient is placed into register X and the remainder into the special remainder
+        register rR. If rD is greater than or equal to the divisor (including the case of a zero divisor), $X is set to
+        rD and rR to $Y instead, as the quotient wouldn't fit in 64 bits.
+
+        @X (Byte): Index to general_purpose_registers;
+        @Y (Byte): Index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
+        @is_direct (bool): whether Z is an direct operator or not.
+
+        @return (None)
+        '''
+        self.__execute__('DIVU', X, Y, Z, is_direct)
+
+    @typecheck
+    def __MOR__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Multiple or.
+        Regarding $Y and $Z or Z as 8x8 Boolean matrices, byte i of $X is the bitwise or of those bytes k of $Y for
+        which bit k of byte i of $Z is set (bytes and bits counted from the least significant end).
+
+        @X (Byte): Index to general_purpose_registers;
+        @Y (Byte): Index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
+        @is_direct (bool): whether Z is an direct operator or not.
+
+        @return (None)
+        '''
+        self.__execute__('MOR', X, Y, Z, is_direct)
+
+    @typecheck
+    def __MXOR__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Multiple exclusive-or.
+        Same as MOR, except that the selected bytes of $Y are combined by bitwise xor.
+
+        @X (Byte): Index to general_purpose_registers;
+        @Y (Byte): Index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
+        @is_direct (bool): whether Z is an direct operator or not.
+
+        @return (None)
+        '''
+        self.__execute__('MXOR', X, Y, Z, is_direct)
+
+    @typecheck
+    def __SADD__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Sideways add.
+        The number of bits that are set in $Y and cleared in $Z or Z is placed into register X.
+
+        @X (Byte): Index to general_purpose_registers;
+        @Y (Byte): Index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
+        @is_direct (bool): whether Z is an direct operator or not.
+
+        @return (None)
+        '''
+        self.__execute__('SADD', X, Y, Z, is_direct)
+
+    @typecheck
+    def __xDIF__(self, X: Byte, Y: Byte, Z: Byte, data_type: one_of((Byte, Wyde, Tetra, Octa)), is_direct: bool) -> nothing:
+        '''
+        Saturating difference.
+        Each data_type sized piece of $X is the corresponding piece of $Y minus that of $Z or Z, as unsigned numbers,
+        or zero if that would be negative.
+
+        @X (Byte): Index to general_purpose_registers;
+        @Y (Byte): Index to general_purpose_registers;
+        @Z (Byte): A direct operator (unsigned) or an index to general_purpose_registers;
+        @data_type (class): size of the pieces, must be one of Byte, Wyde, Tetra, or Octa;
+        @is_direct (bool): whether Z is an direct operator or not.
+
+        @return (None)
+        '''
+        self.__execute__(data_type.__name__[0] + 'DIF', X, Y, Z, is_direct)
+
+    @typecheck
+    def __BDIF__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Byte difference: saturating difference of each byte of $Y and $Z or Z.
+        '''
+        self.__xDIF__(X, Y, Z, Byte, is_direct)
+
+    @typecheck
+    def __WDIF__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Wyde difference: saturating difference of each wyde of $Y and $Z or Z.
+        '''
+        self.__xDIF__(X, Y, Z, Wyde, is_direct)
+
+    @typecheck
+    def __TDIF__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Tetra difference: saturating difference of each tetra of $Y and $Z or Z.
+        '''
+        self.__xDIF__(X, Y, Z, Tetra, is_direct)
+
+    @typecheck
+    def __ODIF__(self, X: Byte, Y: Byte, Z: Byte, is_direct: bool) -> nothing:
+        '''
+        Octa difference: $Y minus $Z or Z as unsigned numbers, or zero if that would be negative.
+        '''
+        self.__xDIF__(X, Y, Z, Octa, is_direct)
+
+    @typecheck
+    def __SYNC__(self, X: Byte, Y: Byte, Z: Byte) -> nothing:
+        '''
+        Synchronize.
+        XYZ = 6 clears the virtual translation caches. The other kinds of synchronization have nothing to wait for in
+        this simulator.
+
+        @X, Y, Z (Byte): together the unsigned number XYZ.
+
+        @return (None)
+        '''
+        self.__execute__('SYNC', X, Y, Z)
+
+    def __unimplemented__(self, opcode, X, Y, Z):   # pylint: disable=W0613
+        '''
+        Handler of the OP codes the machine can't execute yet.
+        '''
+        guarantee(False, "{0} at {1:#x} is not implemented!".format(
+            OPCODE_NAMES[opcode], (self.pc - Tetra.SIZE_IN_BYTE) & Octa.MASK
+            ))
+
+    def __build_dispatch_table__(self):
+        '''
+        Build the table of instruction handlers indexed by OP code, as used by step and run: separate handlers for the
+        register and the immediate form of every instruction, see Instructions.build_dispatch_table.
+
+        @return (list): 256 handlers.
+        '''
+        return build_dispatch_table(self)
@@ -7,15 +7,612 @@ from Wyde import Wyde   #pylint: disable=W0611
 from Tetra import Tetra # pylint: disable=W0611
 from Octa import Octa
 from typecheck import *
-from Numeric import Range
+from Utilities import guarantee
+import bisect
+import collections
+import heapq
+import mmap
+import os
+import struct
+import types
+
+# big-endian struct codecs by size in bytes, for the raw accessors
+_UNSIGNED = {size: struct.Struct('>' + code) for size, code in ((1, 'B'), (2, 'H'), (4, 'I'), (8, 'Q'))}
+_SIGNED = {size: struct.Struct('>' + code) for size, code in ((1, 'b'), (2, 'h'), (4, 'i'), (8, 'q'))}
+# checkpoint file header: magic, kind (CHECKPOINT_FULL or CHECKPOINT_DELTA), page size, number of pages;
+# each page follows as its page number and its content
+_CHECKPOINT_HEADER = struct.Struct('>8sBIQ')
+_CHECKPOINT_PAGE_NUMBER = struct.Struct('>Q')
+# address >> _SEGMENT_SHIFT is the index into Memory.segment_pages, the three most significant bits of the address
+_SEGMENT_SHIFT = Octa.SIZE_IN_BIT - 3
+
+class FileMapping:
+    '''
+    A host file mapped into a range of guest addresses [start, end).
+    '''
+    def __init__(self, start, data, copy_on_write):
+        '''
+        @start (int): guest address of the first byte;
+        @data (mmap): read-only mapping of the host file;
+        @copy_on_write (bool): whether guest writes are allowed, on private copies of the pages they touch.
+        '''
+        self.start = start
+        self.end = start + len(data)
+        self.data = data
+        self.copy_on_write = copy_on_write
+
+class Segment:
+    '''
+    One segment of the address space, with its own page table:
+        page number (uint) -> bytearray
+    '''
+    def __init__(self, name, start, end):
+        '''
+        @name (str): name of the segment, e.g. 'text';
+        @start (int): first address of the segment;
+        @end (int): address after the last one of the segment.
+        '''
+        self.name = name
+        self.start = start
+        self.end = end
+        self.pages = dict()
+
+    def copy(self):
+        '''
+        Return a copy of this segment, with a page table of its own, holding the same pages.
+        '''
+        other = Segment(self.name, self.start, self.end)
+        other.pages = dict(self.pages)
+        return other
 
 class Memory:
     '''
-    A class that simulates MMIX memory behaviour, which is implemented as a dictionary:
-        address (uint) -> Byte
+    A class that simulates MMIX memory behaviour. The 2^64 bytes address space is split into pages of page_size bytes,
+    and only the pages that have been written are allocated, as bytearray. Like MMIX, the address space is divided into
+    segments by the three most significant bits of addresses: text, data, pool and stack segments, and the negative
+    addresses of the kernel. Each segment keeps its allocated pages in its own page table (see Segment).
+    Host files can also be mapped into the address space (see map_file). A page that hasn't been allocated is read from
+    the file mapping covering it, if any, and gives zeros otherwise.
+
+    Pages may be shared with forks and snapshots of the memory (see fork). Only the pages in self._writable are private
+    and can be written in place, any other page is copied on its first write, unless it's in self._clean: private, but
+    not written since the last checkpoint. So every first write to a page after a fork or a checkpoint takes the slow
+    path, which records the page in self.dirty_pages.
+
+    The same slow path tells the functions in self.write_watchers about the first write to a page watched by watch_page,
+    e.g. so that instructions decoded from it are dropped.
     '''
-    def __init__(self):
-        self.memory = dict()
+    CHECKPOINT_MAGIC = b'MMIXMEM\0'
+    CHECKPOINT_FULL = 0
+    CHECKPOINT_DELTA = 1
+    DEFAULT_PAGE_SIZE = 4096
+    ADDRESS_SPACE_SIZE = 2 ** Octa.SIZE_IN_BIT
+    # name, start and end of segments. All of them grow up from their start, the register stack of MMIX included.
+    SEGMENT_LAYOUT = (
+        ('text', 0x0000000000000000, 0x2000000000000000),
+        ('data', 0x2000000000000000, 0x4000000000000000),
+        ('pool', 0x4000000000000000, 0x6000000000000000),
+        ('stack', 0x6000000000000000, 0x8000000000000000),
+        ('kernel', 0x8000000000000000, ADDRESS_SPACE_SIZE),
+        )
+
+    @typecheck
+    def __init__(
+            self,
+            page_size: lambda x: isinstance(x, int) and x >= Octa.SIZE_IN_BYTE and x & (x - 1) == 0=DEFAULT_PAGE_SIZE
+        ) -> nothing:
+        '''
+        Create an empty memory.
+
+        @page_size (int): size of one page in bytes, a power of two not less than the size of an Octa.
+        '''
+        self.page_size = page_size
+        self.page_shift = page_size.bit_length() - 1    # address >> page_shift is the page number
+        self.offset_mask = page_size - 1                # address & offset_mask is the offset within the page
+        self.segments = tuple(Segment(*layout) for layout in Memory.SEGMENT_LAYOUT)
+        self.segment_shift = _SEGMENT_SHIFT - self.page_shift    # page number >> segment_shift indexes segment_pages
+        self.__link_segments__()
+        self.page_index = list()        # numbers of allocated pages, sorted, for queries in address order
+        self._writable = dict()         # page number (uint) -> bytearray, the allocated pages nobody shares
+        self._clean = dict()            # same, for private pages not written since the last checkpoint or watched
+        self.dirty_pages = set()        # numbers of pages written since the last checkpoint
+        self.watched_pages = set()      # numbers of pages whose next write is reported to self.write_watchers
+        self.write_watchers = list()    # functions called with the page number (int)
+        self.read_only = False
+        self.mappings = list()          # FileMapping objects, sorted by start address
+        self.mapping_starts = list()    # start addresses of self.mappings, for bisect
+
+    def __link_segments__(self):
+        '''
+        Set self.segment_pages, the page tables of segments indexed by the three most significant bits of addresses.
+        '''
+        self.segment_pages = tuple(self.segments[min(index, 4)].pages for index in range(8))
+
+    @property
+    def pages(self):
+        '''
+        All allocated pages, page number (uint) -> bytearray, as a read-only view over the page tables of segments.
+        '''
+        return types.MappingProxyType(collections.ChainMap(*(segment.pages for segment in self.segments)))
+
+    @typecheck
+    def footprint(self) -> dict_of(str, dict):
+        '''
+        Account the memory taken by each segment.
+
+        @return (dict): segment name -> dict of
+            'pages': number of allocated pages,
+            'bytes': host memory taken by allocated pages,
+            'mapped': number of bytes of the segment mapped from files,
+            'extent': distance from the start of the segment to the end of its last allocated page.
+        '''
+        result = dict()
+        for segment in self.segments:
+            high = bisect.bisect_right(self.page_index, (segment.end - 1) >> self.page_shift)
+            extent = 0
+            if high and self.page_index[high - 1] >= segment.start >> self.page_shift:
+                extent = ((self.page_index[high - 1] + 1) << self.page_shift) - segment.start
+            result[segment.name] = {
+                'pages': len(segment.pages),
+                'bytes': len(segment.pages) * self.page_size,
+                'mapped': sum(
+                    max(0, min(segment.end, mapping.end) - max(segment.start, mapping.start)) for mapping in self.mappings
+                    ),
+                'extent': extent,
+                }
+        return result
+
+    @typecheck
+    def map_file(
+            self,
+            address: lambda x: isinstance(x, int) and 0 <= x <= Octa.MASK,
+            file: lambda x: isinstance(x, str) or hasattr(x, 'fileno'),
+            length: optional(lambda x: isinstance(x, int) and x > 0)=None,
+            offset: lambda x: isinstance(x, int) and x >= 0=0,
+            copy_on_write: bool=False
+        ) -> FileMapping:
+        '''
+        Map a host file into the address space, so that loads read it in place instead of copying it into pages.
+        A read-only mapping refuses guest writes. A copy-on-write mapping gives each page a private copy on its first
+        write; the host file is never changed.
+
+        @address (int): guest address of the first mapped byte, aligned to page_size;
+        @file (str or file object): path of the host file, or an open file;
+        @length (int): number of bytes to map, by default up to the end of the file;
+        @offset (int): offset in the file of the first mapped byte, a multiple of mmap.ALLOCATIONGRANULARITY;
+        @copy_on_write (bool): whether guest writes are allowed.
+
+        @return (FileMapping): the new mapping.
+        '''
+        guarantee(address & self.offset_mask == 0, "Mapping address {0:#x} is not aligned to a page!".format(address))
+        guarantee(
+            offset % mmap.ALLOCATIONGRANULARITY == 0,
+            "Mapping offset {0} is not a multiple of {1}!".format(offset, mmap.ALLOCATIONGRANULARITY)
+            )
+        if isinstance(file, str):
+            with open(file, 'rb') as host_file:
+                data = self.__mmap__(host_file.fileno(), length, offset)
+        else:
+            data = self.__mmap__(file.fileno(), length, offset)
+        mapping = FileMapping(address, data, copy_on_write)
+        index = bisect.bisect_left(self.mapping_starts, address)
+        if (mapping.end > Memory.ADDRESS_SPACE_SIZE or
+                (index > 0 and self.mappings[index - 1].end > address) or
+                (index < len(self.mappings) and self.mappings[index].start < mapping.end)):
+            data.close()
+            guarantee(False, "Mapping [{0:#x}, {1:#x}) overlaps another one!".format(address, mapping.end))
+        first_page, last_page = address >> self.page_shift, (mapping.end - 1) >> self.page_shift
+        page_index = bisect.bisect_left(self.page_index, first_page)
+        if page_index < len(self.page_index) and self.page_index[page_index] <= last_page:
+            data.close()
+            guarantee(False, "Mapping [{0:#x}, {1:#x}) overlaps written pages!".format(address, mapping.end))
+        self.mappings.insert(index, mapping)
+        self.mapping_starts.insert(index, address)
+        return mapping
+
+    @staticmethod
+    def __mmap__(fileno, length, offset):
+        '''
+        Map length bytes (None for up to the end) of file descriptor fileno from offset, read-only.
+        '''
+        if length is None:
+            length = os.fstat(fileno).st_size - offset
+            guarantee(length > 0, "Nothing to map after offset {0}!".format(offset))
+        return mmap.mmap(fileno, length, access=mmap.ACCESS_READ, offset=offset)
+
+    @typecheck
+    def unmap_file(self, address: lambda x: isinstance(x, int) and 0 <= x <= Octa.MASK) -> nothing:
+        '''
+        Remove the file mapping starting at address. Pages already copied from a copy-on-write mapping are kept, the rest
+        of its range reads zeros again.
+
+        @address (int): start address of the mapping.
+
+        @return (None)
+        '''
+        index = bisect.bisect_left(self.mapping_starts, address)
+        guarantee(
+            index < len(self.mappings) and self.mapping_starts[index] == address,
+            "No mapping starts at {0:#x}!".format(address)
+            )
+        del self.mapping_starts[index]
+        # forks may still use the mapping, so it's left to be closed when the last of them drops it
+        del self.mappings[index]
+
+    @typecheck
+    def fork(self) -> lambda x: isinstance(x, Memory):
+        '''
+        Create a copy of this memory that can be changed independently. Pages aren't copied but shared by both, and
+        copied only when either of them first writes to it, so forking takes time in the number of pages, not bytes.
+
+        @return (Memory): the new memory.
+        '''
+        return self.__share__(False)
+
+    @typecheck
+    def snapshot(self) -> lambda x: isinstance(x, Memory):
+        '''
+        Take a read-only copy of the current content of this memory, sharing pages the same way as fork. The snapshot
+        can be read, or forked any number of times to start again from the same content.
+
+        @return (Memory): the snapshot.
+        '''
+        return self.__share__(True)
+
+    def __share__(self, read_only):
+        '''
+        Create a memory sharing all pages with this one. This memory can't write in place to any of them afterwards.
+        '''
+        other = Memory.__new__(Memory)
+        other.__dict__.update(self.__dict__)
+        other.segments = tuple(segment.copy() for segment in self.segments)
+        other.__link_segments__()
+        other.page_index = list(self.page_index)
+        other._writable = dict()   # pylint: disable=W0212
+        other._clean = dict()      # pylint: disable=W0212
+        other.dirty_pages = set(self.dirty_pages)
+        other.watched_pages = set()
+        other.write_watchers = list()
+        other.read_only = read_only
+        other.mappings = list(self.mappings)
+        other.mapping_starts = list(self.mapping_starts)
+        self._writable = dict()
+        self._clean = dict()
+        return other
+
+    @typecheck
+    def checkpoint(self, file: lambda x: hasattr(x, 'write'), full: bool=False) -> int:
+        '''
+        Write a checkpoint of this memory to a binary file, and start tracking dirty pages anew. A full checkpoint holds
+        all allocated pages, an incremental one only the pages written since the last checkpoint, so its cost is in the
+        size of the working set. Content of file mappings isn't saved, only the pages copied from them on write.
+
+        @file (file object): binary file to write to;
+        @full (bool): whether to save all pages instead of dirty ones.
+
+        @return (int): number of pages saved.
+        '''
+        page_numbers = self.page_index if full else sorted(self.dirty_pages)
+        kind = Memory.CHECKPOINT_FULL if full else Memory.CHECKPOINT_DELTA
+        file.write(_CHECKPOINT_HEADER.pack(Memory.CHECKPOINT_MAGIC, kind, self.page_size, len(page_numbers)))
+        for page_number in page_numbers:
+            file.write(_CHECKPOINT_PAGE_NUMBER.pack(page_number))
+            file.write(self.segment_pages[page_number >> self.segment_shift][page_number])
+        self.dirty_pages = set()
+        # pages stay private, but their next write must take the slow path again, to be marked dirty
+        self._clean.update(self._writable)
+        self._writable = dict()
+        return len(page_numbers)
+
+    @classmethod
+    @typecheck
+    def restore(cls, files: with_attr('__iter__')) -> lambda x: isinstance(x, Memory):
+        '''
+        Rebuild a memory from a full checkpoint followed by the incremental checkpoints taken after it, in order.
+
+        @files (iterable of file objects): binary files of the checkpoints, the first one full.
+
+        @return (Memory): the memory as it was at the last checkpoint.
+        '''
+        files = list(files)
+        guarantee(all(hasattr(file, 'read') for file in files), "Checkpoints must be restored from files!")
+        memory = None
+        for file in files:
+            magic, kind, page_size, count = _CHECKPOINT_HEADER.unpack(file.read(_CHECKPOINT_HEADER.size))
+            guarantee(magic == Memory.CHECKPOINT_MAGIC, "Not a checkpoint of memory!")
+            if memory is None:
+                guarantee(kind == Memory.CHECKPOINT_FULL, "The first checkpoint to restore must be a full one!")
+                memory = cls(page_size)
+            guarantee(page_size == memory.page_size, "Checkpoints of different page sizes cannot be combined!")
+            for i in range(count):
+                page_number = _CHECKPOINT_PAGE_NUMBER.unpack(file.read(_CHECKPOINT_PAGE_NUMBER.size))[0]
+                page = bytearray(file.read(page_size))
+                guarantee(len(page) == page_size, "Checkpoint ends unexpectedly!")
+                pages = memory.segment_pages[page_number >> memory.segment_shift]
+                if page_number not in pages:
+                    bisect.insort(memory.page_index, page_number)
+                pages[page_number] = memory._clean[page_number] = page   # pylint: disable=W0212
+        guarantee(memory is not None, "No checkpoint to restore!")
+        return memory
+
+    def watch_page(self, page_number):
+        '''
+        Have the next write to the page numbered page_number (int) call every function in self.write_watchers with the
+        page number, before it's written. The page takes the slow path of writes until then.
+
+        @return (None)
+        '''
+        self.watched_pages.add(page_number)
+        page = self._writable.pop(page_number, None)
+        if page is not None:
+            self._clean[page_number] = page
+
+    def __find_mapping__(self, address):
+        '''
+        Return the FileMapping holding address (int), or None.
+        '''
+        index = bisect.bisect_right(self.mapping_starts, address) - 1
+        if index >= 0 and address < self.mappings[index].end:
+            return self.mappings[index]
+        return None
+
+    def __unallocated_bytes__(self, address, length):
+        '''
+        Content of a run of length bytes from address (int) within one page that isn't allocated.
+        '''
+        if self.mappings:
+            # mappings start on a page boundary, so a page is either covered from its beginning or not at all
+            mapping = self.__find_mapping__(address)
+            if mapping is not None:
+                chunk = mapping.data[address - mapping.start:address - mapping.start + length]
+                return chunk + bytes(length - len(chunk))
+        return bytes(length)
+
+    def __writable_page__(self, page_number):
+        '''
+        Get the page page_number (int) ready for writing, and mark it dirty: a page shared with another memory is copied,
+        and a page never written is allocated, filled from the file mapping covering it, if any.
+
+        @return (bytearray): the private page.
+        '''
+        if self.read_only:
+            guarantee(False, "Snapshot of memory cannot be changed!")
+        if page_number in self.watched_pages:
+            self.watched_pages.remove(page_number)
+            for watcher in self.write_watchers:
+                watcher(page_number)
+        self.dirty_pages.add(page_number)
+        pages = self.segment_pages[page_number >> self.segment_shift]
+        page = pages.get(page_number)
+        if page is not None:
+            page = self._clean.pop(page_number, None) or bytearray(page)
+        else:
+            bisect.insort(self.page_index, page_number)
+            page = bytearray(self.page_size)
+            if self.mappings:
+                address = page_number << self.page_shift
+                mapping = self.__find_mapping__(address)
+                if mapping is not None:
+                    if not mapping.copy_on_write:
+                        guarantee(False, "Address {0:#x} is mapped read-only!".format(address))
+                    chunk = mapping.data[address - mapping.start:address - mapping.start + self.page_size]
+                    page[:len(chunk)] = chunk
+        pages[page_number] = self._writable[page_number] = page
+        return page
+
+    @typecheck
+    def read_bytes(
+            self,
+            address: lambda x: isinstance(x, int) and 0 <= x <= Octa.MASK,
+            length: lambda x: isinstance(x, int) and 0 <= x <= Memory.ADDRESS_SPACE_SIZE
+        ) -> bytes:
+        '''
+        Read a run of bytes. Addresses wrap around at the end of the address space.
+
+        @address (int): memory address of the first byte;
+        @length (int): number of bytes to read.
+
+        @return (bytes): content of memory.
+        '''
+        offset = address & (self.page_size - 1)
+        if offset + length <= self.page_size:
+            page = self.segment_pages[address >> _SEGMENT_SHIFT].get(address >> self.page_shift)
+            if page is None:
+                return self.__unallocated_bytes__(address, length)
+            return bytes(page[offset:offset + length])
+        result = bytearray()
+        while length > 0:
+            chunk = min(length, self.page_size - offset)
+            page = self.segment_pages[address >> _SEGMENT_SHIFT].get(address >> self.page_shift)
+            if page is None:
+                result += self.__unallocated_bytes__(address, chunk)
+            else:
+                result += page[offset:offset + chunk]
+            address = (address + chunk) & Octa.MASK
+            length -= chunk
+            offset = 0
+        return bytes(result)
+
+    @typecheck
+    def write_bytes(
+            self,
+            address: lambda x: isinstance(x, int) and 0 <= x <= Octa.MASK,
+            data: lambda x: isinstance(x, (bytes, bytearray, memoryview))
+        ) -> nothing:
+        '''
+        Write a run of bytes, allocating pages as needed. Addresses wrap around at the end of the address space.
+
+        @address (int): memory address of the first byte;
+        @data (bytes-like): bytes to write.
+
+        @return (None)
+        '''
+        data = memoryview(data).cast('B')
+        offset = address & (self.page_size - 1)
+        start = 0
+        while start < len(data):
+            chunk = min(len(data) - start, self.page_size - offset)
+            page_number = address >> self.page_shift
+            page = self._writable.get(page_number)
+            if page is None:
+                page = self.__writable_page__(page_number)
+            page[offset:offset + chunk] = data[start:start + chunk]
+            address = (address + chunk) & Octa.MASK
+            start += chunk
+            offset = 0
+
+    # The raw accessors below go straight between pages and Python ints. They're on the path of every load and store,
+    # so they're not typechecked: address must be an int in [0, 2^64) and size one of 1, 2, 4, 8. Reads look in the
+    # flat table of private pages first, which holds the pages in use, and in the page table of the segment only after.
+
+    def read_uint(self, address, size):
+        '''
+        Read an unsigned big-endian integer.
+
+        @address (int): memory address of the most significant byte;
+        @size (int): size in bytes, one of 1, 2, 4, 8.
+
+        @return (int): unsigned value.
+        '''
+        offset = address & self.offset_mask
+        if offset + size <= self.page_size:
+            page = self._writable.get(address >> self.page_shift)
+            if page is None:
+                page = self.segment_pages[address >> _SEGMENT_SHIFT].get(address >> self.page_shift)
+            if page is None:
+                if self.mappings:
+                    return self.__read_mapped__(address, size, _UNSIGNED)
+                return 0
+            return _UNSIGNED[size].unpack_from(page, offset)[0]
+        return int.from_bytes(self.read_bytes(address, size), 'big')
+
+    def read_int(self, address, size):
+        '''
+        Read a signed (two's complement) big-endian integer.
+
+        @address (int): memory address of the most significant byte;
+        @size (int): size in bytes, one of 1, 2, 4, 8.
+
+        @return (int): signed value.
+        '''
+        offset = address & self.offset_mask
+        if offset + size <= self.page_size:
+            page = self._writable.get(address >> self.page_shift)
+            if page is None:
+                page = self.segment_pages[address >> _SEGMENT_SHIFT].get(address >> self.page_shift)
+            if page is None:
+                if self.mappings:
+                    return self.__read_mapped__(address, size, _SIGNED)
+                return 0
+            return _SIGNED[size].unpack_from(page, offset)[0]
+        return int.from_bytes(self.read_bytes(address, size), 'big', signed=True)
+
+    def __read_mapped__(self, address, size, codecs):
+        '''
+        Read an integer within one unallocated page with the given struct codecs, straight from the file mapping.
+        '''
+        mapping = self.__find_mapping__(address)
+        if mapping is None:
+            return 0
+        if address + size <= mapping.end:
+            return codecs[size].unpack_from(mapping.data, address - mapping.start)[0]
+        return codecs[size].unpack(self.__unallocated_bytes__(address, size))[0]
+
+    # instruction fetches read memory like loads, but a cache model (see CachedMemory) tells them apart
+    fetch_uint = read_uint
+
+    def write_uint(self, address, size, value):
+        '''
+        Write an integer big-endian. Only the lowest size bytes of value are written, so signed values work as well.
+
+        @address (int): memory address of the most significant byte;
+        @size (int): size in bytes, one of 1, 2, 4, 8;
+        @value (int): value to write.
+
+        @return (None)
+        '''
+        value &= (1 << (size << 3)) - 1
+        offset = address & self.offset_mask
+        if offset + size <= self.page_size:
+            page_number = address >> self.page_shift
+            page = self._writable.get(page_number)
+            if page is None:
+                page = self.__writable_page__(page_number)
+            _UNSIGNED[size].pack_into(page, offset, value)
+        else:
+            self.write_bytes(address, value.to_bytes(size, 'big'))
+
+    def read_u8(self, address):
+        '''
+        Read an unsigned Byte at address (int) as int.
+        '''
+        return self.read_uint(address, 1)
+
+    def read_u16(self, address):
+        '''
+        Read an unsigned Wyde at address (int) as int.
+        '''
+        return self.read_uint(address, 2)
+
+    def read_u32(self, address):
+        '''
+        Read an unsigned Tetra at address (int) as int.
+        '''
+        return self.read_uint(address, 4)
+
+    def read_u64(self, address):
+        '''
+        Read an unsigned Octa at address (int) as int.
+        '''
+        return self.read_uint(address, 8)
+
+    def read_s8(self, address):
+        '''
+        Read a signed Byte at address (int) as int.
+        '''
+        return self.read_int(address, 1)
+
+    def read_s16(self, address):
+        '''
+        Read a signed Wyde at address (int) as int.
+        '''
+        return self.read_int(address, 2)
+
+    def read_s32(self, address):
+        '''
+        Read a signed Tetra at address (int) as int.
+        '''
+        return self.read_int(address, 4)
+
+    def read_s64(self, address):
+        '''
+        Read a signed Octa at address (int) as int.
+        '''
+        return self.read_int(address, 8)
+
+    def write_u8(self, address, value):
+        '''
+        Write the lowest byte of value (int) at address (int).
+        '''
+        self.write_uint(address, 1, value)
+
+    def write_u16(self, address, value):
+        '''
+        Write the lowest wyde of value (int) at address (int).
+        '''
+        self.write_uint(address, 2, value)
+
+    def write_u32(self, address, value):
+        '''
+        Write the lowest tetra of value (int) at address (int).
+        '''
+        self.write_uint(address, 4, value)
+
+    def write_u64(self, address, value):
+        '''
+        Write the lowest octa of value (int) at address (int).
+        '''
+        self.write_uint(address, 8, value)
 
     @typecheck
     def read(self, address: Octa, class_type: one_of((Byte, Wyde, Tetra, Octa))):
@@ -28,10 +625,7 @@ class Memory:
         @return: an object of requested class type.
         '''
         # address boundary check is implied by Octa object
-        result = class_type()
-        for offset in Range(Octa, 0, class_type.SIZE_IN_BYTE, 1):
-            result.set_byte(offset, self.memory.get((address + offset).uint, Byte(0)))
-        return result
+        return class_type._from_uint(self.read_uint(address.uint, class_type.SIZE_IN_BYTE))   # pylint: disable=W0212
 
     @typecheck
     def set(self, address: Octa, value: Numeric) -> nothing:
@@ -43,8 +637,165 @@ class Memory:
         @return (None)
         '''
         # address boundary check is implied by Octa object
-        for offset in Range(Octa, 0, value.__class__.SIZE_IN_BYTE, 1):
-            self.memory[(address + offset).uint] = value.slice(offset, Byte)
+        self.write_uint(address.uint, value.SIZE_IN_BYTE, value.uint)
+
+    def __page_numbers__(self, start, end):
+        '''
+        Generate the numbers of the pages in [start, end) that hold something, allocated or mapped, in increasing order.
+        '''
+        first, last = start >> self.page_shift, (end - 1) >> self.page_shift
+        allocated = self.page_index[
+            bisect.bisect_left(self.page_index, first):bisect.bisect_right(self.page_index, last)
+            ]
+        if not self.mappings:
+            return iter(allocated)
+        return self.__merge_mapped_pages__(allocated, first, last)
+
+    def __merge_mapped_pages__(self, allocated, first, last):
+        '''
+        Merge the page numbers in allocated (sorted) with those of the mapped pages in [first, last].
+        '''
+        mapped = list()
+        index = max(bisect.bisect_right(self.mapping_starts, first << self.page_shift) - 1, 0)
+        for mapping in self.mappings[index:]:
+            if mapping.start >> self.page_shift > last:
+                break
+            mapped.append(range(
+                max(first, mapping.start >> self.page_shift),
+                min(last, (mapping.end - 1) >> self.page_shift) + 1
+                ))
+        previous = None
+        for page_number in heapq.merge(allocated, *mapped):
+            if page_number != previous:
+                yield page_number
+                previous = page_number
+
+    @typecheck
+    def iter_range(
+            self,
+            start: lambda x: isinstance(x, int) and 0 <= x <= 2 ** Octa.SIZE_IN_BIT,
+            end: lambda x: isinstance(x, int) and 0 <= x <= 2 ** Octa.SIZE_IN_BIT
+        ):
+        '''
+        Generate the content of memory in [start, end) that is allocated or mapped, in address order. It takes
+        O(log n + k) time for n populated pages, k of them in the range.
+
+        @start (int): first address;
+        @end (int): address after the last.
+
+        @return (generator): tuples (address, memoryview) of the populated parts of each page in the range.
+        '''
+        if start >= end:
+            return
+        for page_number in self.__page_numbers__(start, end):
+            page_address = page_number << self.page_shift
+            page = self.segment_pages[page_number >> self.segment_shift].get(page_number)
+            if page is None:
+                page = self.__unallocated_bytes__(page_address, self.page_size)
+            low = max(start, page_address)
+            yield low, memoryview(page)[low - page_address:min(end - page_address, self.page_size)]
+
+    @typecheck
+    def populated_regions(self):
+        '''
+        Generate the maximal runs of consecutive pages that are allocated or mapped, in address order.
+
+        @return (generator): tuples (start, end) of addresses of each region, aligned to pages.
+        '''
+        intervals = heapq.merge(
+            ((page_number, page_number + 1) for page_number in self.page_index),
+            [(mapping.start >> self.page_shift, ((mapping.end - 1) >> self.page_shift) + 1) for mapping in self.mappings]
+            )
+        region_start = region_end = None
+        for low, high in intervals:
+            if region_end is not None and low <= region_end:
+                region_end = max(region_end, high)
+                continue
+            if region_start is not None:
+                yield region_start << self.page_shift, region_end << self.page_shift
+            region_start, region_end = low, high
+        if region_start is not None:
+            yield region_start << self.page_shift, region_end << self.page_shift
+
+    @typecheck
+    def first_after(self, address: lambda x: isinstance(x, int) and 0 <= x <= Octa.MASK) -> optional(int):
+        '''
+        Find the first address not before address in a page that is allocated or mapped, in O(log n) time.
+
+        @address (int): address to start from.
+
+        @return (int): address itself if its page is populated, else start of the next populated page, or None.
+        '''
+        page_number = next(self.__page_numbers__(address, Memory.ADDRESS_SPACE_SIZE), None)
+        if page_number is None:
+            return None
+        return max(address, page_number << self.page_shift)
+
+    @typecheck
+    def dump(
+            self,
+            klass: lambda x: issubclass(x, Numeric)=Byte,
+            start: lambda x: isinstance(x, int) and 0 <= x <= 2 ** Octa.SIZE_IN_BIT=0,
+            end: lambda x: isinstance(x, int) and 0 <= x <= 2 ** Octa.SIZE_IN_BIT=ADDRESS_SPACE_SIZE
+        ):
+        '''
+        Generate the lines of a dump of memory in [start, end), by units of klass aligned to their size. Only units
+        holding non-zero bytes are shown, each run of units that are zero (written or not) is collapsed into one line
+        "...". The memory is read one page at a time, so a dump of any size takes little host memory.
+
+        @klass (class): Byte, Wyde, Tetra, or Octa, unit of the dump;
+        @start (int): first address to dump, rounded down to a unit;
+        @end (int): address after the last to dump, rounded up to a unit.
+
+        @return (generator): lines of the dump, as str ending with a newline.
+        '''
+        size = klass.SIZE_IN_BYTE
+        codec = _UNSIGNED[size]
+        line = '0x{0:016x}:\t0x{1:0%dx}\n' % (size * 2)
+        start -= start % size
+        end += -end % size
+        zero_block = bytes(64)
+        expected = start    # address of the unit following the last one shown
+        for page_number in self.__page_numbers__(start, end) if start < end else ():
+            page_address = page_number << self.page_shift
+            page = self.segment_pages[page_number >> self.segment_shift].get(page_number)
+            if page is None:
+                page = self.__unallocated_bytes__(page_address, self.page_size)
+            view = memoryview(page)
+            for block in range(max(start, page_address) - page_address, min(end - page_address, self.page_size), 64):
+                block_view = view[block:min(block + 64, end - page_address, self.page_size)]
+                if block_view == zero_block[:len(block_view)]:
+                    continue
+                address = page_address + block
+                for (value,) in codec.iter_unpack(block_view):
+                    if value:
+                        if address != expected:
+                            yield '...\n'
+                        yield line.format(address, value)
+                        expected = address + size
+                    address += size
+        if expected != end:
+            yield '...\n'
+
+    @typecheck
+    def write_dump(
+            self,
+            file: lambda x: hasattr(x, 'write'),
+            klass: lambda x: issubclass(x, Numeric)=Byte,
+            start: lambda x: isinstance(x, int) and 0 <= x <= 2 ** Octa.SIZE_IN_BIT=0,
+            end: lambda x: isinstance(x, int) and 0 <= x <= 2 ** Octa.SIZE_IN_BIT=ADDRESS_SPACE_SIZE
+        ) -> nothing:
+        '''
+        Write a dump of memory to a file object, see dump.
+
+        @file (file object): text file to write to;
+        @klass (class): Byte, Wyde, Tetra, or Octa, unit of the dump;
+        @start (int): first address to dump;
+        @end (int): address after the last to dump.
+
+        @return (None)
+        '''
+        file.writelines(self.dump(klass, start, end))
 
     @typecheck
     def to_str(
@@ -52,44 +803,7 @@ class Memory:
             klass: lambda x: issubclass(x, Numeric)
         ) -> str:
         '''
-        Return a string representation of Memory class instance.
-        '''
-        result = str()
-        address_list = list(self.memory.keys())
-        #print("\n===DEBUG===\n")
-        #print("address_list=%s" % address_list)
-        #print("\n===DEBUG===\n")
-        address_list.sort()
-        #print("\n===DEBUG===\n")
-        #print("address_list=%s" % address_list)
-        #print("\n===DEBUG===\n")
-        is_first_entry = True
-        previous_address_uint = -1 * klass.SIZE_IN_BYTE
-        for address_uint in address_list:
-            #print("\n===DEBUG===\n")
-            #print("address_uint=%s" % hex(address_uint))
-            #print("\n===DEBUG===\n")
-            if is_first_entry:
-                is_first_entry = False
-                if address_uint >= klass.SIZE_IN_BYTE:
-                    # the first klass won't be printed
-                    result += "...\n"
-                    previous_address_uint = 0
-            if address_uint < previous_address_uint + klass.SIZE_IN_BYTE:
-                # this byte is already printed
-                continue
-            else:
-                # we need to print this klass
-                # align to klass boundary
-                address_uint -= address_uint % klass.SIZE_IN_BYTE
-                #print("\n===DEBUG===\n")
-                #print("after aligning address_uint=%s" % hex(address_uint))
-                #print("\n===DEBUG===\n")
-                if address_uint != previous_address_uint + klass.SIZE_IN_BYTE:
-                    result += "...\n"
-            address = Octa(address_uint)
-            result += "0x" + address.hex + ":\t0x" + self.read(address, klass).hex + "\n"
-            previous_address_uint = address_uint
-        if address_list[-1] != 2 ** Octa.SIZE_IN_BIT - klass.SIZE_IN_BYTE:
-            result += "...\n"
-        return result
+        Return a string representation of Memory class instance. Only units holding non-zero bytes are shown, written
+        zeros and unwritten memory are both elided as "...".
+        '''
+        return ''.join(self.dump(klass))
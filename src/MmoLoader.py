@@ -0,0 +1,284 @@
+'''
+Loader of MMIX object files (.mmo), as written by Knuth's MMIXAL assembler.
+'''
+from Memory import Memory
+from Octa import Octa
+from Utilities import guarantee
+from typecheck import *
+
+class MmoLoader:
+    '''
+    Load a .mmo file into a Memory.
+
+    An object file is a sequence of tetras. A tetra whose first byte is mm (0x98) is a lopcode, mm lop Y Z, any other
+    tetra is data loaded at the current location, which then advances by four. The file is read in chunks, and every
+    run of data tetras between two lopcodes is placed into memory with one bulk write.
+
+    Like the loader of mmix-sim, data and fixups are xor-ed into memory, so an assembler can patch a tetra it has
+    already output.
+    '''
+    MM = 0x98   # escape byte of lopcodes
+    LOP_QUOTE = 0x0
+    LOP_LOC = 0x1
+    LOP_SKIP = 0x2
+    LOP_FIXO = 0x3
+    LOP_FIXR = 0x4
+    LOP_FIXRX = 0x5
+    LOP_FILE = 0x6
+    LOP_LINE = 0x7
+    LOP_SPEC = 0x8
+    LOP_PRE = 0x9
+    LOP_POST = 0xa
+    LOP_STAB = 0xb
+    LOP_END = 0xc
+    CHUNK_SIZE = 1 << 16    # bytes read from the file at once, a multiple of 4
+    RUN_LIMIT = 1 << 20     # pending data is written into memory once it's that long, to bound host memory
+
+    @typecheck
+    def __init__(self, memory: Memory) -> nothing:
+        '''
+        Create a loader writing into memory.
+
+        @memory (Memory): memory to load programs into.
+        '''
+        self.memory = memory
+        self.file_names = dict()    # file number (int) -> source file name (str), from lop_file
+        self.line_table = dict()    # address (int) -> (file number, line number), from lop_line
+        self.G = None               # value of rG given by lop_post
+        self.global_registers = list()  # values (int) of $G, $G+1, ..., $255 given by lop_post
+        self.__reset__()
+
+    def __reset__(self):
+        '''
+        Reset the state of reading one file.
+        '''
+        self.stream = None
+        self.buffer = bytes()
+        self.position = 0           # of the next unread byte in self.buffer
+        self.location = 0           # current location, where the next data tetra goes
+        self.current_file = None
+        self.run_start = 0          # address of self.run, the data waiting to be written into memory
+        self.run = bytearray()
+
+    @typecheck
+    def load(self, file: lambda x: isinstance(x, str) or hasattr(x, 'read')) -> nothing:
+        '''
+        Load an object file. The data goes into memory; file names, line numbers and the postamble are kept in this
+        loader.
+
+        @file (str or file object): path of the .mmo file, or a file object opened in binary mode.
+
+        @return (None)
+        '''
+        if isinstance(file, str):
+            with open(file, 'rb') as stream:
+                self.__load_stream__(stream)
+        else:
+            self.__load_stream__(file)
+
+    def __load_stream__(self, stream):
+        '''
+        Load the object file read from stream.
+        '''
+        self.__reset__()
+        self.stream = stream
+        try:
+            lop, Y, Z = self.__read_lopcode__()
+            guarantee(lop == MmoLoader.LOP_PRE and Y == 1, "Object file doesn't start with lop_pre version 1!")
+            self.__read_tetras__(Z)   # creation time and other preamble data, not used
+            while True:
+                self.__load_data__()
+                lop, Y, Z = self.__read_lopcode__()
+                if lop == MmoLoader.LOP_POST:
+                    break
+                self.__handle_lopcode__(lop, Y, Z)
+            self.__flush_run__()
+            self.__load_postamble__(Y, Z)
+        finally:
+            self.__reset__()
+
+    def __fill__(self, length):
+        '''
+        Make sure at least length bytes are available after self.position, reading more of the file if needed.
+
+        @return (bool): False if the file ends before.
+        '''
+        while len(self.buffer) - self.position < length:
+            chunk = self.stream.read(MmoLoader.CHUNK_SIZE)
+            if not chunk:
+                return False
+            self.buffer = self.buffer[self.position:] + chunk
+            self.position = 0
+        return True
+
+    def __read_tetras__(self, count):
+        '''
+        Read count tetras.
+
+        @return (bytes): content of the tetras.
+        '''
+        guarantee(self.__fill__(count * 4), "Object file ends unexpectedly!")
+        result = self.buffer[self.position:self.position + count * 4]
+        self.position += count * 4
+        return result
+
+    def __read_tetra__(self):
+        '''
+        Read one tetra as unsigned int.
+        '''
+        return int.from_bytes(self.__read_tetras__(1), 'big')
+
+    def __read_lopcode__(self):
+        '''
+        Read one tetra that must be a lopcode.
+
+        @return (tuple): (lop, Y, Z), as int.
+        '''
+        mm, lop, Y, Z = self.__read_tetras__(1)
+        guarantee(mm == MmoLoader.MM, "Lopcode expected at position {0} of object file!".format(self.position - 4))
+        return lop, Y, Z
+
+    def __read_address__(self, Y, Z):
+        '''
+        Read the address following lop_loc or lop_fixo: Z is the number of tetras that follow, 1 or 2, and Y is the most
+        significant byte of the address.
+
+        @return (int): the address.
+        '''
+        guarantee(Z in (1, 2), "Bad Z={0} of lop_loc or lop_fixo!".format(Z))
+        return (Y << 56) + int.from_bytes(self.__read_tetras__(Z), 'big')
+
+    def __load_data__(self):
+        '''
+        Take all data tetras up to the next lopcode, and append them to the pending run of bytes.
+        '''
+        while self.__fill__(4):
+            limit = len(self.buffer) - ((len(self.buffer) - self.position) & 3)
+            end = self.position
+            while True:
+                end = self.buffer.find(MmoLoader.MM, end, limit)
+                if end < 0:
+                    end = limit
+                    break
+                if (end - self.position) & 3 == 0:
+                    break
+                end += 1
+            if end > self.position:
+                self.__append_data__(self.buffer[self.position:end])
+                self.position = end
+            if end < limit:
+                # a lopcode is next
+                return
+
+    def __append_data__(self, data):
+        '''
+        Append data (bytes, a whole number of tetras) at the current location, and advance the location.
+        '''
+        address = self.location & ~3
+        if address != (self.run_start + len(self.run)) & Octa.MASK or len(self.run) >= MmoLoader.RUN_LIMIT:
+            self.__flush_run__()
+            self.run_start = address
+        self.run += data
+        self.location = (address + len(data)) & Octa.MASK
+
+    def __flush_run__(self):
+        '''
+        Write the pending run of bytes into memory.
+        '''
+        if not self.run:
+            return
+        existing = self.memory.read_bytes(self.run_start, len(self.run))
+        if existing != bytes(len(existing)):
+            value = int.from_bytes(existing, 'big') ^ int.from_bytes(self.run, 'big')
+            self.run = bytearray(value.to_bytes(len(self.run), 'big'))
+        self.memory.write_bytes(self.run_start, self.run)
+        self.run = bytearray()
+
+    def __xor_tetra__(self, address, value):
+        '''
+        Xor value (int) into the tetra holding address (int).
+        '''
+        address &= Octa.MASK & ~3
+        self.memory.write_uint(address, 4, self.memory.read_uint(address, 4) ^ value)
+
+    def __handle_lopcode__(self, lop, Y, Z):
+        '''
+        Carry out one lopcode found between data tetras.
+        '''
+        if lop == MmoLoader.LOP_QUOTE:
+            guarantee(Y == 0 and Z == 1, "Bad YZ of lop_quote!")
+            self.__append_data__(self.__read_tetras__(1))
+            return
+        # everything else may touch memory directly or move the location
+        self.__flush_run__()
+        if lop == MmoLoader.LOP_LOC:
+            self.location = self.__read_address__(Y, Z)
+        elif lop == MmoLoader.LOP_SKIP:
+            self.location = (self.location + ((Y << 8) | Z)) & Octa.MASK
+        elif lop == MmoLoader.LOP_FIXO:
+            address = self.__read_address__(Y, Z)
+            self.__xor_tetra__(address, self.location >> 32)
+            self.__xor_tetra__(address + 4, self.location & 0xffffffff)
+        elif lop == MmoLoader.LOP_FIXR:
+            delta = (Y << 8) | Z
+            self.__xor_tetra__(self.location - (delta << 2), delta)
+        elif lop == MmoLoader.LOP_FIXRX:
+            guarantee(Y == 0 and Z in (16, 24), "Bad YZ of lop_fixrx!")
+            tetra = self.__read_tetra__()
+            guarantee(tetra & 0xfe000000 == 0, "Bad tetra following lop_fixrx!")
+            delta = (tetra & 0xffffff) - (1 << Z) if tetra >= 0x1000000 else tetra
+            self.__xor_tetra__(self.location - (delta << 2), tetra)
+        elif lop == MmoLoader.LOP_FILE:
+            if Y in self.file_names:
+                guarantee(Z == 0, "File {0} is named twice!".format(Y))
+            else:
+                guarantee(Z > 0, "File {0} has no name!".format(Y))
+                self.file_names[Y] = self.__read_tetras__(Z).rstrip(b'\0').decode('latin-1')
+            self.current_file = Y
+        elif lop == MmoLoader.LOP_LINE:
+            guarantee(self.current_file is not None, "lop_line before any lop_file!")
+            # the following tetras go on the following lines, so only the first one is recorded
+            self.line_table[self.location & ~3] = (self.current_file, (Y << 8) | Z)
+        elif lop == MmoLoader.LOP_SPEC:
+            self.__skip_special_data__()
+        else:
+            guarantee(False, "Unexpected lopcode {0:#x} in object file!".format(lop))
+
+    def __skip_special_data__(self):
+        '''
+        Skip the data following lop_spec, which lasts up to the next lopcode other than lop_quote.
+        '''
+        while self.__fill__(4):
+            if self.buffer[self.position] != MmoLoader.MM:
+                self.position += 4
+            elif self.buffer[self.position + 1] == MmoLoader.LOP_QUOTE:
+                self.__read_tetras__(2)
+            else:
+                return
+
+    def __load_postamble__(self, Y, Z):
+        '''
+        Read the postamble, from the YZ of lop_post: the initial values of $G through $255, then the symbol table,
+        which isn't used but must be closed by a lop_end giving its length.
+        '''
+        guarantee(Y == 0 and Z >= 32, "Bad YZ of lop_post!")
+        self.G = Z
+        values = self.__read_tetras__((256 - Z) * 2)
+        self.global_registers = [int.from_bytes(values[i:i + 8], 'big') for i in range(0, len(values), 8)]
+        lop = self.__read_lopcode__()[0]
+        guarantee(lop == MmoLoader.LOP_STAB, "lop_stab expected after the postamble!")
+        # skim through the symbol table, keeping only its last tetra, which must be lop_end
+        last = self.buffer[self.position:]
+        size = len(last)
+        for chunk in iter(lambda: self.stream.read(MmoLoader.CHUNK_SIZE), b''):
+            size += len(chunk)
+            last = (last + chunk)[-4:]
+        last = last[-4:]
+        guarantee(
+            size >= 4 and size & 3 == 0 and last[0] == MmoLoader.MM and last[1] == MmoLoader.LOP_END,
+            "Object file lacks lop_end!"
+            )
+        guarantee(
+            (last[2] << 8) | last[3] == (size >> 2) - 1,
+            "lop_end says the symbol table has {0} tetras, but it has {1}!".format((last[2] << 8) | last[3], (size >> 2) - 1)
+            )
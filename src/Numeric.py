@@ -3,10 +3,9 @@
 @email duo.ling.cn@gmail.com
 '''
 
-from bitstring import BitArray
+import struct
 from typecheck import *
 from Utilities import guarantee
-from copy import deepcopy
 
 class Numeric:  # pylint: disable=W0232,R0903
     '''
@@ -17,8 +16,17 @@ class Numeric:  # pylint: disable=W0232,R0903
 class Numeric:  # pylint: disable=E0102
     '''
     Base class for all numeric classes, e.g. Byte, Wyde, Tetra, Octa.
+
+    The value is stored as a plain unsigned Python int, masked to the width of the subclass. Signed, binary and
+    hexadecimal views are derived from it on demand.
     '''
+    __slots__ = (
+        '_value',   # unsigned int, masked to the width of the subclass
+        '_hash',    # hash of the value once frozen, None while mutable, see freeze()
+        )
     BYTE_SIZE_IN_BIT = 8
+    STRUCT_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}  # struct format character by SIZE_IN_BYTE
+    _pool = None    # tuple of shared frozen instances indexed by value, see enable_pool()
 
     def __init__(self, *args, **kwargs):    # pylint: disable=W0613
         '''
@@ -26,35 +34,169 @@ class Numeric:  # pylint: disable=E0102
         '''
         guarantee(False, "%s should not be instantiated." % __name__)
 
-    @typecheck
-    def __init_self__(
-            self,
-            klass: with_attr("SIZE_IN_BIT"),
-            value: lambda x: isinstance(x, Numeric) or isinstance(x, int)=0
-        ) -> nothing:
+    def __init_self__(self, klass, value=0):
         '''
         Used internally to initialize numeric instances. So all subclasses share this generic method, and Numeric doesn't have to know
         about its subclasses.
 
         @klass: a subclass of Numeric
-        @value: value used to initialize
+        @value: value used to initialize, either another Numeric or an int in signed or unsigned range of klass
 
         @return (None)
         '''
         if isinstance(value, Numeric):
             # copy construction
-            self._bitstring = deepcopy(value._bitstring)    # pylint: disable=W0212,E1103
-        else:
-            # init with an integer
-            if value < 0:
-                self._bitstring = BitArray(length=klass.SIZE_IN_BIT, int=value)
-            else:
-                self._bitstring = BitArray(length=klass.SIZE_IN_BIT, uint=value)
-        self.length = self._bitstring.length
-        self.int = self._bitstring.int
-        self.uint = self._bitstring.uint
-        self.bin = self._bitstring.bin
-        self.hex = self._bitstring.hex
+            value = value._value    # pylint: disable=W0212
+        guarantee(
+            -(1 << (klass.SIZE_IN_BIT - 1)) <= value <= klass.MASK,
+            "Given value={value} is out of range for class {klass}!".format(value=value, klass=klass)
+            )
+        self._value = value & klass.MASK
+        self._hash = None
+
+    @classmethod
+    def _from_uint(cls, value):
+        '''
+        Create an instance directly from an unsigned int that is already known to be in range. No checking is done, so
+        it is only meant for internal hot paths.
+
+        @value (int): unsigned value, 0 <= value <= cls.MASK
+
+        @return (Numeric): an instance of cls.
+        '''
+        obj = cls.__new__(cls)
+        obj._value = value  # pylint: disable=W0212
+        obj._hash = None    # pylint: disable=W0212
+        return obj
+
+    @classmethod
+    def enable_pool(cls):
+        '''
+        Create the pool of shared frozen instances of this class, one for every possible value, so that interned()
+        never allocates. Only classes up to two bytes wide can be pooled (256 Bytes, 65536 Wydes).
+
+        @return (None)
+        '''
+        guarantee(cls.SIZE_IN_BYTE <= 2, "Class {klass} is too wide to be pooled!".format(klass=cls))   # pylint: disable=E1101
+        if cls.__dict__.get('_pool') is None:
+            cls._pool = tuple(cls._from_uint(value).freeze() for value in range(cls.MASK + 1))  # pylint: disable=E1101
+
+    @classmethod
+    def interned(cls, value=0):
+        '''
+        Get a frozen instance of this class with given value. If the pool of this class is enabled, the shared
+        instance from the pool is returned, otherwise a new frozen instance is created.
+
+        @value: either another Numeric or an int in signed or unsigned range of this class
+
+        @return (Numeric): a frozen instance of this class.
+        '''
+        if isinstance(value, Numeric):
+            value = value._value    # pylint: disable=W0212
+        if not -(1 << (cls.SIZE_IN_BIT - 1)) <= value <= cls.MASK:    # pylint: disable=E1101
+            guarantee(False, "Given value={value} is out of range for class {klass}!".format(value=value, klass=cls))
+        pool = cls.__dict__.get('_pool')
+        if pool is not None:
+            return pool[value & cls.MASK]   # pylint: disable=E1101
+        return cls._from_uint(value & cls.MASK).freeze()  # pylint: disable=E1101
+
+    @classmethod
+    @typecheck
+    def from_bytes(
+            cls,
+            data: lambda x: isinstance(x, (bytes, bytearray, memoryview))
+        ) -> lambda x: isinstance(x, Numeric):
+        '''
+        Create an instance from its big-endian byte representation.
+
+        @data (bytes-like): exactly SIZE_IN_BYTE bytes.
+
+        @return (Numeric): an instance of this class.
+        '''
+        guarantee(
+            len(data) == cls.SIZE_IN_BYTE, # pylint: disable=E1101
+            "{klass} needs {size} bytes, {length} are given!".format(
+                klass=cls, size=cls.SIZE_IN_BYTE, length=len(data) # pylint: disable=E1101
+                )
+            )
+        return cls._from_uint(int.from_bytes(data, 'big'))
+
+    @classmethod
+    @typecheck
+    def decode_many(
+            cls,
+            buffer: lambda x: isinstance(x, (bytes, bytearray, memoryview)),
+            count: optional(int)=None,
+            offset: int=0
+        ) -> list:
+        '''
+        Decode consecutive big-endian values of this class from a buffer in one go.
+
+        @buffer (bytes-like): buffer to decode from;
+        @count=None (int): number of values to decode, as many as the buffer holds if None;
+        @offset=0 (int): offset in bytes of the first value in buffer.
+
+        @return (list): instances of this class.
+        '''
+        available = (memoryview(buffer).nbytes - offset) // cls.SIZE_IN_BYTE   # pylint: disable=E1101
+        if count is None:
+            count = available
+        guarantee(
+            offset >= 0 and 0 <= count <= available,
+            "Cannot decode {count} {klass} from offset {offset} of a {length} bytes buffer!".format(
+                count=count, klass=cls, offset=offset, length=memoryview(buffer).nbytes
+                )
+            )
+        from_uint = cls._from_uint
+        return [from_uint(value) for value in struct.unpack_from(
+            '>%d%s' % (count, Numeric.STRUCT_FORMATS[cls.SIZE_IN_BYTE]), buffer, offset # pylint: disable=E1101
+            )]
+
+    @classmethod
+    @typecheck
+    def encode_many(cls, values: with_attr('__iter__')) -> bytes:
+        '''
+        Encode values of this class into their consecutive big-endian byte representation in one go.
+
+        @values (iterable): instances of this class, or their unsigned values as int.
+
+        @return (bytes): SIZE_IN_BYTE bytes per value.
+        '''
+        values = list(values)
+        for i, value in enumerate(values):
+            guarantee(
+                isinstance(value, cls) or (isinstance(value, int) and 0 <= value <= cls.MASK),  # pylint: disable=E1101
+                "Given value={value!r} is not a {klass} nor in its range!".format(value=value, klass=cls)
+                )
+            values[i] = int(value)
+        return struct.pack('>%d%s' % (len(values), Numeric.STRUCT_FORMATS[cls.SIZE_IN_BYTE]), *values) # pylint: disable=E1101
+
+    @typecheck
+    def to_bytes(self) -> bytes:
+        '''
+        Big-endian byte representation of this value.
+
+        @return (bytes): SIZE_IN_BYTE bytes.
+        '''
+        return self._value.to_bytes(self.SIZE_IN_BYTE, 'big')    # pylint: disable=E1101
+
+    def freeze(self):
+        '''
+        Make this instance immutable, so that it can be shared safely and used as dict key or set member. set_value,
+        set_byte and update raise on a frozen instance; copy construction (e.g. Byte(frozen_byte)) gives a mutable copy.
+
+        @return (Numeric): the instance self.
+        '''
+        if self._hash is None:
+            self._hash = hash(self._value)
+        return self
+
+    @property
+    def is_frozen(self):
+        '''
+        Whether this instance is immutable.
+        '''
+        return self._hash is not None
 
     @typecheck
     def set_value(
@@ -66,6 +208,8 @@ class Numeric:  # pylint: disable=E0102
 
         @return (null)
         '''
+        if self._hash is not None:
+            guarantee(False, "Frozen {klass} cannot be changed!".format(klass=self.__class__))
         self.__init_self__(self.__class__, value)
 
     @typecheck
@@ -77,17 +221,16 @@ class Numeric:  # pylint: disable=E0102
         '''
         Set given byte with value. Note that index is counted from MSB!
         '''
+        if self._hash is not None:
+            guarantee(False, "Frozen {klass} cannot be changed!".format(klass=self.__class__))
         if isinstance(index, Numeric):
             index = index.uint
         guarantee(
             index >= 0 and index < self.__class__.SIZE_IN_BYTE, # pylint: disable=E1101
             "Given index={index} is out of range for class {klass}!".format(index=index, klass=self.__class__)
             )
-        mask = 2 ** self.__class__.SIZE_IN_BIT - 1 # pylint: disable=E1101
-        mask = mask ^ (0xff << ((self.__class__.SIZE_IN_BYTE - index - 1) * Numeric.BYTE_SIZE_IN_BIT))  # mask off the correct byte
-        tmp = self.uint & mask  # mask off the byte to set in this object
-        tmp = tmp | value.uint << ((self.__class__.SIZE_IN_BYTE - index - 1) * Numeric.BYTE_SIZE_IN_BIT) # pylint: disable=E1101
-        self.__init_self__(self.__class__, tmp)
+        shift = (self.__class__.SIZE_IN_BYTE - index - 1) * Numeric.BYTE_SIZE_IN_BIT  # pylint: disable=E1101
+        self._value = (self._value & ~(0xff << shift)) | (value.uint << shift)
 
     @typecheck
     def slice(
@@ -111,10 +254,8 @@ class Numeric:  # pylint: disable=E0102
                 index=index, klass=klass, this_klass=self.__class__
                 )
             )
-        mask = (2 ** klass.SIZE_IN_BIT - 1) << ((self.__class__.SIZE_IN_BYTE - index - klass.SIZE_IN_BYTE) * Numeric.BYTE_SIZE_IN_BIT)
-        tmp = self.uint & mask  # mask to have only the bytes to get in this object
-        tmp = tmp >> ((self.__class__.SIZE_IN_BYTE - index - klass.SIZE_IN_BYTE) * Numeric.BYTE_SIZE_IN_BIT) # pylint: disable=E1101
-        return klass(tmp)
+        shift = (self.__class__.SIZE_IN_BYTE - index - klass.SIZE_IN_BYTE) * Numeric.BYTE_SIZE_IN_BIT # pylint: disable=E1101
+        return klass._from_uint((self._value >> shift) & klass.MASK)
 
     @typecheck
     def update(
@@ -131,6 +272,8 @@ class Numeric:  # pylint: disable=E0102
             Wyde(0x1234).update(1, Byte(0x12)) # Wyde(0x1212)
             Tetra(0x12345678).update(1, Wyde(0x0987))    # Tetra(0x12098778)
         '''
+        if self._hash is not None:
+            guarantee(False, "Frozen {klass} cannot be changed!".format(klass=self.__class__))
         if isinstance(index, Numeric):
             index = index.uint
         guarantee(
@@ -139,12 +282,8 @@ class Numeric:  # pylint: disable=E0102
                 index=index, klass=value.__class__, this_klass=self.__class__
                 )
             )
-        mask = (2 ** value.__class__.SIZE_IN_BIT - 1) << (
-            (self.__class__.SIZE_IN_BYTE - index - value.__class__.SIZE_IN_BYTE) * Numeric.BYTE_SIZE_IN_BIT # pylint: disable=E1101
-            )
-        tmp = self.uint & (~mask)  # mask away the bytes to update in this object
-        tmp = tmp | (value.uint << ((self.__class__.SIZE_IN_BYTE - index - value.__class__.SIZE_IN_BYTE) * Numeric.BYTE_SIZE_IN_BIT))
-        self.__init_self__(self.__class__, tmp)
+        shift = (self.__class__.SIZE_IN_BYTE - index - value.__class__.SIZE_IN_BYTE) * Numeric.BYTE_SIZE_IN_BIT # pylint: disable=E1101
+        self._value = (self._value & ~(value.__class__.MASK << shift)) | (value.uint << shift)
         return self
 
     @typecheck
@@ -156,7 +295,7 @@ class Numeric:  # pylint: disable=E0102
 
         @return (Numeric): an instance of Numeric as bit and result.
         '''
-        return self.__class__((self._bitstring & another._bitstring).uint)
+        return self._from_uint(self._value & another._value)
 
     @typecheck
     def __or__(self, another: lambda x: isinstance(x, Numeric)) -> lambda x: isinstance(x, Numeric):
@@ -167,7 +306,7 @@ class Numeric:  # pylint: disable=E0102
 
         @return (Numeric): an instance of Numeric as bit or result.
         '''
-        return self.__class__((self._bitstring | another._bitstring).uint)
+        return self._from_uint((self._value | another._value) & self.MASK)    # pylint: disable=E1101
 
     @typecheck
     def __xor__(self, another: lambda x: isinstance(x, Numeric)) -> lambda x: isinstance(x, Numeric):
@@ -178,7 +317,7 @@ class Numeric:  # pylint: disable=E0102
 
         @return (Numeric): an instance of Numeric as bit xor result.
         '''
-        return self.__class__((self._bitstring ^ another._bitstring).uint)
+        return self._from_uint((self._value ^ another._value) & self.MASK)    # pylint: disable=E1101
 
     @typecheck
     def __add__(self, another: lambda x: isinstance(x, Numeric)) -> lambda x: isinstance(x, Numeric):
@@ -189,7 +328,7 @@ class Numeric:  # pylint: disable=E0102
 
         @return (Numeric): an instance of Numeric as result self+another.
         '''
-        return self.__class__(self._bitstring.int + another._bitstring.int)
+        return self.__class__(self.int + another.int)
 
     @typecheck
     def __sub__(self, another: lambda x: isinstance(x, Numeric)) -> lambda x: isinstance(x, Numeric):
@@ -201,40 +340,349 @@ class Numeric:  # pylint: disable=E0102
         @return (Numeric): an instance of Numeric as result.
         '''
         guarantee(self.length == another.length, "Numeric with different length cannot be subtracted!")
-        return self.__class__(self._bitstring.int - another._bitstring.int)
+        return self.__class__(self.int - another.int)
+
+    def _same_length(self, another):
+        '''
+        Make sure another Numeric has the same length as self, which all wrap-around arithmetic requires.
+        '''
+        if self.SIZE_IN_BIT != another.SIZE_IN_BIT:  # pylint: disable=E1101
+            guarantee(False, "Numeric with different length cannot be used together in arithmetic!")
+
+    def _wrap_signed(self, value):
+        '''
+        Wrap a signed result into this class, and tell whether it was outside of the signed range.
+
+        @return (tuple): (Numeric, bool) wrapped result and whether it overflowed.
+        '''
+        return (
+            self._from_uint(value & self.MASK),   # pylint: disable=E1101
+            not -(1 << (self.SIZE_IN_BIT - 1)) <= value < (1 << (self.SIZE_IN_BIT - 1))    # pylint: disable=E1101
+            )
+
+    def _wrap_unsigned(self, value):
+        '''
+        Wrap an unsigned result into this class, and tell whether it was outside of the unsigned range, i.e. there's a
+        carry or borrow.
+
+        @return (tuple): (Numeric, bool) wrapped result and whether it overflowed.
+        '''
+        return self._from_uint(value & self.MASK), not 0 <= value <= self.MASK   # pylint: disable=E1101
+
+    @typecheck
+    def add(self, another: lambda x: isinstance(x, Numeric)) -> tuple:
+        '''
+        Signed addition that wraps around instead of raising, as MMIX ADD does.
+
+        @another (Numeric): another Numeric instance of the same length.
+
+        @return (tuple): (Numeric, bool) self+another modulo 2^length, and whether the signed result overflowed.
+        '''
+        self._same_length(another)
+        return self._wrap_signed(self.int + another.int)
 
     @typecheck
-    def __eq__(self, another: lambda x: isinstance(x, Numeric)) -> bool:
+    def add_unsigned(self, another: lambda x: isinstance(x, Numeric)) -> tuple:
+        '''
+        Unsigned addition that wraps around, as MMIX ADDU does.
+
+        @another (Numeric): another Numeric instance of the same length.
+
+        @return (tuple): (Numeric, bool) self+another modulo 2^length, and whether there's a carry out.
         '''
-        Compare self with another object. Note that they have to have the same length!
+        self._same_length(another)
+        return self._wrap_unsigned(self._value + another._value)
+
+    @typecheck
+    def scaled_add_unsigned(
+            self,
+            another: lambda x: isinstance(x, Numeric),
+            scale: one_of((2, 4, 8, 16))
+        ) -> tuple:
+        '''
+        Scaled unsigned addition self*scale+another that wraps around, as MMIX 2ADDU, 4ADDU, 8ADDU and 16ADDU do.
+
+        @another (Numeric): another Numeric instance of the same length;
+        @scale (int): one of 2, 4, 8, 16.
+
+        @return (tuple): (Numeric, bool) self*scale+another modulo 2^length, and whether there's a carry out.
+        '''
+        self._same_length(another)
+        return self._wrap_unsigned(self._value * scale + another._value)
+
+    @typecheck
+    def sub(self, another: lambda x: isinstance(x, Numeric)) -> tuple:
+        '''
+        Signed subtraction that wraps around instead of raising, as MMIX SUB does.
+
+        @another (Numeric): another Numeric instance of the same length.
+
+        @return (tuple): (Numeric, bool) self-another modulo 2^length, and whether the signed result overflowed.
+        '''
+        self._same_length(another)
+        return self._wrap_signed(self.int - another.int)
+
+    @typecheck
+    def sub_unsigned(self, another: lambda x: isinstance(x, Numeric)) -> tuple:
+        '''
+        Unsigned subtraction that wraps around, as MMIX SUBU does.
+
+        @another (Numeric): another Numeric instance of the same length.
+
+        @return (tuple): (Numeric, bool) self-another modulo 2^length, and whether there's a borrow.
+        '''
+        self._same_length(another)
+        return self._wrap_unsigned(self._value - another._value)
+
+    @typecheck
+    def neg(self, minuend: int=0) -> tuple:
+        '''
+        Signed negation minuend-self that wraps around, as MMIX NEG does (minuend is its Y field).
+
+        @minuend=0 (int): value to subtract self from.
+
+        @return (tuple): (Numeric, bool) minuend-self modulo 2^length, and whether the signed result overflowed.
+        '''
+        return self._wrap_signed(minuend - self.int)
+
+    @typecheck
+    def neg_unsigned(self, minuend: int=0) -> tuple:
+        '''
+        Unsigned negation minuend-self that wraps around, as MMIX NEGU does (minuend is its Y field).
+
+        @minuend=0 (int): value to subtract self from.
+
+        @return (tuple): (Numeric, bool) minuend-self modulo 2^length, and whether there's a borrow.
+        '''
+        return self._wrap_unsigned(minuend - self._value)
+
+    @typecheck
+    def mul(self, another: lambda x: isinstance(x, Numeric)) -> tuple:
+        '''
+        Signed multiplication that wraps around instead of raising, as MMIX MUL does.
+
+        @another (Numeric): another Numeric instance of the same length.
+
+        @return (tuple): (Numeric, bool) self*another modulo 2^length, and whether the signed result overflowed.
+        '''
+        self._same_length(another)
+        return self._wrap_signed(self.int * another.int)
+
+    @typecheck
+    def mul_unsigned(self, another: lambda x: isinstance(x, Numeric)) -> tuple:
+        '''
+        Unsigned multiplication that keeps the lower half of the product, as MMIX MULU does for $X.
+
+        @another (Numeric): another Numeric instance of the same length.
+
+        @return (tuple): (Numeric, bool) self*another modulo 2^length, and whether the upper half is non-zero.
+        '''
+        self._same_length(another)
+        return self._wrap_unsigned(self._value * another._value)
+
+    @typecheck
+    def div(self, another: lambda x: isinstance(x, Numeric)) -> tuple:
+        '''
+        Signed division as MMIX DIV does it: the quotient is rounded towards negative infinity, so the remainder has
+        the sign of the divisor. Division by zero isn't an overflow: the quotient is zero and the remainder is self,
+        callers check the divisor themselves for the divide check event. The only overflow is the most negative value
+        divided by -1, whose quotient wraps around to itself.
+
+        @another (Numeric): divisor, another Numeric instance of the same length.
+
+        @return (tuple): (Numeric, Numeric, bool) quotient, remainder, and whether the quotient overflowed.
+        '''
+        self._same_length(another)
+        divisor = another.int
+        if divisor == 0:
+            return self._from_uint(0), self._from_uint(self._value), False
+        quotient, remainder = divmod(self.int, divisor)
+        result, overflow = self._wrap_signed(quotient)
+        return result, self._from_uint(remainder & self.MASK), overflow  # pylint: disable=E1101
+
+    @typecheck
+    def div_unsigned(self, another: lambda x: isinstance(x, Numeric)) -> tuple:
+        '''
+        Unsigned division. Division by zero gives zero quotient and self as remainder, as in div(). The quotient never
+        overflows, as the dividend is only one Numeric wide (MMIX DIVU also takes the upper half of its dividend
+        from rD, which is up to the machine).
+
+        @another (Numeric): divisor, another Numeric instance of the same length.
+
+        @return (tuple): (Numeric, Numeric, bool) quotient, remainder, and False.
+        '''
+        self._same_length(another)
+        if another._value == 0:
+            return self._from_uint(0), self._from_uint(self._value), False
+        quotient, remainder = divmod(self._value, another._value)
+        return self._from_uint(quotient), self._from_uint(remainder), False
+
+    def __eq__(self, another):
+        '''
+        Compare self with another object. Numeric of different lengths are never equal.
 
         @another (Numeric): another Numeric instance.
 
         @return (bool): True if two Numeric are bit exact.
+        '''
+        if not isinstance(another, Numeric):
+            return NotImplemented
+        return self._value == another._value and self.SIZE_IN_BIT == another.SIZE_IN_BIT  # pylint: disable=E1101
+
+    def __hash__(self):
+        '''
+        Hash of a frozen instance, computed once by freeze(). Mutable instances are unhashable, as their value may change
+        while they're used as a key.
+
+        @return (int): hash of the value.
+        '''
+        if self._hash is None:
+            raise TypeError("unhashable mutable {klass}, freeze() it first".format(klass=self.__class__.__name__))
+        return self._hash
+
+    def _ordered_with(self, another):
+        '''
+        Make sure another Numeric can be ordered against self, i.e. it has the same length.
+
+        @return (bool): False if another isn't a Numeric, so the comparison should return NotImplemented.
+        '''
+        if not isinstance(another, Numeric):
+            return False
+        guarantee(
+            self.SIZE_IN_BIT == another.SIZE_IN_BIT,   # pylint: disable=E1101
+            "{0!r} and {1!r} cannot be ordered!".format(self, another)
+            )
+        return True
+
+    def __lt__(self, another):
+        '''
+        Less than (<), comparing as unsigned integers. Use cmp() for the signed order.
+        '''
+        if not self._ordered_with(another):
+            return NotImplemented
+        return self._value < another._value
+
+    def __le__(self, another):
+        '''
+        Less than or equal (<=), comparing as unsigned integers.
+        '''
+        if not self._ordered_with(another):
+            return NotImplemented
+        return self._value <= another._value
+
+    def __gt__(self, another):
+        '''
+        Greater than (>), comparing as unsigned integers.
+        '''
+        if not self._ordered_with(another):
+            return NotImplemented
+        return self._value > another._value
+
+    def __ge__(self, another):
+        '''
+        Greater than or equal (>=), comparing as unsigned integers.
+        '''
+        if not self._ordered_with(another):
+            return NotImplemented
+        return self._value >= another._value
+
+    @typecheck
+    def cmp(self, another: lambda x: isinstance(x, Numeric)) -> one_of((-1, 0, 1)):
+        '''
+        Compare as signed integers, as MMIX CMP does.
+
+        @another (Numeric): another Numeric instance of the same length.
+
+        @return (int): -1, 0 or 1 if self is less than, equal to or greater than another.
+        '''
+        self._ordered_with(another)
+        mine, theirs = self.int, another.int
+        return (mine > theirs) - (mine < theirs)
+
+    @typecheck
+    def cmpu(self, another: lambda x: isinstance(x, Numeric)) -> one_of((-1, 0, 1)):
+        '''
+        Compare as unsigned integers, as MMIX CMPU does.
 
-        @raise (MmixExcpetion): if two objects are not of same length
+        @another (Numeric): another Numeric instance of the same length.
+
+        @return (int): -1, 0 or 1 if self is less than, equal to or greater than another.
+        '''
+        self._ordered_with(another)
+        return (self._value > another._value) - (self._value < another._value)
+
+    def __index__(self):
+        '''
+        The unsigned value, so Numeric can be used wherever Python expects an integer, e.g. as list index.
+        '''
+        return self._value
+
+    def __int__(self):
+        '''
+        The unsigned value, same as uint.
         '''
-        guarantee(self.length == another.length, "Numeric with different length cannot be compared!")
-        return self.length == another.length and self._bitstring.uint == another._bitstring.uint
+        return self._value
 
     @typecheck
     def __lshift__(self, other: int) -> lambda x: isinstance(x, Numeric):
         '''
+        Shift left, bits shifted out of the most significant end are lost.
         '''
-        tmp = deepcopy(self._bitstring)
-        tmp <<= other
-        return self.__class__(tmp.uint)
+        return self._from_uint((self._value << other) & self.MASK)    # pylint: disable=E1101
 
     @typecheck
     def __repr__(self) -> str:
         '''
         Override default to give a hex representation of this number, formatted according to its length.
         '''
-        return '{0:#0{width}x}'.format(self.uint, width=int(self.length / 4) + 2)
+        return '{0:#0{width}x}'.format(self._value, width=(self.SIZE_IN_BIT >> 2) + 2)    # pylint: disable=E1101
+
+    # Views of the value. They're defined at the end of the class body, so that the builtin int used in the
+    # annotations above isn't shadowed by the int property.
+    @property
+    def length(self):
+        '''
+        Size of this numeric in bits.
+        '''
+        return self.SIZE_IN_BIT   # pylint: disable=E1101
+
+    @property
+    def uint(self):
+        '''
+        Value interpreted as an unsigned integer.
+        '''
+        return self._value
+
+    @property
+    def int(self):
+        '''
+        Value interpreted as a two's complement signed integer.
+        '''
+        if self._value >> (self.SIZE_IN_BIT - 1):   # pylint: disable=E1101
+            return self._value - (1 << self.SIZE_IN_BIT)    # pylint: disable=E1101
+        return self._value
+
+    @property
+    def bin(self):
+        '''
+        Binary string of this value, zero-padded to its full length, without '0b' prefix.
+        '''
+        return format(self._value, '0%db' % self.SIZE_IN_BIT)   # pylint: disable=E1101
+
+    @property
+    def hex(self):
+        '''
+        Hexadecimal string of this value, zero-padded to its full length, without '0x' prefix.
+        '''
+        return format(self._value, '0%dx' % (self.SIZE_IN_BIT >> 2))    # pylint: disable=E1101
 
 class Range:
     '''
-    Iterator that yields numeric objects based of given class and range.
+    Sequence of numeric objects of given class over an arithmetic progression. It's backed by the builtin range, so
+    len(), indexing, slicing, reversal and membership tests are O(1), and it can be iterated more than once.
+
+    By default every item is a new instance of the class. In raw mode plain ints are yielded instead, and in reuse mode
+    one mutable instance of the class is updated and yielded again for every item, so that iteration doesn't allocate.
     '''
     @typecheck
     def __init__(
@@ -242,31 +690,97 @@ class Range:
             klass: lambda x: issubclass(x, Numeric),
             start: lambda x: isinstance(x, Numeric) or isinstance(x, int),
             end: lambda x: isinstance(x, Numeric) or isinstance(x, int),
-            step: lambda x: isinstance(x, Numeric) or isinstance(x, int),
+            step: lambda x: isinstance(x, Numeric) or isinstance(x, int)=1,
+            raw: bool=False,
+            reuse: bool=False
         ):
         '''
-        Create an iterator that yields give class of objects.
+        Create a sequence that yields give class of objects.
+
+        @klass (class): subclass of Numeric to yield;
+        @start, end, step: as for the builtin range, Numeric are taken as signed integers;
+        @raw=False (bool): yield ints instead of klass instances;
+        @reuse=False (bool): yield the same klass instance, updated to each value in turn.
         '''
+        guarantee(not (raw and reuse), "Range cannot be both raw and reuse!")
         self.klass = klass
         if isinstance(start, Numeric):
-            self.start = start.int
-        else:
-            self.start = start
+            start = start.int
         if isinstance(end, Numeric):
-            self.end = end.int
-        else:
-            self.end = end
+            end = end.int
         if isinstance(step, Numeric):
-            self.step = step.int
-        else:
-            self.step = step
+            step = step.int
+        self.range = range(start, end, step)
+        self.raw = raw
+        self.reuse = reuse
+
+    @property
+    def start(self):
+        '''
+        First value, as int.
+        '''
+        return self.range.start
+
+    @property
+    def end(self):
+        '''
+        Value where the sequence stops (exclusive), as int.
+        '''
+        return self.range.stop
+
+    @property
+    def step(self):
+        '''
+        Difference between consecutive values, as int.
+        '''
+        return self.range.step
+
+    def __derive__(self, new_range):
+        '''
+        Create a Range of the same class and mode over another builtin range.
+        '''
+        derived = Range.__new__(Range)
+        derived.klass, derived.range, derived.raw, derived.reuse = self.klass, new_range, self.raw, self.reuse
+        return derived
+
+    def __len__(self):
+        return len(self.range)
 
     def __iter__(self):
-        return self
+        if self.raw:
+            return iter(self.range)
+        if self.reuse:
+            return self.__iter_reusing__()
+        return map(self.klass, self.range)
 
-    def __next__(self):
-        if self.start >= self.end:
-            raise StopIteration
-        obj = self.klass(self.start)
-        self.start += self.step
-        return obj
+    def __iter_reusing__(self):
+        '''
+        Generator behind reuse mode.
+        '''
+        cursor = self.klass()
+        mask = self.klass.MASK
+        for value in self.range:
+            cursor._value = value & mask    # pylint: disable=W0212
+            yield cursor
+
+    def __reversed__(self):
+        return iter(self.__derive__(self.range[::-1]))
+
+    def __getitem__(self, index):
+        '''
+        Item at index, or a Range over the items selected by a slice.
+        '''
+        if isinstance(index, slice):
+            return self.__derive__(self.range[index])
+        value = self.range[index]
+        if self.raw:
+            return value
+        return self.klass(value)
+
+    def __contains__(self, value):
+        '''
+        Whether value is one of the items. A Numeric matches by either its signed or unsigned value.
+        '''
+        if isinstance(value, Numeric):
+            return value.SIZE_IN_BIT == self.klass.SIZE_IN_BIT and (value.int in self.range or value.uint in self.range)
+        return value in self.range
@@ -2,5 +2,84 @@
 Represents a register in MMIX computer.
 '''
 from Octa import Octa
+from Utilities import guarantee
+from typecheck import *
 
 Register = Octa
+
+class RegisterView(Register):
+    '''
+    A Register that is one register of a RegisterFile: it has no value of its own, but reads and writes the value in
+    the file, so every Numeric method works on the register in place.
+    '''
+    __slots__ = ('file', 'index')
+
+    def __init__(self, file, index):   # pylint: disable=W0231
+        '''
+        @file (RegisterFile): the file holding the value;
+        @index (int): index of the register in the file.
+        '''
+        self.file = file
+        self.index = index
+        self._hash = None
+
+    @property
+    def _value(self):
+        '''
+        Value of the register in the file.
+        '''
+        return self.file.values[self.index]
+
+    @_value.setter
+    def _value(self, value):
+        self.file.values[self.index] = value
+
+    @classmethod
+    def _from_uint(cls, value):
+        '''
+        Results of Numeric methods are plain Registers, not views.
+        '''
+        return Register._from_uint(value)   # pylint: disable=W0212
+
+    def freeze(self):
+        '''
+        A view can't be frozen, as the file may always change.
+        '''
+        guarantee(False, "Register view cannot be frozen!")
+
+class RegisterFile:
+    '''
+    A bank of registers, as a flat list of unsigned ints: self.values, the only storage of the file. Instructions read
+    and write self.values directly, and mask what they write to 64 bits. Indexing the file itself, or iterating over
+    it, creates RegisterView objects on demand, for inspection and debugging.
+    '''
+    @typecheck
+    def __init__(self, size: lambda x: isinstance(x, int) and x > 0) -> nothing:
+        '''
+        @size (int): number of registers, all cleared.
+        '''
+        self.values = [0] * size
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        # range checks the index and makes a negative one positive, or gives the indices of a slice
+        index = range(len(self.values))[index]
+        if isinstance(index, range):
+            return tuple(RegisterView(self, i) for i in index)
+        return RegisterView(self, index)
+
+    def __iter__(self):
+        return (RegisterView(self, index) for index in range(len(self.values)))
+
+    @typecheck
+    def copy(self) -> lambda x: isinstance(x, RegisterFile):
+        '''
+        Create another file with the same values.
+
+        @return (RegisterFile): the copy.
+        '''
+        other = RegisterFile(len(self.values))
+        other.values[:] = self.values
+        return other
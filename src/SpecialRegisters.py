@@ -0,0 +1,61 @@
+'''
+Special purpose registers of MMIX.
+'''
+from Octa import Octa
+from Register import RegisterFile
+from typecheck import *
+
+# names of special purpose registers, in the order of their numbers as used by GET and PUT
+NAMES = (
+    'rB', 'rD', 'rE', 'rH', 'rJ', 'rM', 'rR', 'rBB', 'rC', 'rN', 'rO', 'rS', 'rI', 'rT',
+    'rTT', 'rK', 'rQ', 'rU', 'rV', 'rG', 'rL', 'rA', 'rF', 'rP', 'rW', 'rX', 'rY', 'rZ',
+    'rWW', 'rXX', 'rYY', 'rZZ'
+    )
+INDEX = {name: index for index, name in enumerate(NAMES)}   # name -> number
+
+# numbers of the special registers on the paths of instructions
+RA = INDEX['rA']    # arithmetic status register
+RC = INDEX['rC']    # cycle counter
+RD = INDEX['rD']    # dividend register
+RG = INDEX['rG']    # global threshold register
+RH = INDEX['rH']    # himult register
+RJ = INDEX['rJ']    # return-jump register
+RL = INDEX['rL']    # local threshold register
+RM = INDEX['rM']    # multiplex mask register
+RO = INDEX['rO']    # register stack offset
+RR = INDEX['rR']    # remainder register
+RS = INDEX['rS']    # register stack pointer
+RV = INDEX['rV']    # virtual translation register
+
+class SpecialRegisterFile(RegisterFile):
+    '''
+    The special purpose registers, as a RegisterFile that also has an attribute for each of them by name: reading
+    e.g. sr.rA gives the unsigned value of rA as int, and assigning to it stores the value masked to 64 bits.
+    '''
+    @typecheck
+    def __init__(self) -> nothing:
+        super().__init__(len(NAMES))
+
+    @typecheck
+    def copy(self) -> lambda x: isinstance(x, SpecialRegisterFile):
+        '''
+        Create another file with the same values.
+
+        @return (SpecialRegisterFile): the copy.
+        '''
+        other = SpecialRegisterFile()
+        other.values[:] = self.values
+        return other
+
+def _special_register(index):
+    '''
+    Property of SpecialRegisterFile for the special register numbered index (int).
+    '''
+    def get(self):
+        return self.values[index]
+    def put(self, value):
+        self.values[index] = value & Octa.MASK
+    return property(get, put, doc="Special register {0}.".format(NAMES[index]))
+
+for _index, _name in enumerate(NAMES):
+    setattr(SpecialRegisterFile, _name, _special_register(_index))
@@ -15,8 +15,11 @@ class Tetra(Numeric):
     4 Bytes numeric.
     '''
 
+    __slots__ = ()  # no per-instance __dict__, all state lives in Numeric's slots
+
     SIZE_IN_BYTE = 4    # 4 Byte
     SIZE_IN_BIT = SIZE_IN_BYTE * Numeric.BYTE_SIZE_IN_BIT   # bits
+    MASK = 2 ** SIZE_IN_BIT - 1   # all bits set
 
     @typecheck
     def __init__(   #pylint: disable=W0231
@@ -0,0 +1,295 @@
+'''
+Translation of MMIX basic blocks into Python functions.
+'''
+import functools
+from Memory import Memory
+from Octa import Octa
+import SpecialRegisters
+from Tetra import Tetra
+from typecheck import *
+
+_SIGN = 1 << (Octa.SIZE_IN_BIT - 1)
+
+# conditions of branches, CS and ZS on the unsigned octa x, in the order of their OP codes: N, Z, P, OD, NN, NZ, NP, EV
+_CONDITIONS = (
+    'x >= S', 'x == 0', '0 < x < S', 'x & 1', 'x < S', 'x != 0', '(x == 0 or x >= S)', 'not x & 1',
+    )
+
+# expressions of y and z (unsigned octas) for instructions $X = f($Y, $Z) or f($Y, Z) without side effects,
+# indexed by the OP code of the register form
+_OPERATIONS = {
+    0x20: 'checked(signed(y) + signed(z))',                         # ADD
+    0x22: '(y + z) & M',                                            # ADDU
+    0x24: 'checked(signed(y) - signed(z))',                         # SUB
+    0x26: '(y - z) & M',                                            # SUBU
+    0x28: '(y * 2 + z) & M',                                        # 2ADDU
+    0x2a: '(y * 4 + z) & M',                                        # 4ADDU
+    0x2c: '(y * 8 + z) & M',                                        # 8ADDU
+    0x2e: '(y * 16 + z) & M',                                       # 16ADDU
+    0x30: '((signed(y) > signed(z)) - (signed(y) < signed(z))) & M',   # CMP
+    0x32: '((y > z) - (y < z)) & M',                                # CMPU
+    0x3a: '(y << z) & M if z < 64 else 0',                          # SLU
+    0x3c: '(signed(y) >> min(z, 63)) & M',                          # SR
+    0x3e: 'y >> z',                                                 # SRU
+    0xc0: 'y | z',                                                  # OR
+    0xc2: '(y | ~z) & M',                                           # ORN
+    0xc4: '~(y | z) & M',                                           # NOR
+    0xc6: 'y ^ z',                                                  # XOR
+    0xc8: 'y & z',                                                  # AND
+    0xca: 'y & ~z',                                                 # ANDN
+    0xcc: '~(y & z) & M',                                           # NAND
+    0xce: '~(y ^ z) & M',                                           # NXOR
+    }
+
+# (size in bytes, whether signed) of loads and stores, indexed by the OP code of the register form
+_LOADS = {0x80: (1, True), 0x82: (1, False), 0x84: (2, True), 0x86: (2, False), 0x88: (4, True), 0x8a: (4, False),
+          0x8c: (8, True), 0x8e: (8, False), 0x96: (8, False)}
+_STORES = {0xa0: (1, True), 0xa2: (1, False), 0xa4: (2, True), 0xa6: (2, False), 0xa8: (4, True), 0xaa: (4, False),
+           0xac: (8, True), 0xae: (8, False), 0xb6: (8, False)}
+
+# OP codes after which a block ends, as they change @ or stop the machine: TRAP, GO and GOI; branches and jumps are
+# translated to end blocks by themselves
+_CONTROL = frozenset((0x00, 0x9e, 0x9f))
+
+# OP codes that may change instructions: the block must check that it's still valid after them, SYNCID and SYNCIDI
+_SYNCHRONIZE = frozenset((0xbc, 0xbd))
+
+# OP codes that do nothing here: PRELD, PREGO, SYNCD, PREST in both forms, and SWYM
+_NOTHING = frozenset((0x9a, 0x9b, 0x9c, 0x9d, 0xb8, 0xb9, 0xba, 0xbb, 0xfd))
+
+class Translator:
+    '''
+    Translator of basic blocks of MMIX code into Python functions.
+
+    A block is discovered from its entry address: it runs until an instruction that changes @ (branch, jump, GO or
+    TRAP), the end of the page, or MAX_BLOCK_LENGTH instructions. It's translated into the source of one function,
+    with register indices and addresses baked in, and compiled with compile(). The function takes the machine and the
+    values of its general purpose registers (see RegisterFile), executes the block, leaves @ at the next instruction,
+    and returns the number of instructions executed.
+
+    Common instructions are translated into expressions, the other ones into calls of their handlers in the dispatch
+    table of the machine. A block ends before any instruction the machine doesn't implement, which is left to the
+    interpreter; an entry address where no block can start holds (None, 1).
+
+    Blocks are kept by entry address, and dropped on the first write to their page, like entries of a DecodeCache. A
+    block that stores into its own page, or executes SYNCID, returns as soon as it's dropped.
+    '''
+    MAX_BLOCK_LENGTH = 64
+
+    @typecheck
+    def __init__(self, memory: Memory, mmix) -> nothing:
+        '''
+        @memory (Memory): memory instructions are fetched from;
+        @mmix (MMIX): the machine that runs the blocks, whose dispatch table handles what isn't translated.
+        '''
+        self.memory = memory
+        self.table = mmix.dispatch_table
+        self.unimplemented = mmix.__unimplemented__
+        self.blocks = dict()    # entry address (uint) -> (function, number of instructions)
+        self.pages = dict()     # page number (uint) -> list of entry addresses of blocks in that page
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0  # number of pages whose blocks were dropped
+        special_registers = mmix.special_purpose_registers.values
+        def event(bit):
+            special_registers[SpecialRegisters.RA] |= bit
+        def checked(value):
+            if not -_SIGN <= value < _SIGN:
+                event(mmix.INTEGER_OVERFLOW)
+            return value & Octa.MASK
+        self.namespace = {
+            'M': Octa.MASK,
+            'S': _SIGN,
+            'V': mmix.INTEGER_OVERFLOW,
+            'signed': lambda value: value - ((value & _SIGN) << 1),
+            'event': event,
+            'checked': checked,
+            'blocks': self.blocks,
+            }
+        memory.write_watchers.append(self.invalidate_page)
+
+    def detach(self):
+        '''
+        Stop watching writes to memory, when this translator isn't used anymore.
+        '''
+        self.memory.write_watchers.remove(self.invalidate_page)
+
+    def invalidate_page(self, page_number):
+        '''
+        Drop the blocks of the page numbered page_number (int).
+        '''
+        addresses = self.pages.pop(page_number, None)
+        if addresses is not None:
+            self.invalidations += 1
+            for address in addresses:
+                del self.blocks[address]
+
+    def invalidate(self, address, length):
+        '''
+        Drop the blocks of every page overlapping length (int) bytes from address (int), as SYNCID does.
+        '''
+        last = ((address + length - 1) & Octa.MASK) >> self.memory.page_shift
+        page_number = address >> self.memory.page_shift
+        while True:
+            self.invalidate_page(page_number)
+            if page_number == last:
+                return
+            page_number = (page_number + 1) & (Octa.MASK >> self.memory.page_shift)
+
+    def is_implemented(self, opcode):
+        '''
+        Whether the machine implements OP code opcode (int).
+        '''
+        handler = self.table[opcode]
+        return not (isinstance(handler, functools.partial) and handler.func == self.unimplemented)
+
+    def translate(self, address):
+        '''
+        Translate the block at address (int), which has no entry yet, and add its entry.
+
+        @return (tuple): the entry (function, number of instructions), function is None if no block starts there.
+        '''
+        self.misses += 1
+        page_number = address >> self.memory.page_shift
+        lines = list()
+        length = 0
+        current = address
+        is_last = False
+        while not is_last and length < Translator.MAX_BLOCK_LENGTH and current >> self.memory.page_shift == page_number:
+            instruction = self.memory.fetch_uint(current, Tetra.SIZE_IN_BYTE)
+            opcode = instruction >> 24
+            if not self.is_implemented(opcode):
+                break
+            length += 1
+            is_last = self.__translate_instruction__(
+                lines, address, current, length,
+                opcode, (instruction >> 16) & 0xff, (instruction >> 8) & 0xff, instruction & 0xff
+                )
+            current = (current + Tetra.SIZE_IN_BYTE) & Octa.MASK
+        if not is_last:
+            lines.append('self.pc = {0:#x}'.format(current))
+            lines.append('return {0}'.format(length))
+        if length == 0:
+            entry = (None, 1)
+        else:
+            source = 'def block(self, r):\n    memory = self.memory\n' + ''.join('    ' + line + '\n' for line in lines)
+            namespace = dict(self.namespace)
+            exec(compile(source, '<block {0:#x}>'.format(address), 'exec'), namespace)   # pylint: disable=W0122
+            entry = (namespace['block'], length)
+            entry[0].source = source
+        self.blocks[address] = entry
+        addresses = self.pages.get(page_number)
+        if addresses is None:
+            addresses = self.pages[page_number] = list()
+            self.memory.watch_page(page_number)
+        addresses.append(address)
+        return entry
+
+    def __translate_instruction__(self, lines, entry, address, count, opcode, X, Y, Z):
+        '''
+        Append the source lines of one instruction to lines.
+
+        @lines (list): source lines of the block so far;
+        @entry (int): entry address of the block;
+        @address (int): address of the instruction;
+        @count (int): number of instructions of the block up to this one;
+        @opcode, X, Y, Z (int): the instruction.
+
+        @return (bool): whether the block ends with this instruction.
+        '''
+        following = (address + Tetra.SIZE_IN_BYTE) & Octa.MASK
+        base = opcode & 0xfe
+        z = 'r[{0}]'.format(Z) if opcode == base else str(Z)
+        def store_x(expression):
+            lines.append('r[{0}] = {1}'.format(X, expression))
+        def leave_if_dropped():
+            lines.append('if {0:#x} not in blocks:'.format(entry))
+            lines.append('    self.pc = {0:#x}'.format(following))
+            lines.append('    return {0}'.format(count))
+        def address_expression(size):
+            return '(r[{0}] + {1}) & {2:#x}'.format(Y, z, Octa.MASK & -size)
+        if base in _OPERATIONS:
+            lines.append('y = r[{0}]'.format(Y))
+            lines.append('z = {0}'.format(z))
+            store_x(_OPERATIONS[base])
+        elif base in _LOADS:
+            size, is_signed = _LOADS[base]
+            if is_signed:
+                store_x('memory.read_int({0}, {1}) & M'.format(address_expression(size), size))
+            else:
+                store_x('memory.read_uint({0}, {1})'.format(address_expression(size), size))
+        elif base == 0x92:  # LDHT
+            store_x('memory.read_uint({0}, 4) << 32'.format(address_expression(4)))
+        elif base in _STORES or base in (0xb2, 0xb4):
+            lines.append('self.pc = {0:#x}'.format(following))
+            if base == 0xb2:    # STHT
+                lines.append('memory.write_uint({0}, 4, r[{1}] >> 32)'.format(address_expression(4), X))
+            elif base == 0xb4:  # STCO
+                lines.append('memory.write_uint({0}, 8, {1})'.format(address_expression(8), X))
+            else:
+                size, is_signed = _STORES[base]
+                lines.append('x = r[{0}]'.format(X))
+                if is_signed and size < Octa.SIZE_IN_BYTE:
+                    bound = 1 << (8 * size - 1)
+                    lines.append('if not {0} <= signed(x) < {1}:'.format(-bound, bound))
+                    lines.append('    event(V)')
+                lines.append('memory.write_uint({0}, {1}, x)'.format(address_expression(size), size))
+            leave_if_dropped()
+        elif 0x40 <= opcode < 0x60:     # branches and probable branches
+            offset = ((Y << 8) | Z) - (0x10000 if opcode & 1 else 0)
+            lines.append('x = r[{0}]'.format(X))
+            lines.append('if {0}:'.format(_CONDITIONS[(opcode >> 1) & 0x7]))
+            lines.append('    self.pc = {0:#x}'.format((address + (offset << 2)) & Octa.MASK))
+            lines.append('    return {0}'.format(count))
+            lines.append('self.pc = {0:#x}'.format(following))
+            lines.append('return {0}'.format(count))
+            return True
+        elif 0x60 <= opcode < 0x80:     # conditional sets
+            lines.append('x = r[{0}]'.format(Y))
+            if opcode < 0x70:
+                lines.append('if {0}:'.format(_CONDITIONS[(opcode >> 1) & 0x7]))
+                lines.append('    r[{0}] = {1}'.format(X, z))
+            else:
+                store_x('{0} if {1} else 0'.format(z, _CONDITIONS[(opcode >> 1) & 0x7]))
+        elif 0xe0 <= opcode < 0xf0:     # wyde immediates
+            constant = ((Y << 8) | Z) << (48 - 16 * (opcode & 0x3))
+            kind = (opcode >> 2) & 0x3
+            if kind == 0:
+                store_x('{0:#x}'.format(constant))
+            elif kind == 1:
+                store_x('(r[{0}] + {1:#x}) & M'.format(X, constant))
+            elif kind == 2:
+                store_x('r[{0}] | {1:#x}'.format(X, constant))
+            else:
+                store_x('r[{0}] & {1:#x}'.format(X, ~constant & Octa.MASK))
+        elif opcode in (0xf0, 0xf1):    # JMP
+            offset = ((X << 16) | (Y << 8) | Z) - (0x1000000 if opcode & 1 else 0)
+            lines.append('self.pc = {0:#x}'.format((address + (offset << 2)) & Octa.MASK))
+            lines.append('return {0}'.format(count))
+            return True
+        elif opcode in (0xf4, 0xf5):    # GETA
+            offset = ((Y << 8) | Z) - (0x10000 if opcode & 1 else 0)
+            store_x('{0:#x}'.format((address + (offset << 2)) & Octa.MASK))
+        elif opcode in _NOTHING:
+            pass
+        else:
+            # any other instruction is left to its handler, which expects @ at the next instruction
+            name = 'h_{0:02x}'.format(opcode)
+            self.namespace[name] = self.table[opcode]
+            lines.append('self.pc = {0:#x}'.format(following))
+            lines.append('{0}({1}, {2}, {3})'.format(name, X, Y, Z))
+            if opcode in _CONTROL:
+                lines.append('return {0}'.format(count))
+                return True
+            if opcode in _SYNCHRONIZE:
+                leave_if_dropped()
+        return False
+
+    @typecheck
+    def statistics(self) -> dict_of(str, int):
+        '''
+        Counters of this translator.
+
+        @return (dict): 'hits', 'misses' and 'invalidations' -> count.
+        '''
+        return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations}
@@ -0,0 +1,198 @@
+'''
+Virtual address translation of MMIX, with software TLBs.
+'''
+from Octa import Octa
+from Register import Register
+from Utilities import guarantee
+from typecheck import *
+
+class TLB:
+    '''
+    Translation lookaside buffer: a cache of recent translations, in a dictionary
+        virtual page number (uint) -> (physical address of page (uint), protection bits (uint))
+    The oldest translation is evicted first when it's full.
+    '''
+    @typecheck
+    def __init__(self, name: str, size: lambda x: isinstance(x, int) and x > 0) -> nothing:
+        '''
+        @name (str): name of this TLB in statistics, e.g. 'ITLB';
+        @size (int): number of translations it holds.
+        '''
+        self.name = name
+        self.size = size
+        self.entries = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def insert(self, page_number, translation):
+        '''
+        Add the translation of virtual page page_number (int), evicting the oldest one if full.
+        '''
+        if len(self.entries) >= self.size:
+            del self.entries[next(iter(self.entries))]
+        self.entries[page_number] = translation
+
+    @typecheck
+    def flush(self) -> nothing:
+        '''
+        Forget all translations.
+
+        @return (None)
+        '''
+        self.entries.clear()
+
+    @typecheck
+    def statistics(self) -> dict_of(str, int):
+        '''
+        Counters of this TLB.
+
+        @return (dict): 'hits' and 'misses' -> count.
+        '''
+        return {'hits': self.hits, 'misses': self.misses}
+
+class VirtualMemory:
+    '''
+    Memory seen through MMIX virtual address translation, as set up by the virtual translation register rV:
+        b1, b2, b3, b4 (4 bits each): page tables of segment i take root pages b_i to b_(i+1) - 1 (b_0 = 0);
+        s (8 bits): pages are 2^s bytes, 13 <= s <= 48;
+        r (27 bits): root pages start at physical address 2^13 * r;
+        n (10 bits): address space number, which page table entries must match;
+        f (3 bits): must be 0, translation by hardware.
+    Virtual page number p of segment i is written in radix 1024, p = (a_k ... a_1 a_0). The walk starts in root page
+    b_i + k, follows page table pointers (PTP) at a_k ... a_1, and ends with the page table entry (PTE) at a_0:
+        PTP = 1 (1 bit), c (50 bits) address of the next table / 2^13, n (10 bits), unused (3 bits);
+        PTE = unused (16 bits), physical address of the page / 2^s (48 - s bits), unused (s - 13 bits), n (10 bits),
+              protection p (3 bits) read, write, execute.
+    Negative addresses aren't translated, they map to physical address A - 2^63.
+
+    Recent translations are kept in an instruction TLB and a data TLB. They're flushed whenever rV changes, and by SYNC 6
+    (see flush). Faults raise MmixException, as the machine has no interrupts yet.
+    '''
+    PROTECTION_READ = 0x4
+    PROTECTION_WRITE = 0x2
+    PROTECTION_EXECUTE = 0x1
+    PAGE_TABLE_SHIFT = 13       # page tables are 2^13 bytes, 1024 octas
+    PHYSICAL_ADDRESS_BIT = 48
+
+    @typecheck
+    def __init__(self, memory, rV: Register, tlb_size: lambda x: isinstance(x, int) and x > 0=64) -> nothing:
+        '''
+        @memory (Memory or CachedMemory): physical memory;
+        @rV (Register): the virtual translation register, read on every access;
+        @tlb_size (int): number of translations held by each TLB.
+        '''
+        self.memory = memory
+        self.rV = rV
+        self.itlb = TLB('ITLB', tlb_size)
+        self.dtlb = TLB('DTLB', tlb_size)
+        self.__decode_rV__(rV.uint)
+
+    def __getattr__(self, name):
+        return getattr(self.memory, name)
+
+    def __decode_rV__(self, value):
+        '''
+        Take the fields of rV value (int) for translation.
+        '''
+        self.rV_value = value
+        self.limits = (0, value >> 60, (value >> 56) & 0xf, (value >> 52) & 0xf, (value >> 48) & 0xf)
+        self.page_shift = (value >> 40) & 0xff
+        self.root = ((value >> 13) & ((1 << 27) - 1)) << VirtualMemory.PAGE_TABLE_SHIFT
+        self.address_space = (value >> 3) & 0x3ff
+        self.function = value & 0x7
+
+    @typecheck
+    def flush(self) -> nothing:
+        '''
+        Flush both TLBs, as SYNC 6 does.
+
+        @return (None)
+        '''
+        self.itlb.flush()
+        self.dtlb.flush()
+
+    def translate(self, address, tlb, permission):
+        '''
+        Translate a virtual address into a physical one.
+
+        @address (int): virtual address;
+        @tlb (TLB): TLB to look the page up in;
+        @permission (int): the protection bit the access needs.
+
+        @return (int): physical address.
+        '''
+        if self.rV.uint != self.rV_value:
+            self.flush()
+            self.__decode_rV__(self.rV.uint)
+        if address >> 63:
+            return address & (Octa.MASK >> 1)
+        page_number = address >> self.page_shift
+        translation = tlb.entries.get(page_number)
+        if translation is None:
+            tlb.misses += 1
+            translation = self.__walk__(address)
+            tlb.insert(page_number, translation)
+        else:
+            tlb.hits += 1
+        if not translation[1] & permission:
+            guarantee(False, "Protection fault at virtual address {0:#x}!".format(address))
+        return translation[0] | (address & ((1 << self.page_shift) - 1))
+
+    def __walk__(self, address):
+        '''
+        Walk the page tables for address (int).
+
+        @return (tuple): (physical address of page, protection bits), as int.
+        '''
+        def fault(reason):
+            guarantee(False, "Page fault at virtual address {0:#x}: {1}!".format(address, reason))
+        if self.function != 0 or not 13 <= self.page_shift <= 48:
+            fault("rV is invalid")
+        segment = address >> 61
+        page_number = (address & ((1 << 61) - 1)) >> self.page_shift
+        level = (page_number.bit_length() - 1) // 10 if page_number else 0
+        if level >= self.limits[segment + 1] - self.limits[segment]:
+            fault("segment {0} has no page tables of {1} levels".format(segment, level + 1))
+        table = self.root + ((self.limits[segment] + level) << VirtualMemory.PAGE_TABLE_SHIFT)
+        for digit in range(level, 0, -1):
+            entry = self.memory.read_uint(table + (((page_number >> (10 * digit)) & 0x3ff) << 3), Octa.SIZE_IN_BYTE)
+            if not entry >> 63 or (entry >> 3) & 0x3ff != self.address_space:
+                fault("invalid page table pointer")
+            table = ((entry >> 13) & ((1 << 50) - 1)) << VirtualMemory.PAGE_TABLE_SHIFT
+        entry = self.memory.read_uint(table + ((page_number & 0x3ff) << 3), Octa.SIZE_IN_BYTE)
+        if (entry >> 3) & 0x3ff != self.address_space:
+            fault("invalid page table entry")
+        return entry & ((1 << VirtualMemory.PHYSICAL_ADDRESS_BIT) - (1 << self.page_shift)), entry & 0x7
+
+    def fetch_uint(self, address, size):
+        '''
+        Fetch an instruction at a virtual address, see Memory.fetch_uint.
+        '''
+        return self.memory.fetch_uint(self.translate(address, self.itlb, VirtualMemory.PROTECTION_EXECUTE), size)
+
+    def read_uint(self, address, size):
+        '''
+        Load from a virtual address, see Memory.read_uint.
+        '''
+        return self.memory.read_uint(self.translate(address, self.dtlb, VirtualMemory.PROTECTION_READ), size)
+
+    def read_int(self, address, size):
+        '''
+        Load from a virtual address, see Memory.read_int.
+        '''
+        return self.memory.read_int(self.translate(address, self.dtlb, VirtualMemory.PROTECTION_READ), size)
+
+    def write_uint(self, address, size, value):
+        '''
+        Store to a virtual address, see Memory.write_uint.
+        '''
+        self.memory.write_uint(self.translate(address, self.dtlb, VirtualMemory.PROTECTION_WRITE), size, value)
+
+    @typecheck
+    def statistics(self) -> dict_of(str, dict):
+        '''
+        Counters of both TLBs.
+
+        @return (dict): TLB name -> dict of counters (see TLB.statistics).
+        '''
+        return {tlb.name: tlb.statistics() for tlb in (self.itlb, self.dtlb)}
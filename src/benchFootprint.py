@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+'''
+Benchmark of per-value memory footprint of Numeric classes.
+
+For each width, a batch of values is created and the host memory they take is measured with tracemalloc. The result
+includes the int object holding the value, so it's what one more value really costs.
+'''
+import argparse
+import tracemalloc
+from random import randint
+from Byte import Byte
+from Wyde import Wyde
+from Tetra import Tetra
+from Octa import Octa
+from Register import Register
+
+def bytes_per_value(klass, count):
+    '''
+    Measure the average host memory in bytes taken by one instance of klass holding a random value.
+    '''
+    values = [randint(0, klass.MASK) for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [klass(value) for value in values]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding the objects costs one pointer per value, which isn't part of the value itself
+    return (after - before) / len(objs) - 8
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report host memory taken by one Numeric value of each width.')
+    parser.add_argument('-n', '--count', type=int, default=100000, help='Number of values to create per width.')
+    args = parser.parse_args()
+    print('{:10}{:>16}'.format('class', 'bytes/value'))
+    for name, klass in (('Byte', Byte), ('Wyde', Wyde), ('Tetra', Tetra), ('Octa', Octa), ('Register', Register)):
+        print('{:10}{:>16.1f}'.format(name, bytes_per_value(klass, args.count)))
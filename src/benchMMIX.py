@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+'''
+Benchmark of guest throughput of MMIX, in instructions per second.
+
+The guest runs a loop kernel of loads, stores, arithmetic and a branch, as typical loop bodies do, on each of the
+engines of MMIX.
+'''
+import argparse
+import time
+from MMIX import MMIX
+
+def kernel(iterations):
+    '''
+    Tetras of the loop kernel, which adds iterations, iterations - 1, ..., 1 to the octa at #2000000000000000.
+    '''
+    return (
+        0xe0032000,                         # SETH  $3,#2000
+        0xe2010000 | (iterations >> 16),    # SETML $1,iterations >> 16
+        0xeb010000 | (iterations & 0xffff), # ORL   $1,iterations & #ffff
+        0x8d040300,                         # LDO   $4,$3,0
+        0x20040401,                         # ADD   $4,$4,$1
+        0xad040300,                         # STO   $4,$3,0
+        0x27010101,                         # SUBU  $1,$1,1
+        0x5b01fffc,                         # PBNZ  $1,@-16
+        0x00000000,                         # TRAP  0,Halt,0
+        )
+
+def run_kernel(engine, iterations):
+    '''
+    Run the kernel on a new machine with the given engine.
+
+    @return (tuple): number of instructions executed, seconds taken.
+    '''
+    mmix = MMIX(engine)
+    for offset, instruction in enumerate(kernel(iterations)):
+        mmix.memory.write_u32(0x100 + 4 * offset, instruction)
+    mmix.pc = 0x100
+    start = time.perf_counter()
+    count = mmix.run()
+    seconds = time.perf_counter() - start
+    assert mmix.memory.read_u64(0x2000000000000000) == iterations * (iterations + 1) // 2
+    return count, seconds
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure guest instructions per second of MMIX.')
+    parser.add_argument('-n', '--iterations', type=int, default=20000, help='Iterations of the loop kernel.')
+    parser.add_argument('-e', '--engine', choices=MMIX.ENGINES, action='append', help='Engine(s) to run.')
+    args = parser.parse_args()
+    print('{:12}{:>16}{:>16}{:>16}'.format('engine', 'instructions', 'seconds', 'instructions/s'))
+    for engine_name in args.engine or MMIX.ENGINES:
+        instructions, elapsed = run_kernel(engine_name, args.iterations)
+        print('{:12}{:>16}{:>16.3f}{:>16.0f}'.format(engine_name, instructions, elapsed, instructions / elapsed))
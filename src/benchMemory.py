@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+'''
+Benchmark of Memory throughput and host memory usage.
+
+The paged Memory is compared with the Memory of the baseline revision, which kept one Byte per guest byte in a
+dictionary keyed by address. The baseline modules (Memory, Numeric, Octa...) are taken from git as they were, so the
+comparison is before/after. Each engine runs in its own process, so that neither the reported peak RSS nor the
+imported modules are polluted by the other.
+'''
+import argparse
+import atexit
+import io
+import multiprocessing
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+BASELINE = 'c63a7aa'    # revision of the dictionary of Bytes Memory
+
+def import_baseline(revision):
+    '''
+    Extract the sources of revision into a temporary directory, and put it first on the module path, so that Memory
+    and Octa are imported as they were at revision.
+    '''
+    root = subprocess.check_output(
+        ['git', 'rev-parse', '--show-toplevel'], cwd=os.path.dirname(os.path.abspath(__file__))
+        ).decode().strip()
+    archive = subprocess.check_output(['git', 'archive', '--format=tar', revision, 'src'], cwd=root)
+    directory = tempfile.mkdtemp(prefix='benchMemory-')
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+    sys.path.insert(0, os.path.join(directory, 'src'))
+
+ENGINES = ('baseline', 'paged')
+
+def peak_rss_in_kb():
+    '''
+    Peak resident set size of this process, in KiB (Linux reports ru_maxrss in KiB).
+    '''
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def run_engine(engine, size_in_mb, revision, results):
+    '''
+    Fill size_in_mb of memory with Octas and read them back, recording timings and RSS growth.
+    '''
+    if engine == 'baseline':
+        import_baseline(revision)
+    from Memory import Memory   # pylint: disable=C0415
+    from Octa import Octa       # pylint: disable=C0415
+    base = 0x2000000000000000   # start of data segment
+    addresses = [Octa(base + offset) for offset in range(0, size_in_mb << 20, Octa.SIZE_IN_BYTE)]
+    values = [Octa(i) for i in range(len(addresses))]
+    rss_before = peak_rss_in_kb()
+    memory = Memory()
+    start = time.perf_counter()
+    for address, value in zip(addresses, values):
+        memory.set(address, value)
+    write_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for address in addresses:
+        memory.read(address, Octa)
+    read_time = time.perf_counter() - start
+    results[engine] = (len(addresses), write_time, read_time, peak_rss_in_kb() - rss_before)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare throughput and RSS of Memory engines.')
+    parser.add_argument('-m', '--megabytes', type=int, default=2, help='Size of guest memory to fill, in MiB.')
+    parser.add_argument('-e', '--engine', choices=ENGINES, action='append', help='Engine(s) to run.')
+    parser.add_argument('-b', '--baseline', default=BASELINE, help='Git revision of the baseline engine.')
+    args = parser.parse_args()
+    # spawned processes start with no module imported, so the baseline one imports the old modules
+    context = multiprocessing.get_context('spawn')
+    manager = context.Manager()
+    shared_results = manager.dict()
+    for engine_name in args.engine or ENGINES:
+        process = context.Process(
+            target=run_engine, args=(engine_name, args.megabytes, args.baseline, shared_results)
+            )
+        process.start()
+        process.join()
+    print('{:10}{:>16}{:>16}{:>16}'.format('engine', 'writes/s', 'reads/s', 'RSS growth MiB'))
+    for engine_name, (count, write_seconds, read_seconds, rss_kb) in sorted(shared_results.items()):
+        print('{:10}{:>16.0f}{:>16.0f}{:>16.1f}'.format(
+            engine_name, count / write_seconds, count / read_seconds, rss_kb / 1024
+            ))
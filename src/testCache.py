@@ -0,0 +1,90 @@
+#pylint: disable=C0103
+'''
+Unit test for Cache and CachedMemory classes.
+'''
+import unittest
+from Cache import Cache, CachedMemory
+from Memory import Memory
+from MMIX import MMIX
+from Byte import Byte
+from Octa import Octa
+from Utilities import MmixException
+
+class TestCache(unittest.TestCase):
+    '''
+    Unit test suite for Cache and CachedMemory classes.
+    '''
+    @classmethod
+    def setUpClass(cls):
+        print("\nStart testing %s" % __name__)
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\nFinish testing %s" % __name__)
+
+    def testPolicies(self):
+        '''
+        Verify hits and misses of LRU and FIFO replacement in one set of two ways.
+        '''
+        for policy, hits in ((Cache.LRU, 3), (Cache.FIFO, 2)):
+            cache = Cache('L1D', 32, 2, 16, policy)
+            for address in (0x00, 0x10, 0x00, 0x20, 0x00, 0x08):
+                cache.access(address, 8, False)
+            # LRU keeps 0x00 when 0x20 comes in, FIFO evicts it
+            self.assertEqual(cache.statistics(), {'hits': hits, 'misses': 6 - hits, 'writebacks': 0})
+        cache = Cache('L1D', 64, 4, 16, Cache.RANDOM, seed=1)
+        for address in range(0, 0x400, 8):
+            cache.access(address, 8, False)
+        self.assertEqual((cache.hits, cache.misses), (64, 64))
+        self.assertRaises(Exception, Cache, 'L1D', 48, 2, 16)
+        self.assertRaises(MmixException, Cache, 'L1D', 16, 2, 16)
+
+    def testWritebacksAndLevels(self):
+        '''
+        Verify that dirty lines are written back to the next level when evicted, and that accesses may span lines.
+        '''
+        l2 = Cache('L2', 256, 4, 32)
+        cache = Cache('L1D', 32, 1, 16, next_level=l2)
+        cache.access(0x0c, 8, True)     # spans lines 0 and 1, both missing and made dirty
+        self.assertEqual((cache.hits, cache.misses, cache.writebacks), (0, 2, 0))
+        self.assertEqual((l2.hits, l2.misses), (1, 1))
+        cache.access(0x20, 8, False)    # evicts dirty line 0
+        cache.access(0x30, 8, False)    # evicts dirty line 1
+        self.assertEqual(cache.statistics(), {'hits': 0, 'misses': 4, 'writebacks': 2})
+        self.assertEqual(l2.statistics(), {'hits': 4, 'misses': 2, 'writebacks': 0})
+        self.assertEqual(l2.dirty, {0})
+        cache.reset()
+        self.assertEqual(cache.statistics(), {'hits': 0, 'misses': 0, 'writebacks': 0})
+
+    def testMMIX(self):
+        '''
+        Verify that loads, stores and instruction fetches of MMIX go through the caches only while they're enabled.
+        '''
+        mmix = MMIX()
+        memory = mmix.memory
+        l2 = Cache('L2', 1024, 4, 64)
+        icache, dcache = Cache('L1I', 256, 2, 32, next_level=l2), Cache('L1D', 256, 2, 32, next_level=l2)
+        cached = mmix.enable_caches(icache, dcache)
+        self.assertIsInstance(mmix.memory, CachedMemory)
+        self.assertIs(cached.memory, memory)
+        memory.write_u32(0x100, 0x8d010203)
+        mmix.general_purpose_registers[1].set_value(0x1000)
+        mmix.general_purpose_registers[2].set_value(0x1234)
+        mmix.__read_instruction__(Octa(0x100))
+        mmix.__read_instruction__(Octa(0x104))
+        mmix.__STx__(Byte(2), Byte(1), Byte(8), Octa, False, True)
+        mmix.__LDx__(Byte(3), Byte(1), Byte(8), Octa, False, True)
+        self.assertEqual(mmix.general_purpose_registers[3].uint, 0x1234)
+        self.assertEqual(cached.statistics(), {
+            'L1I': {'hits': 1, 'misses': 1, 'writebacks': 0},
+            'L1D': {'hits': 1, 'misses': 1, 'writebacks': 0},
+            'L2': {'hits': 0, 'misses': 2, 'writebacks': 0},
+            })
+        self.assertEqual(mmix.__print_memory__(Octa, 0x1000, 0x1010), '...\n0x0000000000001008:\t0x0000000000001234\n')
+        mmix.disable_caches()
+        self.assertIs(mmix.memory, memory)
+        mmix.__LDx__(Byte(3), Byte(1), Byte(8), Octa, False, True)
+        self.assertEqual(dcache.hits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#pylint: disable=C0103
+'''
+Unit test for DecodeCache class.
+'''
+import unittest
+from DecodeCache import DecodeCache
+from Cache import Cache
+from MMIX import MMIX
+from testMMIX import SUM_PROGRAM, load_program
+
+# overwrite the first instruction with $2 when $4 is zero, set $4 and run the overwritten instruction again
+SELF_MODIFYING_PROGRAM = (
+    0xe3010007, # SETL $1,7
+    0x4a040004, # BNZ $4,@+16
+    0xab020300, # STTU $2,$3,0
+    0xe3040001, # SETL $4,1
+    0xf1fffffc, # JMPB @-16
+    0x00000000, # TRAP 0,Halt,0
+    )
+
+class TestDecodeCache(unittest.TestCase):
+    '''
+    Unit test suite for DecodeCache class.
+    '''
+    @classmethod
+    def setUpClass(cls):
+        print("\nStart testing %s" % __name__)
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\nFinish testing %s" % __name__)
+
+    def testHitsAndMisses(self):
+        '''
+        Verify that every instruction is decoded once, and that programs loaded again are decoded again.
+        '''
+        mmix = MMIX()
+        load_program(mmix, SUM_PROGRAM)
+        self.assertEqual(mmix.run(), 36)
+        cache = mmix.decode_cache
+        self.assertIsInstance(cache, DecodeCache)
+        self.assertEqual(cache.statistics(), {'hits': 27, 'misses': 9, 'invalidations': 0})
+        self.assertEqual(cache.entries[0x10c], (mmix.dispatch_table[0x20], 2, 2, 1))
+        self.assertEqual(cache.pages, {0: list(range(0x100, 0x124, 4))})
+        load_program(mmix, SUM_PROGRAM)
+        self.assertEqual(cache.statistics()['invalidations'], 1)
+        self.assertEqual(cache.entries, {})
+        mmix.halted = False
+        mmix.step()
+        self.assertEqual(cache.statistics(), {'hits': 27, 'misses': 10, 'invalidations': 1})
+
+    def testSelfModifyingCode(self):
+        '''
+        Verify that stores into code, and SYNCID, drop the decoded instructions.
+        '''
+        mmix = MMIX()
+        load_program(mmix, SELF_MODIFYING_PROGRAM)
+        mmix.general_purpose_registers[2].set_value(0xe3010009)     # SETL $1,9
+        mmix.general_purpose_registers[3].set_value(0x100)
+        self.assertEqual(mmix.run(), 8)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 9)
+        self.assertEqual(mmix.decode_cache.invalidations, 1)
+        load_program(mmix, (0xbd020500,), 0x2000)   # SYNCID 2,$5,0
+        mmix.general_purpose_registers[5].set_value(0x112)
+        mmix.step()
+        self.assertEqual(sorted(mmix.decode_cache.pages), [2])
+        self.assertEqual(mmix.decode_cache.invalidations, 2)
+
+    def testEngines(self):
+        '''
+        Verify that instructions aren't predecoded by the interpreter engine, or through caches, and that a forked
+        machine has its own decode cache.
+        '''
+        mmix = MMIX(MMIX.INTERPRETER)
+        load_program(mmix, SUM_PROGRAM)
+        mmix.run()
+        self.assertIsNone(mmix.decode_cache)
+        mmix = MMIX()
+        load_program(mmix, SELF_MODIFYING_PROGRAM)
+        mmix.run(1)
+        other = mmix.fork()
+        other.general_purpose_registers[2].set_value(0xe3010009)
+        other.general_purpose_registers[3].set_value(0x100)
+        other.run()
+        self.assertEqual(other.general_purpose_registers[1].uint, 9)
+        self.assertEqual(mmix.decode_cache.invalidations, 0)
+        self.assertEqual(other.decode_cache.invalidations, 1)
+        memory = mmix.memory
+        mmix.enable_caches(Cache('L1I', 256, 2, 32), Cache('L1D', 256, 2, 32))
+        mmix.run()
+        self.assertEqual(mmix.decode_cache.misses, 1)
+        self.assertEqual(mmix.memory.icache.misses, 1)
+        mmix.disable_caches()
+        self.assertIs(mmix.memory, memory)
+        self.assertRaises(Exception, MMIX, 'compiler')
+
+if __name__ == '__main__':
+    unittest.main()
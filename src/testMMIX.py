@@ -1,10 +1,34 @@
 ﻿import unittest
+import functools
 from Octa import Octa
 from Byte import Byte
 from Wyde import Wyde
 from Tetra import Tetra
 from Register import Register
 from MMIX import MMIX
+from Utilities import MmixException
+from random import randint
+
+# sum 1..10 into $2, store it and load it back into $4, halt
+SUM_PROGRAM = (
+    0xe0032000, # SETH $3,#2000
+    0xe301000a, # SETL $1,10
+    0xe3020000, # SETL $2,0
+    0x20020201, # ADD $2,$2,$1
+    0x25010101, # SUB $1,$1,1
+    0x5501fffe, # PBP $1,@-8
+    0xad020308, # STO $2,$3,8
+    0x8904030c, # LDT $4,$3,12
+    0x00000000, # TRAP 0,Halt,0
+    )
+
+def load_program(mmix, program, address=0x100):
+    '''
+    Write tetras of program into memory of mmix from address, and point @ to it.
+    '''
+    for offset, instruction in enumerate(program):
+        mmix.memory.write_u32(address + 4 * offset, instruction)
+    mmix.pc = address
 
 class TestMMIX(unittest.TestCase):
 
@@ -31,6 +55,21 @@ class TestMMIX(unittest.TestCase):
         self.assertEqual(len(mmix.special_purpose_registers), 32)
         self.assertEqual(len(mmix.special_purpose_register_names), 32)
 
+    def testFork(self):
+        '''
+        Verify that a forked machine starts with the same registers and memory, and changes independently.
+        '''
+        mmix = MMIX()
+        mmix.general_purpose_registers[1].set_value(0x1234)
+        mmix.memory.write_u64(0x100, 0x5678)
+        other = mmix.fork()
+        self.assertEqual(other.general_purpose_registers[1].uint, 0x1234)
+        self.assertEqual(other.memory.read_u64(0x100), 0x5678)
+        other.general_purpose_registers[1].set_value(0)
+        other.memory.write_u64(0x100, 0)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 0x1234)
+        self.assertEqual(mmix.memory.read_u64(0x100), 0x5678)
+
     def test__read_instruction__(self):
         '''
         Verify that MMIX can read one instruction.
@@ -79,6 +118,8 @@ class TestMMIX(unittest.TestCase):
         self.assertEqual(mmix.__get_special_register_index_by_name__('rXX'), 29)
         self.assertEqual(mmix.__get_special_register_index_by_name__('rYY'), 30)
         self.assertEqual(mmix.__get_special_register_index_by_name__('rZZ'), 31)
+        self.assertRaises(MmixException, mmix.__get_special_register_index_by_name__, 'rAA')
+        self.assertRaises(MmixException, mmix.__get_special_register_index_by_name__, 21)
 
     def test__print_memory__(self):
         mmix = MMIX()
@@ -152,7 +193,7 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z = Byte(-2)    # an direct operator
+        Z = Byte(3)    # an direct operator
         mmix.memory.set(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Byte(-5))
         mmix.__LDB_direct__(X, Y, Z)
         self.assertEqual(
@@ -184,7 +225,7 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z = Byte(-2)    # an direct operator
+        Z = Byte(3)    # an direct operator
         mmix.memory.set(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Byte(99))
         mmix.__LDBU_direct__(X, Y, Z)
         self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Byte).uint)
@@ -213,7 +254,7 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z = Byte(-2)    # an direct operator
+        Z = Byte(3)    # an direct operator
         mmix.memory.set(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Wyde(-5))
         mmix.__LDW_direct__(X, Y, Z)
         self.assertEqual(mmix.general_purpose_registers[X.uint].int, mmix.memory.read(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Wyde).int)
@@ -227,11 +268,11 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z, Z_value = Byte(-2), Octa(4)
+        Z, Z_value = Byte(-2), Octa(3)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
-        mmix.memory.set(Octa(5+4), Wyde(-5))
+        mmix.memory.set(Octa(5+3), Wyde(-5))
         mmix.__LDW_indirect__(X, Y, Z)
-        self.assertEqual(mmix.general_purpose_registers[X.uint].int, mmix.memory.read(Octa(5+4), Wyde).int)
+        self.assertEqual(mmix.general_purpose_registers[X.uint].int, mmix.memory.read(Octa(5+3), Wyde).int)
 
     def test__LDWU_direct__(self):
         '''
@@ -242,7 +283,7 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z = Byte(-2)    # an direct operator
+        Z = Byte(3)    # an direct operator
         mmix.memory.set(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Wyde(99))
         mmix.__LDWU_direct__(X, Y, Z)
         self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Wyde).uint)
@@ -256,11 +297,11 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z, Z_value = Byte(-2), Octa(4)
+        Z, Z_value = Byte(-2), Octa(3)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
-        mmix.memory.set(Octa(5+4), Wyde(99))
+        mmix.memory.set(Octa(5+3), Wyde(99))
         mmix.__LDWU_indirect__(X, Y, Z)
-        self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(5+4), Wyde).uint)
+        self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(5+3), Wyde).uint)
 
     def test__LDT_direct__(self):
         '''
@@ -271,7 +312,7 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z = Byte(-2)    # an direct operator
+        Z = Byte(3)    # an direct operator
         mmix.memory.set(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Tetra(-5))
         mmix.__LDT_direct__(X, Y, Z)
         self.assertEqual(mmix.general_purpose_registers[X.uint].int, mmix.memory.read(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Tetra).int)
@@ -285,11 +326,11 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z, Z_value = Byte(-2), Octa(4)
+        Z, Z_value = Byte(-2), Octa(3)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
-        mmix.memory.set(Octa(5+4), Tetra(-5))
+        mmix.memory.set(Octa(5+3), Tetra(-5))
         mmix.__LDT_indirect__(X, Y, Z)
-        self.assertEqual(mmix.general_purpose_registers[X.uint].int, mmix.memory.read(Octa(5+4), Tetra).int)
+        self.assertEqual(mmix.general_purpose_registers[X.uint].int, mmix.memory.read(Octa(5+3), Tetra).int)
 
     def test__LDTU_direct__(self):
         '''
@@ -300,7 +341,7 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z = Byte(-2)    # an direct operator
+        Z = Byte(3)    # an direct operator
         mmix.memory.set(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Tetra(99))
         mmix.__LDTU_direct__(X, Y, Z)
         self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Tetra).uint)
@@ -314,11 +355,11 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z, Z_value = Byte(-2), Octa(4)
+        Z, Z_value = Byte(-2), Octa(3)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
-        mmix.memory.set(Octa(5+4), Tetra(99))
+        mmix.memory.set(Octa(5+3), Tetra(99))
         mmix.__LDTU_indirect__(X, Y, Z)
-        self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(5+4), Tetra).uint)
+        self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(5+3), Tetra).uint)
 
     def test__LDO_direct__(self):
         '''
@@ -329,7 +370,7 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z = Byte(-2)    # an direct operator
+        Z = Byte(3)    # an direct operator
         mmix.memory.set(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Octa(-5))
         mmix.__LDO_direct__(X, Y, Z)
         self.assertEqual(mmix.general_purpose_registers[X.uint].int, mmix.memory.read(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Octa).int)
@@ -343,11 +384,11 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z, Z_value = Byte(-2), Octa(4)
+        Z, Z_value = Byte(-2), Octa(3)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
-        mmix.memory.set(Octa(5+4), Octa(-5))
+        mmix.memory.set(Octa(5+3), Octa(-5))
         mmix.__LDO_indirect__(X, Y, Z)
-        self.assertEqual(mmix.general_purpose_registers[X.uint].int, mmix.memory.read(Octa(5+4), Octa).int)
+        self.assertEqual(mmix.general_purpose_registers[X.uint].int, mmix.memory.read(Octa(5+3), Octa).int)
 
     def test__LDOU_direct__(self):
         '''
@@ -358,7 +399,7 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z = Byte(-2)    # an direct operator
+        Z = Byte(3)    # an direct operator
         mmix.memory.set(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Octa(99))
         mmix.__LDOU_direct__(X, Y, Z)
         self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(mmix.general_purpose_registers[Y.uint].uint+Z.int), Octa).uint)
@@ -372,11 +413,11 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z, Z_value = Byte(-2), Octa(4)
+        Z, Z_value = Byte(-2), Octa(3)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
-        mmix.memory.set(Octa(5+4), Octa(99))
+        mmix.memory.set(Octa(5+3), Octa(99))
         mmix.__LDOU_indirect__(X, Y, Z)
-        self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(5+4), Octa).uint)
+        self.assertEqual(mmix.general_purpose_registers[X.uint].uint, mmix.memory.read(Octa(5+3), Octa).uint)
 
     def test__LDHT_indirect__(self):
         '''
@@ -387,9 +428,9 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z, Z_value = Byte(-2), Octa(4)
+        Z, Z_value = Byte(11), Octa(4)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
-        mmix.memory.set(Octa(5-2), Tetra(0x12345678))
+        mmix.memory.set(Octa(5+11), Tetra(0x12345678))
         mmix.__LDHT__(X, Y, Z, is_direct=True)
         self.assertEqual(mmix.general_purpose_registers[X.uint].uint, 0x1234567800000000)
 
@@ -398,9 +439,9 @@ class TestMMIX(unittest.TestCase):
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
         Y, Y_value = Byte(3), Octa(5) # index of general_purpose_registers and its content
         mmix.general_purpose_registers[Y.uint].set_value(Y_value.uint)  # set content of $Y
-        Z, Z_value = Byte(-2), Octa(4)
+        Z, Z_value = Byte(-2), Octa(3)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
-        mmix.memory.set(Octa(5+4), Tetra(0x12345678))
+        mmix.memory.set(Octa(5+3), Tetra(0x12345678))
         mmix.__LDHT__(X, Y, Z, is_direct=False)
         self.assertEqual(mmix.general_purpose_registers[X.uint].uint, 0x1234567800000000)
 
@@ -416,7 +457,7 @@ class TestMMIX(unittest.TestCase):
         Z, Z_value = Byte(-2), Octa(4)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
         mmix.__LDA__(X, Y, Z, is_direct=True)
-        self.assertEqual(mmix.general_purpose_registers[X.uint].uint, 5-2)
+        self.assertEqual(mmix.general_purpose_registers[X.uint].uint, 5+0xfe)   # Z is unsigned
 
         mmix = MMIX()
         X = Byte(1)    # index of general_purpose_registers
@@ -435,7 +476,7 @@ class TestMMIX(unittest.TestCase):
         exception occurs if $X is not between −128 and +127. (We will discuss overflow and other kinds of exceptions
         later.)
         '''
-        # STB $1 $3 -2
+        # STB $1 $3 254
         mmix = MMIX()
         X = Byte(1)    # index of general_purpose_registers
         mmix.general_purpose_registers[X.uint].set_value(0x0102030405060708)  # set content of $X to some value
@@ -444,7 +485,7 @@ class TestMMIX(unittest.TestCase):
         Z, Z_value = Byte(-2), Octa(4)
         mmix.general_purpose_registers[Z.uint].set_value(Z_value.uint)  # set content of $Z
         mmix.__STB__(X, Y, Z, is_direct=True)
-        self.assertEqual(mmix.memory.read(Y_value + Z, Byte), Byte(0x08))
+        self.assertEqual(mmix.memory.read(Octa(5+0xfe), Byte), Byte(0x08))     # Z is unsigned
 
         # STB $1 $3 $2
         mmix = MMIX()
@@ -458,5 +499,250 @@ class TestMMIX(unittest.TestCase):
         mmix.__STB__(X, Y, Z, is_direct=False)
         self.assertEqual(mmix.memory.read(Y_value + Z_value, Byte), Byte(0x08))
 
+    def test__MUL__(self):
+        '''
+        Verify that MUL places the signed product into $X, and sets the overflow event bit of rA on overflow.
+        '''
+        mmix = MMIX()
+        rA = mmix.special_purpose_registers[mmix.__get_special_register_index_by_name__('rA')]
+        mmix.general_purpose_registers[2].set_value(-3)
+        mmix.general_purpose_registers[3].set_value(7)
+        mmix.__MUL__(Byte(1), Byte(2), Byte(3), is_direct=False)
+        self.assertEqual(mmix.general_purpose_registers[1].int, -21)
+        mmix.__MUL__(Byte(1), Byte(2), Byte(0xff), is_direct=True)
+        self.assertEqual(mmix.general_purpose_registers[1].int, -3 * 255)
+        self.assertEqual(rA.uint, 0)
+        mmix.general_purpose_registers[2].set_value(2**62)
+        mmix.__MUL__(Byte(1), Byte(2), Byte(2), is_direct=True)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 2**63)
+        self.assertEqual(rA.uint, MMIX.INTEGER_OVERFLOW)
+
+    def test__MULU__(self):
+        '''
+        Verify that MULU splits the 128-bit product into rH and $X.
+        '''
+        mmix = MMIX()
+        rH = mmix.special_purpose_registers[mmix.__get_special_register_index_by_name__('rH')]
+        mmix.general_purpose_registers[2].set_value(2**64-1)
+        mmix.general_purpose_registers[3].set_value(2**64-1)
+        mmix.__MULU__(Byte(1), Byte(2), Byte(3), is_direct=False)
+        self.assertEqual((rH.uint << 64) | mmix.general_purpose_registers[1].uint, (2**64-1)**2)
+        mmix.__MULU__(Byte(1), Byte(2), Byte(0x10), is_direct=True)
+        self.assertEqual(rH.uint, 0xf)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 2**64-0x10)
+
+    def test__DIV__(self):
+        '''
+        Verify that DIV rounds towards negative infinity, puts the remainder into rR and handles the special cases.
+        '''
+        mmix = MMIX()
+        rA = mmix.special_purpose_registers[mmix.__get_special_register_index_by_name__('rA')]
+        rR = mmix.special_purpose_registers[mmix.__get_special_register_index_by_name__('rR')]
+        mmix.general_purpose_registers[2].set_value(-7)
+        mmix.__DIV__(Byte(1), Byte(2), Byte(2), is_direct=True)
+        self.assertEqual((mmix.general_purpose_registers[1].int, rR.int), (-4, 1))
+        mmix.general_purpose_registers[3].set_value(-2)
+        mmix.__DIV__(Byte(1), Byte(2), Byte(3), is_direct=False)
+        self.assertEqual((mmix.general_purpose_registers[1].int, rR.int), (3, -1))
+        self.assertEqual(rA.uint, 0)
+        mmix.__DIV__(Byte(1), Byte(2), Byte(0), is_direct=True)
+        self.assertEqual((mmix.general_purpose_registers[1].int, rR.int), (0, -7))
+        self.assertEqual(rA.uint, MMIX.INTEGER_DIVIDE_CHECK)
+        mmix.general_purpose_registers[2].set_value(-2**63)
+        mmix.general_purpose_registers[3].set_value(-1)
+        mmix.__DIV__(Byte(1), Byte(2), Byte(3), is_direct=False)
+        self.assertEqual((mmix.general_purpose_registers[1].int, rR.int), (-2**63, 0))
+        self.assertEqual(rA.uint, MMIX.INTEGER_DIVIDE_CHECK | MMIX.INTEGER_OVERFLOW)
+
+    def test__DIVU__(self):
+        '''
+        Verify that DIVU divides the 128-bit number rD:$Y, and falls back to $X=rD, rR=$Y if rD isn't less than the divisor.
+        '''
+        mmix = MMIX()
+        rD = mmix.special_purpose_registers[mmix.__get_special_register_index_by_name__('rD')]
+        rR = mmix.special_purpose_registers[mmix.__get_special_register_index_by_name__('rR')]
+        rD.set_value(5)
+        mmix.general_purpose_registers[2].set_value(0x1234)
+        mmix.general_purpose_registers[3].set_value(2**64-1)
+        mmix.__DIVU__(Byte(1), Byte(2), Byte(3), is_direct=False)
+        quotient, remainder = divmod((5 << 64) | 0x1234, 2**64-1)
+        self.assertEqual((mmix.general_purpose_registers[1].uint, rR.uint), (quotient, remainder))
+        mmix.__DIVU__(Byte(1), Byte(2), Byte(5), is_direct=True)
+        self.assertEqual((mmix.general_purpose_registers[1].uint, rR.uint), (5, 0x1234))
+        rD.set_value(0)
+        mmix.__DIVU__(Byte(1), Byte(2), Byte(0x10), is_direct=True)
+        self.assertEqual((mmix.general_purpose_registers[1].uint, rR.uint), (0x123, 4))
+        mmix.__DIVU__(Byte(1), Byte(2), Byte(0), is_direct=True)
+        self.assertEqual((mmix.general_purpose_registers[1].uint, rR.uint), (0, 0x1234))
+
+    def test__MOR__and__MXOR__(self):
+        '''
+        Verify MOR and MXOR against the well known byte reversal and identity matrices, and a byte by byte reference.
+        '''
+        mmix = MMIX()
+        mmix.general_purpose_registers[2].set_value(0x0102030405060708)
+        mmix.general_purpose_registers[3].set_value(0x0102040810204080)
+        mmix.__MOR__(Byte(1), Byte(2), Byte(3), is_direct=False)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 0x0807060504030201)
+        mmix.general_purpose_registers[3].set_value(0x8040201008040201)
+        mmix.__MXOR__(Byte(1), Byte(2), Byte(3), is_direct=False)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 0x0102030405060708)
+        # Z=3 selects bytes 0 and 1 of $Y into the least significant byte of $X
+        mmix.__MOR__(Byte(1), Byte(2), Byte(3), is_direct=True)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 0x07 | 0x08)
+        mmix.__MXOR__(Byte(1), Byte(2), Byte(3), is_direct=True)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 0x07 ^ 0x08)
+        for i in range(20):
+            y, z = randint(0, 2**64-1), randint(0, 2**64-1)
+            mmix.general_purpose_registers[2].set_value(y)
+            mmix.general_purpose_registers[3].set_value(z)
+            mmix.__MOR__(Byte(1), Byte(2), Byte(3), is_direct=False)
+            mmix.__MXOR__(Byte(4), Byte(2), Byte(3), is_direct=False)
+            expected_or, expected_xor = 0, 0
+            for j in range(8):
+                byte_or, byte_xor = 0, 0
+                for k in range(8):
+                    if (z >> (8 * j + k)) & 1:
+                        byte_or |= (y >> (8 * k)) & 0xff
+                        byte_xor ^= (y >> (8 * k)) & 0xff
+                expected_or |= byte_or << (8 * j)
+                expected_xor |= byte_xor << (8 * j)
+            self.assertEqual(mmix.general_purpose_registers[1].uint, expected_or)
+            self.assertEqual(mmix.general_purpose_registers[4].uint, expected_xor)
+
+    def test__SADD__(self):
+        '''
+        Verify that SADD counts the bits set in $Y and cleared in $Z or Z.
+        '''
+        mmix = MMIX()
+        for i in range(20):
+            y, z = randint(0, 2**64-1), randint(0, 2**64-1)
+            mmix.general_purpose_registers[2].set_value(y)
+            mmix.general_purpose_registers[3].set_value(z)
+            mmix.__SADD__(Byte(1), Byte(2), Byte(3), is_direct=False)
+            self.assertEqual(mmix.general_purpose_registers[1].uint, bin(y & ~z & (2**64-1)).count('1'))
+            mmix.__SADD__(Byte(1), Byte(2), Byte(0xff), is_direct=True)
+            self.assertEqual(mmix.general_purpose_registers[1].uint, bin(y & ~0xff & (2**64-1)).count('1'))
+
+    def test__xDIF__(self):
+        '''
+        Verify that BDIF, WDIF, TDIF and ODIF compute saturating differences of each piece.
+        '''
+        mmix = MMIX()
+        handlers = ((mmix.__BDIF__, 8), (mmix.__WDIF__, 16), (mmix.__TDIF__, 32), (mmix.__ODIF__, 64))
+        for i in range(20):
+            y, z = randint(0, 2**64-1), randint(0, 2**64-1)
+            mmix.general_purpose_registers[2].set_value(y)
+            mmix.general_purpose_registers[3].set_value(z)
+            for handler, bits in handlers:
+                handler(Byte(1), Byte(2), Byte(3), is_direct=False)
+                expected = 0
+                for shift in range(0, 64, bits):
+                    expected |= max(0, ((y >> shift) & (2**bits-1)) - ((z >> shift) & (2**bits-1))) << shift
+                self.assertEqual(mmix.general_purpose_registers[1].uint, expected)
+        mmix.general_purpose_registers[2].set_value(0x0000000000000110)
+        mmix.__BDIF__(Byte(1), Byte(2), Byte(0x20), is_direct=True)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 0x0000000000000100)
+        mmix.__WDIF__(Byte(1), Byte(2), Byte(0x20), is_direct=True)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 0x00000000000000f0)
+
+    def testDispatchTable(self):
+        '''
+        Verify that the register and the immediate form of an instruction have their own handlers, and that a fork gets its own table.
+        '''
+        mmix = MMIX()
+        table = mmix.dispatch_table
+        self.assertEqual(len(table), 256)
+        for opcode in (0x20, 0x8c, 0xa0, 0xe8):
+            self.assertIsNot(table[opcode], table[opcode + 1])
+            self.assertNotIsInstance(table[opcode], functools.partial)
+            self.assertNotIsInstance(table[opcode + 1], functools.partial)
+        self.assertIs(table[0x96], table[0x8e])  # LDUNC is LDOU
+        self.assertIsInstance(table[0x04], functools.partial)
+        self.assertEqual(table[0x04].func, mmix.__unimplemented__)
+        other = mmix.fork()
+        self.assertIsNot(other.dispatch_table, table)
+        other.general_purpose_registers[2].set_value(5)
+        other.dispatch_table[0x21](1, 2, 3)  # ADD $1,$2,3
+        self.assertEqual(other.general_purpose_registers[1].uint, 8)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 0)
+
+    def testRun(self):
+        '''
+        Verify that run executes a program from @ until it halts, or for a limited number of instructions.
+        '''
+        mmix = MMIX()
+        load_program(mmix, SUM_PROGRAM)
+        self.assertEqual(mmix.run(4), 4)
+        self.assertEqual(mmix.pc, 0x110)
+        self.assertEqual(mmix.run(), 32)
+        self.assertTrue(mmix.halted)
+        self.assertEqual(mmix.general_purpose_registers[2].uint, 55)
+        self.assertEqual(mmix.general_purpose_registers[4].uint, 55)
+        self.assertEqual(mmix.memory.read_u64(0x2000000000000008), 55)
+        self.assertEqual(mmix.pc, 0x124)
+        self.assertEqual(mmix.run(), 0)
+
+    def testStep(self):
+        '''
+        Verify single instructions of step: register and immediate forms, jumps, conditional sets, loads and stores,
+        arithmetic events and unimplemented OP codes.
+        '''
+        mmix = MMIX()
+        gpr = mmix.general_purpose_registers
+        rA = mmix.special_purpose_registers[21]
+        def execute(instruction, address=0x1000):
+            mmix.memory.write_u32(address, instruction)
+            mmix.pc = address
+            mmix.step()
+        gpr[1].set_value(2**63 - 1)
+        gpr[2].set_value(3)
+        execute(0x20030102)     # ADD $3,$1,$2
+        self.assertEqual(gpr[3].uint, 2**63 + 2)
+        self.assertEqual(rA.uint, MMIX.INTEGER_OVERFLOW)
+        execute(0x23030102)     # ADDU $3,$1,2
+        self.assertEqual(gpr[3].uint, 2**63 + 1)
+        execute(0x34030502)     # NEG $3,5,$2
+        self.assertEqual(gpr[3].uint, 2)
+        execute(0x390301ff)     # SL $3,$1,255
+        self.assertEqual(gpr[3].uint, 0)
+        gpr[4].set_value(-16)
+        execute(0x3c030402)     # SR $3,$4,$2
+        self.assertEqual(gpr[3].uint, 2**64 - 2)
+        execute(0x6b050203)     # CSOD $5,$2,3
+        self.assertEqual(gpr[5].uint, 3)
+        execute(0x7e050203)     # ZSEV $5,$2,$3
+        self.assertEqual(gpr[5].uint, 0)
+        execute(0xe6060102)     # INCML $6,#0102
+        execute(0xe6060102)
+        self.assertEqual(gpr[6].uint, 0x0204 << 16)
+        execute(0xf0000003)     # JMP @+12
+        self.assertEqual(mmix.pc, 0x100c)
+        execute(0xf1ffffff)     # JMPB @-4
+        self.assertEqual(mmix.pc, 0xffc)
+        execute(0xf5070000)     # GETAB $7,@-#40000
+        self.assertEqual(gpr[7].uint, 0x1000 - 0x40000 + 2**64)
+        execute(0x9f070207)     # GO $7,$2,7
+        self.assertEqual((mmix.pc, gpr[7].uint), (8, 0x1004))
+        gpr[8].set_value(0x2000000000000000)
+        gpr[9].set_value(-2)
+        execute(0xa1090801)     # STB $9,$8,1
+        execute(0xa5090802)     # STW $9,$8,2, stored in the wyde at 2 as A is rounded down
+        execute(0x81090801)     # LDB $9,$8,1
+        self.assertEqual(gpr[9].uint, 2**64 - 2)
+        execute(0x97090800)     # LDUNC $9,$8,0
+        self.assertEqual(gpr[9].uint, 0x00fefffe00000000)
+        rA.set_value(0)
+        gpr[9].set_value(0x80)
+        execute(0xa1090800)     # STB $9,$8,0 overflows
+        self.assertEqual(rA.uint, MMIX.INTEGER_OVERFLOW)
+        execute(0xf7150000)     # PUT rA,0
+        execute(0xfe0a0015)     # GET $10,rA
+        self.assertEqual(gpr[10].uint, 0)
+        self.assertRaises(MmixException, execute, 0xfe0a0020)   # GET $10,32
+        self.assertRaises(MmixException, execute, 0x04010203)   # FADD
+        self.assertRaises(MmixException, execute, 0x00000100)   # TRAP 0,Fopen,0
+        self.assertFalse(mmix.halted)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
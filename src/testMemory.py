@@ -8,7 +8,11 @@ from Byte import Byte
 from Wyde import Wyde
 from Octa import Octa
 from Tetra import Tetra
+from Utilities import MmixException
 from random import randint
+import io
+import os
+import tempfile
 
 class TestMemory(unittest.TestCase):
     '''
@@ -88,6 +92,119 @@ class TestMemory(unittest.TestCase):
             memory.set(address, v)
             self.assertEqual(memory.read(address, Octa), v)
 
+    def testPages(self):
+        '''
+        Verify that only written pages are allocated, and that accesses crossing pages or the end of the address space work.
+        '''
+        memory = Memory(page_size=16)
+        self.assertEqual(memory.read(Octa(0x1234), Octa), Octa(0))
+        self.assertEqual(len(memory.pages), 0)
+        memory.set(Octa(0x1c), Octa(0x0102030405060708))
+        self.assertEqual(sorted(memory.pages.keys()), [1, 2])
+        self.assertEqual(memory.read(Octa(0x1c), Octa), Octa(0x0102030405060708))
+        self.assertEqual(memory.read(Octa(0x1e), Wyde), Wyde(0x0304))
+        self.assertEqual(memory.read_bytes(0x1a, 12), bytes([0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 0, 0]))
+        memory.set(Octa(2**64-4), Octa(0x1122334455667788))
+        self.assertEqual(memory.read(Octa(2**64-4), Octa), Octa(0x1122334455667788))
+        self.assertEqual(memory.read(Octa(0), Tetra), Tetra(0x55667788))
+        memory.write_bytes(0x100, bytes(range(40)))
+        self.assertEqual(memory.read_bytes(0x100, 40), bytes(range(40)))
+        self.assertRaises(Exception, Memory, 12)
+        self.assertRaises(Exception, Memory, 4)
+
+    def testRawAccessors(self):
+        '''
+        Verify that the int accessors read and write the same bytes as read and set, in and across pages.
+        '''
+        memory = Memory(page_size=16)
+        for address in (0x20, 0x2e, 2**64-2):
+            memory.write_u64(address, 0x8182838485868788)
+            self.assertEqual(memory.read(Octa(address), Octa), Octa(0x8182838485868788))
+            self.assertEqual(memory.read_u64(address), 0x8182838485868788)
+            self.assertEqual(memory.read_s64(address), 0x8182838485868788 - 2**64)
+            self.assertEqual(memory.read_u32(address), 0x81828384)
+            self.assertEqual(memory.read_s32(address), 0x81828384 - 2**32)
+            self.assertEqual(memory.read_u16(address), 0x8182)
+            self.assertEqual(memory.read_s16(address), 0x8182 - 2**16)
+            self.assertEqual(memory.read_u8(address), 0x81)
+            self.assertEqual(memory.read_s8(address), 0x81 - 2**8)
+            memory.write_u32(address, -2)
+            memory.write_u16((address + 4) % 2**64, 0x1234)
+            memory.write_u8((address + 6) % 2**64, 0x56)
+            self.assertEqual(memory.read(Octa(address), Octa), Octa(0xfffffffe12345688))
+        self.assertEqual(memory.read_u64(0x1000), 0)
+        self.assertEqual(memory.read_s8(0x1000), 0)
+
+    def testMapFile(self):
+        '''
+        Verify that mapped files are read in place, refuse writes when read-only, and are copied per page on write.
+        '''
+        content = bytes(range(256)) * 4 + bytes([0xaa, 0xbb, 0xcc])
+        handle, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'wb') as host_file:
+            host_file.write(content)
+        memory = Memory(page_size=256)
+        memory.set(Octa(0x10), Octa(0x1122334455667788))
+        memory.map_file(0x2000000000000000, path)
+        mapping = memory.map_file(0x3000000000000000, path, copy_on_write=True)
+        self.assertEqual(mapping.end - mapping.start, len(content))
+        self.assertEqual(len(memory.pages), 1)
+        base = 0x2000000000000000
+        self.assertEqual(memory.read_u64(base), 0x0001020304050607)
+        self.assertEqual(memory.read(Octa(base + 0xfe), Wyde), Wyde(0xfeff))
+        self.assertEqual(memory.read_u32(base + 0x3fe), 0xfeffaabb)
+        self.assertEqual(memory.read_u32(base + 0x401), 0xbbcc0000)
+        self.assertEqual(memory.read_s8(base + 0x400), 0xaa - 2**8)
+        self.assertEqual(memory.read_u64(base + 0x1000), 0)
+        self.assertEqual(memory.read_bytes(base + 0x3fc, 8), content[-7:] + bytes(1))
+        self.assertEqual(memory.read(Octa(0x10), Octa), Octa(0x1122334455667788))
+        self.assertRaises(MmixException, memory.write_u8, base + 0x10, 0)
+        self.assertRaises(MmixException, memory.write_bytes, base + 0xf0, bytes(32))
+        base = 0x3000000000000000
+        memory.write_u16(base + 0x102, 0xbeef)
+        self.assertEqual(memory.read_u64(base + 0x100), 0x0001beef04050607)
+        self.assertEqual(memory.read_u64(base + 0x200), 0x0001020304050607)
+        self.assertEqual(len(memory.pages), 2)
+        with open(path, 'rb') as host_file:
+            self.assertEqual(host_file.read(), content)
+        self.assertRaises(MmixException, memory.map_file, base + 0x300, path)
+        self.assertRaises(MmixException, memory.map_file, 0x80, path)
+        self.assertRaises(MmixException, memory.map_file, 0x0, path)
+        memory.unmap_file(base)
+        self.assertEqual(memory.read_u64(base + 0x100), 0x0001beef04050607)
+        self.assertEqual(memory.read_u64(base + 0x200), 0)
+        self.assertRaises(MmixException, memory.unmap_file, base)
+        memory.unmap_file(0x2000000000000000)
+        self.assertEqual(memory.mappings, [])
+
+    def testForkAndSnapshot(self):
+        '''
+        Verify that forks and snapshots share pages until written, and never see each other's writes.
+        '''
+        memory = Memory(page_size=16)
+        memory.write_u64(0x10, 0x1111111111111111)
+        memory.write_u64(0x20, 0x2222222222222222)
+        snapshot = memory.snapshot()
+        child = memory.fork()
+        self.assertIs(child.pages[1], memory.pages[1])
+        child.write_u8(0x10, 0xcc)
+        memory.write_u8(0x20, 0xaa)
+        memory.write_u8(0x21, 0xab)
+        self.assertEqual(memory.read_u64(0x10), 0x1111111111111111)
+        self.assertEqual(memory.read_u64(0x20), 0xaaab222222222222)
+        self.assertEqual(child.read_u64(0x10), 0xcc11111111111111)
+        self.assertEqual(child.read_u64(0x20), 0x2222222222222222)
+        self.assertEqual(snapshot.read_u64(0x10), 0x1111111111111111)
+        self.assertEqual(snapshot.read_u64(0x20), 0x2222222222222222)
+        self.assertIs(child.pages[2], snapshot.pages[2])
+        self.assertRaises(MmixException, snapshot.write_u8, 0x30, 0)
+        self.assertRaises(MmixException, snapshot.set, Octa(0x10), Byte(1))
+        grandchild = snapshot.fork()
+        grandchild.write_bytes(0x18, bytes(range(16)))
+        self.assertEqual(grandchild.read_bytes(0x10, 24), bytes([0x11] * 8) + bytes(range(16)))
+        self.assertEqual(snapshot.read_bytes(0x18, 16), bytes(8) + bytes([0x22] * 8))
+
     def test_to_str(self):
         '''
         Verify
@@ -147,5 +264,172 @@ class TestMemory(unittest.TestCase):
         # print(result.__repr__())
         self.assertEqual(memory.to_str(Octa), result)
 
+    def testDump(self):
+        '''
+        Verify dumps of empty memory, of an address range, of the end of the address space, and to a file.
+        '''
+        memory = Memory(page_size=16)
+        self.assertEqual(memory.to_str(Octa), '...\n')
+        self.assertEqual(list(memory.dump(Byte, 0x10, 0x10)), [])
+        memory.write_u64(0x18, 0x0102)
+        memory.write_u32(0x24, 0x03040506)
+        memory.write_u16(2**64 - 2, 0x0708)
+        self.assertEqual(list(memory.dump(Wyde, 0x1e, 0x26)), [
+            '0x000000000000001e:\t0x0102\n',
+            '...\n',
+            '0x0000000000000024:\t0x0304\n',
+            ])
+        self.assertEqual(list(memory.dump(Tetra, 0x1c, 0x23)), [
+            '0x000000000000001c:\t0x00000102\n',
+            '...\n',
+            ])
+        self.assertEqual(list(memory.dump(Octa, 2**64 - 16)), ['...\n', '0xfffffffffffffff8:\t0x0000000000000708\n'])
+        self.assertEqual(list(memory.dump(Byte, 2**64 - 1)), ['0xffffffffffffffff:\t0x08\n'])
+        file = io.StringIO()
+        memory.write_dump(file, Tetra)
+        self.assertEqual(file.getvalue(), memory.to_str(Tetra))
+        self.assertEqual(file.getvalue(), '''...
+0x000000000000001c:\t0x00000102
+...
+0x0000000000000024:\t0x03040506
+...
+0xfffffffffffffffc:\t0x00000708
+''')
+
+    def testPageIndex(self):
+        '''
+        Verify the queries of populated memory in address order, with pages and file mappings.
+        '''
+        memory = Memory(page_size=16)
+        self.assertEqual(list(memory.populated_regions()), [])
+        self.assertIsNone(memory.first_after(0))
+        for address in (0x50, 0x10, 0x20, 0x1000, 0x2f):
+            memory.write_u8(address, address & 0xff)
+        self.assertEqual(memory.page_index, [1, 2, 5, 0x100])
+        self.assertEqual(list(memory.populated_regions()), [(0x10, 0x30), (0x50, 0x60), (0x1000, 0x1010)])
+        self.assertEqual(memory.first_after(0), 0x10)
+        self.assertEqual(memory.first_after(0x2a), 0x2a)
+        self.assertEqual(memory.first_after(0x30), 0x50)
+        self.assertIsNone(memory.first_after(0x1010))
+        self.assertEqual(
+            [(address, bytes(data)) for address, data in memory.iter_range(0x1f, 0x58)],
+            [(0x1f, bytes(1)), (0x20, bytes([0x20]) + bytes(14) + bytes([0x2f])), (0x50, bytes([0x50]) + bytes(7))]
+            )
+        self.assertEqual(list(memory.iter_range(0x30, 0x50)), [])
+        handle, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'wb') as host_file:
+            host_file.write(bytes(range(1, 41)))
+        memory.map_file(0x30, path, length=0x20)
+        memory.map_file(0x800, path)
+        self.assertEqual(
+            list(memory.populated_regions()), [(0x10, 0x60), (0x800, 0x830), (0x1000, 0x1010)]
+            )
+        self.assertEqual(memory.first_after(0x60), 0x800)
+        self.assertEqual([address for address, data in memory.iter_range(0x20, 0x810)], [0x20, 0x30, 0x40, 0x50, 0x800])
+        self.assertEqual(bytes(list(memory.iter_range(0x820, 0x900))[0][1]), bytes(range(33, 41)) + bytes(8))
+        self.assertEqual(memory.fork().page_index, memory.page_index)
+
+    def testSegments(self):
+        '''
+        Verify that pages go to the page table of their segment, and the footprint of each segment.
+        '''
+        memory = Memory(page_size=16)
+        self.assertEqual([segment.name for segment in memory.segments], ['text', 'data', 'pool', 'stack', 'kernel'])
+        memory.write_u64(0x100, 1)
+        memory.write_u64(0x2000000000000000, 2)
+        memory.write_u64(0x3ffffffffffffff8, 3)
+        memory.write_u64(0x6000000000000108, 4)
+        memory.write_u64(0xfffffffffffffffc, 5)
+        memory.write_u64(0x8000000000000000, 6)
+        self.assertEqual(sorted(memory.segments[0].pages.keys()), [0, 0x10])   # the last octa wraps around to page 0
+        self.assertEqual(len(memory.segments[1].pages), 2)
+        self.assertEqual(len(memory.segments[2].pages), 0)
+        self.assertEqual(len(memory.segments[4].pages), 2)
+        self.assertEqual(memory.read_u64(0x3ffffffffffffff8), 3)
+        self.assertEqual(memory.read_u32(0), 5)
+        self.assertEqual(len(memory.pages), 7)
+        footprint = memory.footprint()
+        self.assertEqual(footprint['text'], {'pages': 2, 'bytes': 32, 'mapped': 0, 'extent': 0x110})
+        self.assertEqual(footprint['data']['extent'], 0x2000000000000000)
+        self.assertEqual(footprint['pool'], {'pages': 0, 'bytes': 0, 'mapped': 0, 'extent': 0})
+        self.assertEqual(footprint['stack']['extent'], 0x110)
+        handle, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'wb') as host_file:
+            host_file.write(bytes(100))
+        memory.map_file(0x5fffffffffffffe0, path)
+        footprint = memory.footprint()
+        self.assertEqual((footprint['pool']['mapped'], footprint['stack']['mapped']), (32, 68))
+        self.assertEqual(memory.fork().footprint(), footprint)
+
+    def testCheckpoints(self):
+        '''
+        Verify dirty page tracking, and that a full checkpoint with incremental ones restores the last state.
+        '''
+        memory = Memory(page_size=16)
+        memory.write_u64(0x10, 1)
+        memory.write_u64(0x20, 2)
+        memory.write_u64(0x1000, 3)
+        self.assertEqual(memory.dirty_pages, {1, 2, 0x100})
+        base = io.BytesIO()
+        self.assertEqual(memory.checkpoint(base, full=True), 3)
+        self.assertEqual(memory.dirty_pages, set())
+        page = memory.pages[2]
+        memory.write_u8(0x20, 0xff)
+        self.assertIs(memory.pages[2], page)   # private page isn't copied again
+        memory.write_u64(0x30, 4)
+        self.assertEqual(memory.dirty_pages, {2, 3})
+        delta1 = io.BytesIO()
+        self.assertEqual(memory.checkpoint(delta1), 2)
+        snapshot = memory.snapshot()
+        memory.write_u64(0x1000, 5)
+        self.assertEqual(memory.dirty_pages, {0x100})
+        self.assertEqual(snapshot.read_u64(0x1000), 3)
+        delta2 = io.BytesIO()
+        self.assertEqual(memory.checkpoint(delta2), 1)
+        self.assertEqual(len(delta2.getvalue()), 21 + 8 + 16)
+        for file in (base, delta1, delta2):
+            file.seek(0)
+        restored = Memory.restore([base, delta1, delta2])
+        self.assertEqual(restored.page_index, memory.page_index)
+        self.assertEqual(restored.read_bytes(0, 0x40), memory.read_bytes(0, 0x40))
+        self.assertEqual(restored.read_u64(0x1000), 5)
+        self.assertEqual(restored.dirty_pages, set())
+        restored.write_u8(0x10, 0)
+        self.assertEqual(restored.dirty_pages, {1})
+        for file in (base, delta1):
+            file.seek(0)
+        self.assertEqual(Memory.restore([base, delta1]).read_u64(0x1000), 3)
+        for file in (base, delta1):
+            file.seek(0)
+        self.assertEqual(Memory.restore(file for file in (base, delta1)).read_u64(0x1000), 3)
+        delta1.seek(0)
+        self.assertRaises(MmixException, Memory.restore, [delta1])
+        self.assertRaises(MmixException, Memory.restore, [])
+        self.assertRaises(MmixException, Memory.restore, [b'not a file'])
+
+    def testWatchPage(self):
+        '''
+        Verify that the first write to a watched page, allocated or not, is reported once, and only to this memory.
+        '''
+        memory = Memory(page_size=16)
+        written = list()
+        memory.write_watchers.append(written.append)
+        memory.write_u64(0x10, 1)
+        memory.watch_page(1)
+        memory.watch_page(3)
+        page = memory.pages[1]
+        memory.write_u8(0x18, 2)
+        memory.write_u8(0x19, 3)
+        self.assertEqual(written, [1])
+        self.assertIs(memory.pages[1], page)   # the page stays private
+        fork = memory.fork()
+        fork.write_u8(0x30, 4)
+        self.assertEqual((written, fork.write_watchers), ([1], []))
+        memory.write_bytes(0x2c, bytes(8))
+        self.assertEqual(written, [1, 3])
+        self.assertEqual(memory.watched_pages, set())
+
 if __name__ == '__main__':
     unittest.main()
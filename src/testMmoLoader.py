@@ -0,0 +1,151 @@
+#pylint: disable=C0103
+'''
+Unit test for MmoLoader class.
+'''
+import io
+import unittest
+from Memory import Memory
+from MmoLoader import MmoLoader
+from MMIX import MMIX
+from Utilities import MmixException
+
+def lop(lopcode, Y=0, Z=0):
+    '''
+    Encode one lopcode tetra.
+    '''
+    return bytes([MmoLoader.MM, lopcode, Y, Z])
+
+def tetra(value):
+    '''
+    Encode one tetra.
+    '''
+    return value.to_bytes(4, 'big')
+
+def postamble(G=254, values=(0, 0x100), symbols=2):
+    '''
+    Encode lop_post with the values of $G..$255, an empty-looking symbol table of symbols tetras and lop_end.
+    '''
+    result = lop(MmoLoader.LOP_POST, 0, G)
+    for value in values:
+        result += value.to_bytes(8, 'big')
+    return result + lop(MmoLoader.LOP_STAB) + bytes(4 * symbols) + lop(MmoLoader.LOP_END, 0, symbols)
+
+PREAMBLE = lop(MmoLoader.LOP_PRE, 1, 1) + tetra(0x12345678)
+
+class TestMmoLoader(unittest.TestCase):
+    '''
+    Unit test suite for MmoLoader class.
+    '''
+    @classmethod
+    def setUpClass(cls):
+        print("\nStart testing %s" % __name__)
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\nFinish testing %s" % __name__)
+
+    def load(self, body, memory=None, **kwargs):
+        '''
+        Load PREAMBLE + body + postamble(**kwargs) into memory.
+        '''
+        loader = MmoLoader(memory or Memory())
+        loader.load(io.BytesIO(PREAMBLE + body + postamble(**kwargs)))
+        return loader
+
+    def testData(self):
+        '''
+        Verify lop_loc, lop_skip and lop_quote, and that data runs land in memory as they are.
+        '''
+        data = bytes(range(0x10, 0x10 + 64))
+        body = (
+            lop(MmoLoader.LOP_LOC, 0x20, 1) + tetra(0x100) + data +
+            lop(MmoLoader.LOP_QUOTE, 0, 1) + lop(MmoLoader.LOP_END, 1, 2) +
+            lop(MmoLoader.LOP_SKIP, 0, 0x10) + tetra(0x01020304) +
+            lop(MmoLoader.LOP_LOC, 0, 2) + tetra(1) + tetra(0x6) + tetra(0xa1a2a3a4) +
+            tetra(0x000098ff)
+            )
+        loader = self.load(body)
+        memory = loader.memory
+        base = 0x2000000000000100
+        self.assertEqual(memory.read_bytes(base, 64), data)
+        self.assertEqual(memory.read_u32(base + 64), 0x980c0102)
+        self.assertEqual(memory.read_u32(base + 84), 0x01020304)
+        self.assertEqual(memory.read_u64(0x100000004), 0xa1a2a3a4000098ff)
+        self.assertEqual(loader.G, 254)
+        self.assertEqual(loader.global_registers, [0, 0x100])
+
+    def testChunks(self):
+        '''
+        Verify that data and lopcodes crossing the chunks the file is read in are handled.
+        '''
+        data = bytes(i & 0x7f for i in range(3 * MmoLoader.CHUNK_SIZE // 2))
+        head = MmoLoader.CHUNK_SIZE - len(PREAMBLE) - 16    # puts the address of the second lop_loc across chunks
+        body = (
+            lop(MmoLoader.LOP_LOC, 0, 1) + tetra(0) + data[:head] +
+            lop(MmoLoader.LOP_LOC, 0, 2) + tetra(0) + tetra(0x100000) + data[head:]
+            )
+        memory = self.load(body).memory
+        self.assertEqual(memory.read_bytes(0, head), data[:head])
+        self.assertEqual(memory.read_bytes(0x100000, len(data) - head), data[head:])
+
+    def testFixups(self):
+        '''
+        Verify lop_fixo, lop_fixr and lop_fixrx, which patch data already loaded.
+        '''
+        body = (
+            lop(MmoLoader.LOP_LOC, 0, 1) + tetra(0x200) + tetra(0) + tetra(0) + tetra(0x42000000) + tetra(0x43000000) +
+            lop(MmoLoader.LOP_LOC, 0x20, 1) + tetra(0x8) +
+            lop(MmoLoader.LOP_FIXO, 0, 1) + tetra(0x200) +
+            tetra(0x44000000) + tetra(0x45000000) +
+            lop(MmoLoader.LOP_FIXR, 0, 2) +
+            lop(MmoLoader.LOP_FIXRX, 0, 16) + tetra(0x0100fffe)
+            )
+        memory = self.load(body).memory
+        self.assertEqual(memory.read_u64(0x200), 0x2000000000000008)
+        self.assertEqual(memory.read_u32(0x2000000000000008), 0x44000002)
+        self.assertEqual(memory.read_u32(0x2000000000000018), 0x0100fffe)
+
+    def testFileLineAndSpec(self):
+        '''
+        Verify that lop_file and lop_line are recorded, and lop_spec data is skipped.
+        '''
+        body = (
+            lop(MmoLoader.LOP_FILE, 3, 2) + b'test.mms' + lop(MmoLoader.LOP_LOC, 0, 1) + tetra(0x40) +
+            lop(MmoLoader.LOP_LINE, 0x01, 0x02) + tetra(0xe3000001) +
+            lop(MmoLoader.LOP_SPEC, 0, 7) + tetra(0xffffffff) + lop(MmoLoader.LOP_QUOTE, 0, 1) + lop(MmoLoader.LOP_LOC) +
+            lop(MmoLoader.LOP_FILE, 3) + tetra(0xe3000002)
+            )
+        loader = self.load(body)
+        self.assertEqual(loader.file_names, {3: 'test.mms'})
+        self.assertEqual(loader.line_table, {0x40: (3, 0x102)})
+        self.assertEqual(loader.memory.read_u64(0x40), 0xe3000001e3000002)
+
+    def testErrors(self):
+        '''
+        Verify that malformed object files are rejected.
+        '''
+        loader = MmoLoader(Memory())
+        self.assertRaises(MmixException, loader.load, io.BytesIO(tetra(0) + postamble()))
+        self.assertRaises(MmixException, loader.load, io.BytesIO(PREAMBLE + tetra(0)))
+        self.assertRaises(MmixException, loader.load, io.BytesIO(PREAMBLE + lop(MmoLoader.LOP_LINE) + postamble()))
+        self.assertRaises(MmixException, loader.load, io.BytesIO(PREAMBLE + lop(MmoLoader.LOP_LOC, 0, 3) + postamble()))
+        self.assertRaises(MmixException, loader.load, io.BytesIO(PREAMBLE + postamble()[:-4]))
+        self.assertRaises(MmixException, loader.load, io.BytesIO(PREAMBLE + postamble() + bytes(4)))
+
+    def testMMIX(self):
+        '''
+        Verify that MMIX.load_object_file fills memory and the registers given by the postamble.
+        '''
+        mmix = MMIX()
+        mmix.load_object_file(io.BytesIO(
+            PREAMBLE + lop(MmoLoader.LOP_LOC, 0, 1) + tetra(0x100) + tetra(0x8d010203) +
+            postamble(G=253, values=(7, 0x2000000000000000, 0x100))
+            ))
+        self.assertEqual(mmix.memory.read_u32(0x100), 0x8d010203)
+        self.assertEqual(mmix.special_purpose_registers[19].uint, 253)
+        self.assertEqual(mmix.general_purpose_registers[253].uint, 7)
+        self.assertEqual(mmix.general_purpose_registers[254].uint, 0x2000000000000000)
+        self.assertEqual(mmix.general_purpose_registers[255].uint, 0x100)
+
+if __name__ == '__main__':
+    unittest.main()
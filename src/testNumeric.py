@@ -123,6 +123,39 @@ class TestNumeric(unittest.TestCase):
             self.assertEqual(x - y, klass(a - b))
             self.assertEqual(y - x, klass(b - a))
 
+    def testWrapAround(self):
+        '''
+        Verify that wrap-around arithmetic returns results modulo 2^length together with an overflow indicator.
+        '''
+        for klass in all_classes:
+            bits = size_in_bit[klass]
+            smallest, largest = klass(-2 ** (bits - 1)), klass(2 ** (bits - 1) - 1)
+            one, minus_one = klass(1), klass(-1)
+            self.assertEqual(largest.add(one), (smallest, True))
+            self.assertEqual(one.add(minus_one), (klass(0), False))
+            self.assertEqual(minus_one.add_unsigned(one), (klass(0), True))
+            self.assertEqual(largest.add_unsigned(one), (smallest, False))
+            self.assertEqual(smallest.sub(one), (largest, True))
+            self.assertEqual(one.sub(klass(2)), (minus_one, False))
+            self.assertEqual(klass(0).sub_unsigned(one), (minus_one, True))
+            self.assertEqual(smallest.neg(), (smallest, True))
+            self.assertEqual(one.neg(), (minus_one, False))
+            self.assertEqual(one.neg(minuend=3), (klass(2), False))
+            self.assertEqual(one.neg_unsigned(), (minus_one, True))
+            self.assertEqual(largest.mul(klass(2)), (klass(-2), True))
+            self.assertEqual(minus_one.mul(minus_one), (one, False))
+            self.assertEqual(minus_one.mul_unsigned(klass(2)), (klass(-2), True))
+            self.assertEqual(one.scaled_add_unsigned(klass(3), 16), (klass(19), False))
+            self.assertEqual(minus_one.scaled_add_unsigned(klass(0), 4), (klass(-4), True))
+            self.assertRaises(Exception, one.scaled_add_unsigned, one, 3)
+            self.assertEqual(klass(-7).div(klass(2)), (klass(-4), one, False))
+            self.assertEqual(klass(7).div(klass(-2)), (klass(-4), minus_one, False))
+            self.assertEqual(smallest.div(minus_one), (smallest, klass(0), True))
+            self.assertEqual(klass(7).div(klass(0)), (klass(0), klass(7), False))
+            self.assertEqual(minus_one.div_unsigned(klass(2)), (largest, one, False))
+            self.assertEqual(klass(7).div_unsigned(klass(0)), (klass(0), klass(7), False))
+        self.assertRaises(MmixException, Byte(1).add, Wyde(1))
+
     def testCompare(self):
         '''
         Verify that all numeric classes support comparison of whether they're equal.
@@ -136,6 +169,44 @@ class TestNumeric(unittest.TestCase):
             y = klass(b)
             self.assertEqual(x == y, False)
 
+    def testOrdering(self):
+        '''
+        Verify that numeric classes are ordered as unsigned integers, with signed and unsigned three-way comparison.
+        '''
+        for klass in all_classes:
+            one, minus_one = klass(1), klass(-1)
+            self.assertTrue(one < minus_one)
+            self.assertTrue(one <= minus_one and one <= klass(1))
+            self.assertTrue(minus_one > one)
+            self.assertTrue(minus_one >= one and minus_one >= klass(-1))
+            self.assertFalse(one < klass(1))
+            self.assertEqual(one.cmp(minus_one), 1)
+            self.assertEqual(one.cmpu(minus_one), -1)
+            self.assertEqual(minus_one.cmp(klass(-1)), 0)
+            self.assertEqual(sorted([minus_one, klass(0), one]), [klass(0), one, minus_one])
+            self.assertRaises(MmixException, one.cmp, Byte(1) if klass is not Byte else Wyde(1))
+        self.assertRaises(MmixException, lambda: Byte(1) < Wyde(2))
+        self.assertRaises(TypeError, lambda: Byte(1) < 2)
+        self.assertRaises(TypeError, lambda: 'a' >= Octa(2))
+        self.assertNotEqual(Byte(1), Wyde(1))
+        self.assertNotEqual(Octa(1), 1)
+
+    def testHashAndIndex(self):
+        '''
+        Verify that frozen numeric values are usable as dict keys, and numeric values as integers.
+        '''
+        for klass in all_classes:
+            self.assertRaises(TypeError, hash, klass(1))
+            table = {klass(1).freeze(): 'one', klass.interned(2): 'two'}
+            self.assertEqual(table[klass.interned(1)], 'one')
+            self.assertEqual(table[klass(2).freeze()], 'two')
+            self.assertNotIn(klass(3).freeze(), table)
+            self.assertEqual(hash(klass(-1).freeze()), hash(klass(-1).freeze()))
+            self.assertEqual(int(klass(-1)), 2**size_in_bit[klass]-1)
+            self.assertEqual([10, 11, 12][klass(2)], 12)
+            self.assertEqual(hex(klass(0x12)), '0x12')
+        self.assertNotIn(Wyde(1).freeze(), {Byte(1).freeze(): 'one'})
+
     def testSetValue(self):
         '''
         Verify that all numeric classes support updating its object value.
@@ -212,6 +283,97 @@ class TestNumeric(unittest.TestCase):
         self.assertEqual(Wyde(0x1234).update(1, Byte(0x12)), Wyde(0x1212))
         self.assertEqual(Tetra(0x12345678).update(1, Wyde(0x0987)), Tetra(0x12098778))
 
+    def testViews(self):
+        '''
+        Verify that int, bin and hex views follow the value through in-place changes.
+        '''
+        for klass in all_classes:
+            x = klass(-1)
+            self.assertEqual(x.uint, 2**size_in_bit[klass]-1)
+            self.assertEqual(x.int, -1)
+            x.set_byte(0, Byte(0x7f))
+            reference = BitArray(uint=x.uint, length=size_in_bit[klass])
+            self.assertEqual(x.int, reference.int)
+            self.assertEqual(x.bin, reference.bin)
+            self.assertEqual(x.hex, reference.hex)
+            x.update(klass.SIZE_IN_BYTE - 1, Byte(0x12))
+            self.assertEqual(x.hex, reference.hex[:-2] + '12')
+            x.set_value(klass(5))
+            self.assertEqual((x.int, x.uint, x.length), (5, 5, size_in_bit[klass]))
+
+    def testSlots(self):
+        '''
+        Verify that numeric instances don't carry a per-instance __dict__.
+        '''
+        for klass in all_classes:
+            obj = klass(1)
+            self.assertFalse(hasattr(obj, '__dict__'))
+            self.assertRaises(AttributeError, setattr, obj, 'foo', 1)
+
+    def testBytesCodec(self):
+        '''
+        Verify that values can be converted from and to big-endian bytes, one by one or in batches.
+        '''
+        for klass in all_classes:
+            values = [klass(randint(0, 2**size_in_bit[klass]-1)) for i in range(20)]
+            data = b''.join(value.to_bytes() for value in values)
+            self.assertEqual(len(data), 20 * klass.SIZE_IN_BYTE)
+            self.assertEqual(klass.encode_many(values), data)
+            self.assertEqual(klass.encode_many(value for value in values), data)
+            self.assertEqual(klass.encode_many([value.uint for value in values]), data)
+            self.assertRaises(MmixException, klass.encode_many, [2**size_in_bit[klass]])
+            self.assertRaises(MmixException, klass.encode_many, [-1])
+            self.assertRaises(MmixException, klass.encode_many, [1.0])
+            self.assertRaises(MmixException, klass.encode_many, [Byte(1) if klass is not Byte else Wyde(1)])
+            self.assertEqual(klass.decode_many(data), values)
+            self.assertEqual(klass.decode_many(memoryview(data), 3, offset=klass.SIZE_IN_BYTE), values[1:4])
+            self.assertEqual(klass.decode_many(bytearray(data), 0), [])
+            self.assertRaises(MmixException, klass.decode_many, data, 21)
+            self.assertRaises(MmixException, klass.decode_many, data, 20, 1)
+            for i, value in enumerate(values):
+                self.assertEqual(klass.from_bytes(data[i * klass.SIZE_IN_BYTE:(i + 1) * klass.SIZE_IN_BYTE]), value)
+            self.assertRaises(MmixException, klass.from_bytes, data[:klass.SIZE_IN_BYTE + 1])
+        self.assertEqual(Octa(0x0102030405060708).to_bytes(), bytes([1, 2, 3, 4, 5, 6, 7, 8]))
+        self.assertEqual(Wyde.from_bytes(b'\x12\x34'), Wyde(0x1234))
+
+    def testFrozen(self):
+        '''
+        Verify that frozen instances can't be changed, and copies of them can.
+        '''
+        for klass in all_classes:
+            x = klass(0x12).freeze()
+            self.assertTrue(x.is_frozen)
+            self.assertRaises(MmixException, x.set_value, 0x34)
+            self.assertRaises(MmixException, x.set_byte, 0, Byte(0x34))
+            self.assertRaises(MmixException, x.update, 0, Byte(0x34))
+            self.assertEqual(x, klass(0x12))
+            y = klass(x)
+            self.assertFalse(y.is_frozen)
+            y.set_value(0x34)
+            self.assertEqual(y, klass(0x34))
+            self.assertFalse((x << 1).is_frozen)
+
+    def testInterned(self):
+        '''
+        Verify that interned values are frozen, and shared when the class is pooled.
+        '''
+        for value in (0, 0x7f, 0xff, -1):
+            self.assertIs(Byte.interned(value), Byte.interned(Byte(value)))
+            self.assertTrue(Byte.interned(value).is_frozen)
+            self.assertEqual(Byte.interned(value), Byte(value))
+        self.assertRaises(MmixException, Byte.interned, 0x100)
+        self.assertIsNot(Octa.interned(5), Octa.interned(5))
+        self.assertEqual(Octa.interned(5), Octa(5))
+        self.assertTrue(Octa.interned(5).is_frozen)
+        self.assertRaises(MmixException, Tetra.enable_pool)
+        if '_pool' in Wyde.__dict__:
+            self.addCleanup(setattr, Wyde, '_pool', Wyde.__dict__['_pool'])
+        else:
+            self.addCleanup(delattr, Wyde, '_pool')
+        Wyde.enable_pool()
+        self.assertIs(Wyde.interned(0x1234), Wyde.interned(0x1234))
+        self.assertIsNot(Byte.interned(0x12), Wyde.interned(0x12))
+
 class TestRange(unittest.TestCase):
 
     @classmethod
@@ -237,6 +399,44 @@ class TestRange(unittest.TestCase):
             for obj in Range(klass, 0, 10, 1):
                 self.assertEqual(obj, klass(count))
                 count += 1
+            self.assertEqual(count, 10)
+
+    def testSequence(self):
+        '''
+        Verify that Range supports len, indexing, slicing, reversal, membership and repeated iteration.
+        '''
+        for klass in all_classes:
+            numbers = Range(klass, 1, 20, 3)
+            self.assertEqual(len(numbers), 7)
+            self.assertEqual(list(numbers), [klass(i) for i in range(1, 20, 3)])
+            self.assertEqual(list(numbers), [klass(i) for i in range(1, 20, 3)])
+            self.assertEqual(numbers[0], klass(1))
+            self.assertEqual(numbers[-1], klass(19))
+            self.assertEqual(list(numbers[1:3]), [klass(4), klass(7)])
+            self.assertEqual(list(reversed(numbers)), [klass(i) for i in range(19, 0, -3)])
+            self.assertIn(klass(7), numbers)
+            self.assertNotIn(klass(8), numbers)
+            self.assertIn(7, numbers)
+            self.assertEqual((numbers.start, numbers.end, numbers.step), (1, 20, 3))
+            self.assertIn(klass(-1), Range(klass, -2, 0))
+            self.assertEqual(len(Range(klass, klass(0), klass(2**(size_in_bit[klass]-1)-1))), 2**(size_in_bit[klass]-1)-1)
+        self.assertNotIn(Wyde(7), Range(Byte, 0, 10))
+
+    def testRawAndReuse(self):
+        '''
+        Verify that Range can yield plain ints, or one reused instance.
+        '''
+        self.assertEqual(list(Range(Octa, 0, 4, raw=True)), [0, 1, 2, 3])
+        self.assertEqual(Range(Octa, 0, 4, raw=True)[2], 2)
+        self.assertEqual(list(reversed(Range(Octa, 0, 4, raw=True))), [3, 2, 1, 0])
+        seen = list()
+        cursor = None
+        for obj in Range(Wyde, -2, 2, reuse=True):
+            self.assertTrue(cursor is None or obj is cursor)
+            cursor = obj
+            seen.append(obj.int)
+        self.assertEqual(seen, [-2, -1, 0, 1])
+        self.assertRaises(MmixException, Range, Byte, 0, 1, 1, True, True)
 
 if __name__ == '__main__':
     unittest.main()
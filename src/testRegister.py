@@ -1,4 +1,7 @@
 ﻿import unittest
+from Register import Register, RegisterFile, RegisterView
+from Octa import Octa
+from Utilities import MmixException
 
 class TestRegister(unittest.TestCase):
     '''
@@ -18,7 +21,33 @@ class TestRegister(unittest.TestCase):
     
     def tearDown(self):
         pass
-        
+
+    def testRegisterFile(self):
+        '''
+        Verify that views of a RegisterFile read and write its values in place.
+        '''
+        registers = RegisterFile(4)
+        self.assertEqual((len(registers), registers.values), (4, [0, 0, 0, 0]))
+        view = registers[1]
+        self.assertIsInstance(view, RegisterView)
+        self.assertIsInstance(view, Register)
+        view.set_value(-2)
+        self.assertEqual(registers.values[1], 2**64 - 2)
+        registers.values[2] = 0x1234
+        self.assertEqual((registers[2].uint, registers[2].int, registers[2].hex), (0x1234, 0x1234, '0000000000001234'))
+        self.assertEqual(registers[1] & registers[2], Octa(0x1234))
+        self.assertIs((registers[1] & registers[2]).__class__, Octa)
+        self.assertEqual([register.uint for register in registers], [0, 2**64 - 2, 0x1234, 0])
+        self.assertEqual((registers[-3].index, registers[Octa(3)].index), (1, 3))
+        self.assertRaises(IndexError, registers.__getitem__, 4)
+        self.assertEqual([register.index for register in registers[1:3]], [1, 2])
+        self.assertEqual(vars(registers), {'values': registers.values})
+        other = registers.copy()
+        other[2].set_value(1)
+        self.assertEqual((registers.values[2], other.values[2]), (0x1234, 1))
+        self.assertRaises(MmixException, view.freeze)
+        self.assertRaises(MmixException, view.set_value, 2**64)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
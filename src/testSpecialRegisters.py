@@ -0,0 +1,68 @@
+#pylint: disable=C0103
+'''
+Unit test for SpecialRegisters module.
+'''
+import unittest
+import SpecialRegisters
+from SpecialRegisters import SpecialRegisterFile
+from MMIX import MMIX
+
+class TestSpecialRegisters(unittest.TestCase):
+    '''
+    Unit test suite for SpecialRegisters module.
+    '''
+    @classmethod
+    def setUpClass(cls):
+        print("\nStart testing %s" % __name__)
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\nFinish testing %s" % __name__)
+
+    def testIndex(self):
+        '''
+        Verify the name -> number map and the constants of hot special registers.
+        '''
+        self.assertEqual(len(SpecialRegisters.NAMES), MMIX.NUM_OF_SPECIAL_PURPOSE_REGISTER)
+        self.assertEqual(sorted(SpecialRegisters.INDEX.values()), list(range(32)))
+        self.assertEqual(
+            (SpecialRegisters.RA, SpecialRegisters.RC, SpecialRegisters.RD, SpecialRegisters.RG, SpecialRegisters.RH,
+             SpecialRegisters.RJ, SpecialRegisters.RL, SpecialRegisters.RO, SpecialRegisters.RS),
+            (21, 8, 1, 19, 3, 4, 20, 10, 11)
+            )
+
+    def testAttributes(self):
+        '''
+        Verify that special registers can be read and written by name, masked, and share values with their views.
+        '''
+        sr = SpecialRegisterFile()
+        sr.rA = -1
+        self.assertEqual(sr.rA, 2**64 - 1)
+        self.assertEqual(sr[SpecialRegisters.RA].uint, 2**64 - 1)
+        sr[SpecialRegisters.RJ].set_value(0x100)
+        self.assertEqual(sr.rJ, 0x100)
+        other = sr.copy()
+        self.assertIsInstance(other, SpecialRegisterFile)
+        other.rJ += 4
+        self.assertEqual((sr.rJ, other.rJ), (0x100, 0x104))
+
+    def testMMIX(self):
+        '''
+        Verify that instructions of MMIX use the special registers seen by name.
+        '''
+        mmix = MMIX()
+        self.assertIs(mmix.sr, mmix.special_purpose_registers)
+        mmix.general_purpose_registers[1].set_value(7)
+        mmix.sr.rD = 1
+        mmix.memory.write_u32(0x100, 0x1f020103)    # DIVU $2,$1,3
+        mmix.memory.write_u32(0x104, 0xf7150040)    # PUT rA,#40
+        mmix.pc = 0x100
+        mmix.run(2)
+        self.assertEqual((mmix.general_purpose_registers[2].uint, mmix.sr.rR), ((2**64 + 7) // 3, (2**64 + 7) % 3))
+        self.assertEqual(mmix.sr.rA, MMIX.INTEGER_OVERFLOW)
+        other = mmix.fork()
+        other.sr.rA = 0
+        self.assertEqual((mmix.sr.rA, other.special_purpose_registers[SpecialRegisters.RA].uint), (0x40, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#pylint: disable=C0103
+'''
+Unit test for Translator class.
+'''
+import unittest
+from random import randint
+from MMIX import MMIX
+from Translator import Translator
+from Utilities import MmixException
+from testMMIX import SUM_PROGRAM, load_program
+from testDecodeCache import SELF_MODIFYING_PROGRAM
+
+# a straight line of translated and handled instructions, on $1..$3 with random values, into $4..$15
+MIXED_PROGRAM = (
+    0x20040102, # ADD $4,$1,$2
+    0x27050309, # SUBU $5,$3,9
+    0x30060102, # CMP $6,$1,$2
+    0x3b070104, # SLU $7,$1,4
+    0x3c080203, # SR $8,$2,$3
+    0xc2090102, # ORN $9,$1,$2
+    0x180a0203, # MUL $10,$2,$3
+    0x1d0b0107, # DIV $11,$1,7
+    0x650c0203, # CSP $12,$2,3
+    0x7a0d0102, # ZSNZ $13,$1,$2
+    0xe70e1234, # INCL $14,#1234
+    0xe00f2000, # SETH $15,#2000
+    0xac010f08, # STO $1,$15,8
+    0xa5020f0a, # STW $2,$15,10
+    0x820e0f09, # LDBU $14,$15,9
+    0x8c0a0f08, # LDO $10,$15,8
+    0xf5030001, # GETAB $3,@-#3fffc
+    0xda0b0102, # SADD $11,$1,$2
+    0xfe0c0015, # GET $12,rA
+    0x00000000, # TRAP 0,Halt,0
+    )
+
+class TestTranslator(unittest.TestCase):
+    '''
+    Unit test suite for Translator class.
+    '''
+    @classmethod
+    def setUpClass(cls):
+        print("\nStart testing %s" % __name__)
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\nFinish testing %s" % __name__)
+
+    def testBlocks(self):
+        '''
+        Verify that blocks end at branches, are translated once, and that limits of instructions are kept.
+        '''
+        mmix = MMIX(MMIX.TRANSLATE)
+        load_program(mmix, SUM_PROGRAM)
+        self.assertEqual(mmix.run(4), 4)
+        self.assertEqual(mmix.pc, 0x110)
+        self.assertEqual(mmix.run(), 32)
+        self.assertEqual(mmix.general_purpose_registers[4].uint, 55)
+        translator = mmix.translator
+        self.assertIsInstance(translator, Translator)
+        self.assertEqual(sorted(translator.blocks), [0x100, 0x104, 0x108, 0x10c, 0x110, 0x118])
+        self.assertEqual(translator.blocks[0x10c][1], 3)
+        self.assertIn('r[2] = checked(signed(y) + signed(z))', translator.blocks[0x10c][0].source)
+        self.assertEqual(translator.statistics(), {'hits': 9, 'misses': 6, 'invalidations': 0})
+
+    def testEngines(self):
+        '''
+        Verify that translated blocks compute the same as the other engines.
+        '''
+        for i in range(10):
+            values = [randint(0, 2**64-1) for j in range(3)]
+            results = list()
+            for engine in MMIX.ENGINES:
+                mmix = MMIX(engine)
+                for j, value in enumerate(values):
+                    mmix.general_purpose_registers[j + 1].set_value(value)
+                load_program(mmix, MIXED_PROGRAM, 0x40000)
+                self.assertEqual(mmix.run(), len(MIXED_PROGRAM))
+                results.append(([register.uint for register in mmix.general_purpose_registers[:16]], mmix.pc,
+                                mmix.special_purpose_registers[3].uint, mmix.memory.read_u64(0x2000000000000008)))
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0], results[2])
+
+    def testInvalidation(self):
+        '''
+        Verify that blocks are dropped when their code is written, and that unimplemented instructions are left to
+        the interpreter.
+        '''
+        mmix = MMIX(MMIX.TRANSLATE)
+        load_program(mmix, SELF_MODIFYING_PROGRAM)
+        mmix.general_purpose_registers[2].set_value(0xe3010009)
+        mmix.general_purpose_registers[3].set_value(0x100)
+        self.assertEqual(mmix.run(), 8)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 9)
+        self.assertEqual(mmix.translator.invalidations, 1)
+        load_program(mmix, (0xe3010001, 0x04010203), 0x200)   # SETL $1,1; FADD
+        mmix.halted = False
+        self.assertRaises(MmixException, mmix.run)
+        self.assertEqual(mmix.general_purpose_registers[1].uint, 1)
+        self.assertEqual(mmix.pc, 0x208)
+        self.assertEqual(mmix.translator.blocks[0x204], (None, 1))
+
+if __name__ == '__main__':
+    unittest.main()
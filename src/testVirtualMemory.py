@@ -0,0 +1,154 @@
+#pylint: disable=C0103
+'''
+Unit test for VirtualMemory and TLB classes.
+'''
+import unittest
+from VirtualMemory import VirtualMemory, TLB
+from Cache import Cache, CachedMemory
+from Memory import Memory
+from MMIX import MMIX
+from Byte import Byte
+from Octa import Octa
+from Register import Register
+from Utilities import MmixException
+
+N = 5   # address space number
+# b1..b4 = 1, 3, 3, 3: text segment has one root page (one level), data segment two (two levels), the others none;
+# pages of 2^13 bytes, root pages from 0x2000
+RV = (1 << 60) | (3 << 56) | (3 << 52) | (3 << 48) | (13 << 40) | (1 << 13) | (N << 3)
+
+def page_table_entry(physical_page, protection):
+    '''
+    Encode a PTE.
+    '''
+    return physical_page | (N << 3) | protection
+
+class TestVirtualMemory(unittest.TestCase):
+    '''
+    Unit test suite for VirtualMemory and TLB classes.
+    '''
+    @classmethod
+    def setUpClass(cls):
+        print("\nStart testing %s" % __name__)
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\nFinish testing %s" % __name__)
+
+    def setUp(self):
+        self.memory = Memory()
+        # text page 0 -> 0x100000 (rwx), text page 1 -> 0x102000 (read only)
+        self.memory.write_u64(0x2000, page_table_entry(0x100000, 7))
+        self.memory.write_u64(0x2008, page_table_entry(0x102000, 4))
+        # data page 1027 = (1, 3) in radix 1024 -> 0x104000 (rw), through root page 1 + 1 + 1 and a table at 0x20000
+        self.memory.write_u64(0x6000 + 8 * 1, (1 << 63) | (0x10 << 13) | (N << 3))
+        self.memory.write_u64(0x20000 + 8 * 3, page_table_entry(0x104000, 6))
+
+    def testTranslation(self):
+        '''
+        Verify translation of one and two level page tables, protection and faults.
+        '''
+        rV = Register(RV)
+        memory = VirtualMemory(self.memory, rV, 4)
+        memory.write_uint(0x10, 8, 0x1122334455667788)
+        self.assertEqual(self.memory.read_u64(0x100010), 0x1122334455667788)
+        self.assertEqual(memory.read_uint(0x14, 4), 0x55667788)
+        self.assertEqual(memory.fetch_uint(0x10, 4), 0x11223344)
+        self.memory.write_u32(0x103ffc, 0xfedcba98)
+        self.assertEqual(memory.read_int(0x3ffc, 4), 0xfedcba98 - 2**32)
+        self.assertRaises(MmixException, memory.write_uint, 0x2000, 1, 0)
+        self.assertRaises(MmixException, memory.fetch_uint, 0x2000, 4)
+        address = 0x2000000000000000 + (1027 << 13) + 0x18
+        memory.write_uint(address, 2, 0xbeef)
+        self.assertEqual(self.memory.read_u16(0x104018), 0xbeef)
+        self.assertRaises(MmixException, memory.read_uint, 0x4000, 1)       # no PTE
+        self.assertRaises(MmixException, memory.read_uint, 1024 << 13, 1)   # text has one level only
+        self.assertRaises(MmixException, memory.read_uint, 0x2000000000000000 + (1028 << 13), 1)    # no PTE
+        self.assertRaises(MmixException, memory.read_uint, 0x2000000000000000 + (2048 << 13), 1)    # no PTP
+        self.assertRaises(MmixException, memory.read_uint, 0x4000000000000000, 1)   # pool has no page tables
+        self.assertEqual(memory.read_uint(0x8000000000100010, 8), 0x1122334455667788)
+
+    def testTLB(self):
+        '''
+        Verify that translations are cached, evicted when TLBs are full, and flushed when rV changes.
+        '''
+        rV = Register(RV)
+        memory = VirtualMemory(self.memory, rV, 1)
+        for address in (0x0, 0x8, 0x2000, 0x10):
+            memory.read_uint(address, 8)
+        self.assertEqual(memory.statistics(), {'ITLB': {'hits': 0, 'misses': 0}, 'DTLB': {'hits': 1, 'misses': 3}})
+        memory.fetch_uint(0x0, 4)
+        memory.fetch_uint(0x4, 4)
+        self.assertEqual(memory.itlb.statistics(), {'hits': 1, 'misses': 1})
+        rV.set_value(RV ^ (N << 3) ^ (6 << 3))  # another address space, whose entries don't match
+        self.assertRaises(MmixException, memory.read_uint, 0x10, 8)
+        rV.set_value(RV)
+        memory.read_uint(0x10, 8)
+        self.assertEqual(memory.dtlb.misses, 5)
+        memory.flush()
+        self.assertEqual(memory.dtlb.entries, {})
+        tlb = TLB('DTLB', 2)
+        for page_number in range(3):
+            tlb.insert(page_number, (page_number << 13, 7))
+        self.assertEqual(list(tlb.entries.keys()), [1, 2])
+
+    def testMMIX(self):
+        '''
+        Verify that MMIX translates its loads and stores while translation is enabled, under or over caches, and that
+        SYNC 6 flushes the TLBs.
+        '''
+        mmix = MMIX()
+        mmix.memory = self.memory
+        mmix.special_purpose_registers[18].set_value(RV)
+        virtual_memory = mmix.enable_virtual_translation(tlb_size=8)
+        cached_memory = mmix.enable_caches(Cache('L1I', 256, 2, 32), Cache('L1D', 256, 2, 32))
+        self.assertIs(mmix.memory, virtual_memory)
+        self.assertIs(virtual_memory.memory, cached_memory)
+        mmix.general_purpose_registers[1].set_value(0x2000000000000000 + (1027 << 13))
+        mmix.general_purpose_registers[2].set_value(0x1234)
+        mmix.__STx__(Byte(2), Byte(1), Byte(8), Octa, False, True)
+        mmix.__LDx__(Byte(3), Byte(1), Byte(8), Octa, False, True)
+        self.assertEqual(mmix.general_purpose_registers[3].uint, 0x1234)
+        self.assertEqual(self.memory.read_u64(0x104008), 0x1234)
+        self.assertEqual(virtual_memory.dtlb.statistics(), {'hits': 1, 'misses': 1})
+        self.assertEqual(cached_memory.dcache.statistics()['hits'], 1)
+        mmix.__SYNC__(Byte(0), Byte(0), Byte(6))
+        self.assertEqual(virtual_memory.dtlb.entries, {})
+        mmix.disable_caches()
+        self.assertIs(virtual_memory.memory, self.memory)
+        mmix.disable_virtual_translation()
+        self.assertIs(mmix.memory, self.memory)
+
+    def testFork(self):
+        '''
+        Verify that a machine forked while translation is enabled translates with its own rV, over its own caches and
+        forked memory.
+        '''
+        mmix = MMIX()
+        mmix.memory = self.memory
+        mmix.special_purpose_registers[18].set_value(RV)
+        mmix.enable_virtual_translation(tlb_size=8)
+        l2 = Cache('L2', 1024, 4, 64)
+        mmix.enable_caches(Cache('L1I', 256, 2, 32, next_level=l2), Cache('L1D', 256, 2, 32, next_level=l2))
+        child = mmix.fork()
+        self.assertIsInstance(child.memory, VirtualMemory)
+        self.assertEqual(child.memory.itlb.size, 8)
+        self.assertEqual(child.memory.rV.uint, RV)
+        child.special_purpose_registers[18].set_value(0)
+        self.assertEqual(child.memory.rV.uint, 0)
+        self.assertEqual(mmix.memory.rV.uint, RV)
+        cached_memory = child.memory.memory
+        self.assertIsInstance(cached_memory, CachedMemory)
+        self.assertIsNot(cached_memory.dcache, mmix.memory.memory.dcache)
+        self.assertIs(cached_memory.icache.next_level, cached_memory.dcache.next_level)
+        self.assertIsNot(cached_memory.dcache.next_level, l2)
+        self.assertIsNot(cached_memory.memory, self.memory)
+        child.special_purpose_registers[18].set_value(RV)
+        child.memory.write_uint(0x2000000000000000 + (1027 << 13) + 8, 8, 0x5678)
+        self.assertEqual(child.memory.read_uint(0x2000000000000000 + (1027 << 13) + 8, 8), 0x5678)
+        self.assertEqual(child.memory.dtlb.statistics(), {'hits': 1, 'misses': 1})
+        self.assertEqual(cached_memory.memory.read_u64(0x104008), 0x5678)
+        self.assertEqual(self.memory.read_u64(0x104008), 0)
+
+if __name__ == '__main__':
+    unittest.main()